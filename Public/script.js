@@ -6,7 +6,6 @@
   // CONFIG & CONSTANTS
   // ======================
   const CONFIG = {
-    MAX_CHARACTERS: 1000,
     MAX_HISTORY_ITEMS: 5,
     API_TIMEOUT_MIN: 2000,
     API_TIMEOUT_MAX: 3000,
@@ -224,7 +223,8 @@
       },
       options: {
         responsive: true,
-        scales: { y: { beginAtZero: true, max: 1 } }
+        // quality metrics are fractions; latency/throughput columns are not
+        scales: { y: { beginAtZero: true, max: ['accuracy', 'precision', 'recall', 'f1'].includes(selectedMetric) ? 1 : undefined } }
       }
     });
 
@@ -287,9 +287,14 @@ document.addEventListener("DOMContentLoaded", () => {
   const confettiCanvas = document.getElementById("confetti-canvas");
   const themeToggle = document.getElementById("theme-toggle");
 
+  const chunkResults = document.getElementById("chunk-results");
+
   let historyData = [];
   let isHistoryExpanded = false;
 
+  // longer texts are split into sentences and streamed from /predict_stream
+  const LONG_DOCUMENT_THRESHOLD = 1000;
+
   // -------------------------------
   // Character Counter
   // -------------------------------
@@ -327,6 +332,15 @@ document.addEventListener("DOMContentLoaded", () => {
     setLoading(true);
 
     try {
+      if (text.length > LONG_DOCUMENT_THRESHOLD) {
+        const verdict = await analyzeLongDocument(text);
+        resultTitle.textContent = "Analysis Result";
+        resultMessage.textContent = verdictMessage(verdict);
+        addToHistory(`Prediction: ${verdict.prediction} (${verdict.chunks} sentences)`);
+        launchConfetti();
+        return;
+      }
+
       const response = await fetch("/predict", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
@@ -346,16 +360,85 @@ document.addEventListener("DOMContentLoaded", () => {
       }
     } catch (err) {
       resultTitle.textContent = "Error";
-      resultMessage.textContent = "Something went wrong. Try again later.";
+      resultMessage.textContent = err.message || "Something went wrong. Try again later.";
     } finally {
       setLoading(false);
     }
   });
 
+  // -------------------------------
+  // Long Documents (server-sent events)
+  // -------------------------------
+  async function analyzeLongDocument(text) {
+    const response = await fetch("/predict_stream", {
+      method: "POST",
+      headers: { "Content-Type": "text/plain; charset=utf-8" },
+      body: text,
+    });
+    if (!response.ok) {
+      const result = await response.json();
+      throw new Error(result.error);
+    }
+
+    chunkResults.hidden = false;
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = "";
+    let verdict = null;
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += value;
+      let end;
+      while ((end = buffer.indexOf("\n\n")) !== -1) {
+        const { event, data } = parseEvent(buffer.slice(0, end));
+        buffer = buffer.slice(end + 2);
+        if (event === "chunk") {
+          appendChunkResult(data);
+          resultMessage.textContent = `Analyzed ${data.index + 1} sentences...`;
+        } else if (event === "verdict") {
+          verdict = data;
+        } else if (event === "error") {
+          throw new Error(data.error);
+        }
+      }
+    }
+    if (!verdict) throw new Error("The analysis was interrupted.");
+    return verdict;
+  }
+
+  function parseEvent(block) {
+    let event = "message";
+    let data = "";
+    block.split("\n").forEach((line) => {
+      if (line.startsWith("event: ")) event = line.slice(7);
+      else if (line.startsWith("data: ")) data += line.slice(6);
+    });
+    return { event, data: data ? JSON.parse(data) : null };
+  }
+
+  function appendChunkResult(chunk) {
+    const item = document.createElement("li");
+    item.className = `chunk-result chunk-label-${chunk.prediction}`;
+    item.textContent = chunk.text;
+    item.title = chunk.probability == null
+      ? `Prediction: ${chunk.prediction}`
+      : `Prediction: ${chunk.prediction} (${Math.round(chunk.probability * 100)}%)`;
+    chunkResults.appendChild(item);
+  }
+
+  function verdictMessage(verdict) {
+    const share = Math.round(verdict.share * 100);
+    const note = verdict.truncated ? " Only the beginning of the document was analyzed." : "";
+    return `Prediction: ${verdict.prediction} for ${share}% of ${verdict.chunks} sentences ` +
+      `(weighted by length and confidence).${note}`;
+  }
+
   function setLoading(isLoading) {
     if (isLoading) {
       submitBtn.disabled = true;
       resultMessage.textContent = "Processing your text...";
+      chunkResults.innerHTML = "";
+      chunkResults.hidden = true;
       confidenceBar.style.display = "none";
       confidenceText.style.display = "none";
     } else {
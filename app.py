@@ -1,20 +1,301 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Response, g, request, jsonify, render_template, stream_with_context
 from flask_cors import CORS
+import itertools
+import json
 import os
+import threading
+import time
 from dotenv import load_dotenv
 load_dotenv()   # loads variables from .env into os.environ
 
+from quickfactchecker.batching import MicroBatcher
+from quickfactchecker.cache import LocalLRUBackend, MinHashIndex, PredictionCache, RedisBackend
+from quickfactchecker.cascade import CASCADE_CONFIG, CASCADE_MODEL, CascadeFile
+from quickfactchecker.chunking import VerdictAggregator, iter_batches, iter_text, nonblank_text, split_sentences
+from quickfactchecker.evidence import EvidenceUnavailableError, LazyEvidenceIndex
+from quickfactchecker.inference import score_texts
+from quickfactchecker.metrics import (LOAD_BUCKETS, PROMETHEUS_CONTENT_TYPE, MetricsRegistry, SamplingProfiler,
+                                      profile_path, write_profile)
+from quickfactchecker.preprocessing import preprocess
+from quickfactchecker.registry import ModelRegistry, ModelUnavailableError, compact_artifacts
+from quickfactchecker.results_store import BENCHMARK_EXPERIMENT, DEFAULT_EXPERIMENT, ResultsStore
+
 app = Flask(__name__, static_folder='Public', template_folder='Public', static_url_path='')
 CORS(app)  # Enable CORS for all domains
 
 # ------------------------------
+# Metrics (exported at /metrics) and opt-in request profiling
+# ------------------------------
+# PROFILE_REQUESTS=1 profiles every request; with PROFILE_TOKEN set, only
+# requests carrying the header `X-Profile: <token>` are profiled. Profiles are
+# written to PROFILE_DIR as collapsed stacks (flamegraph.pl / speedscope).
+metrics = MetricsRegistry()
+REQUEST_SECONDS = metrics.histogram('qfc_request_duration_seconds', 'Request latency by endpoint and status.',
+                                    ['endpoint', 'status'])
+REQUESTS = metrics.counter('qfc_requests_total', 'Requests by endpoint, model and status code.',
+                           ['endpoint', 'model', 'status'])
+STAGE_SECONDS = metrics.histogram('qfc_stage_duration_seconds', 'Time spent in each stage of a request.',
+                                  ['stage', 'model'])
+PREDICTIONS = metrics.counter('qfc_predictions_total', 'Texts scored, by model and whether the cache answered.',
+                              ['model', 'source'])
+MODEL_LOAD_SECONDS = metrics.histogram('qfc_model_load_duration_seconds', 'Model artifact load time.',
+                                       ['model'], buckets=LOAD_BUCKETS)
+PROFILE_REQUESTS = os.environ.get('PROFILE_REQUESTS', '').lower() in ('1', 'true', 'yes')
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN')
+PROFILE_DIR = os.environ.get('PROFILE_DIR', os.path.join('.cache', 'profiles'))
+PROFILE_INTERVAL_MS = float(os.environ.get('PROFILE_INTERVAL_MS', 1))
+
+# ------------------------------
+# Model registry (artifacts in MODEL_DIR are loaded lazily on first use)
+# ------------------------------
+# MODEL_PRELOAD=1 loads every available model at import time, so that
+# `gunicorn --preload app:app` shares them with all workers.
+# MODEL_RELOAD_INTERVAL is how often (seconds) a worker checks for a new artifact.
+# MODEL_COMPACT=1 serves the `.compact` export of a linear model (see
+# scripts/export_compact.py) instead of its pickle when one exists at startup.
+MODEL_DIR = os.environ.get('MODEL_DIR', 'model')
+DEFAULT_MODEL = os.environ.get('DEFAULT_MODEL', 'nb')
+MODEL_COMPACT = os.environ.get('MODEL_COMPACT', '').lower() in ('1', 'true', 'yes')
+registry = ModelRegistry(MODEL_DIR, artifacts=compact_artifacts(MODEL_DIR) if MODEL_COMPACT else None,
+                         check_interval=float(os.environ.get('MODEL_RELOAD_INTERVAL', 2)),
+                         on_load=lambda name, seconds: MODEL_LOAD_SECONDS.observe(seconds, name))
+if os.environ.get('MODEL_PRELOAD', '').lower() in ('1', 'true', 'yes'):
+    try:
+        registry.preload()
+    except Exception as e:
+        print(f"Error preloading models: {e}")
+
+# ?model=cascade scores with the cheapest model first and escalates uncertain
+# texts; its stages and thresholds come from `scripts/cascade.py calibrate`.
+cascade_file = CascadeFile(os.environ.get('CASCADE_CONFIG', os.path.join(MODEL_DIR, CASCADE_CONFIG)),
+                           check_interval=float(os.environ.get('MODEL_RELOAD_INTERVAL', 2)))
+
+# ------------------------------
+# Batching configuration
+# ------------------------------
+# PREDICT_BATCH_MAX_ITEMS caps the number of texts accepted by /predict_batch.
+# PREDICT_MICROBATCH=1 makes /predict hold concurrent requests for up to
+# PREDICT_BATCH_WAIT_MS and score up to PREDICT_BATCH_SIZE of them at once.
+PREDICT_BATCH_MAX_ITEMS = int(os.environ.get('PREDICT_BATCH_MAX_ITEMS', 1000))
+PREDICT_BATCH_SIZE = int(os.environ.get('PREDICT_BATCH_SIZE', 32))
+PREDICT_BATCH_WAIT_MS = float(os.environ.get('PREDICT_BATCH_WAIT_MS', 5))
+MICROBATCH_ENABLED = os.environ.get('PREDICT_MICROBATCH', '').lower() in ('1', 'true', 'yes')
+
+# ------------------------------
+# Long documents (/predict_stream)
+# ------------------------------
+# /predict_stream splits an article into sentences of at most
+# STREAM_MAX_CHUNK_CHARS, scores them in batches that grow from
+# STREAM_FIRST_BATCH_SIZE to STREAM_BATCH_SIZE and streams each result as a
+# server-sent event, then the overall verdict. A text/plain body is read
+# incrementally, so memory does not grow with the article; a JSON body is
+# limited to STREAM_MAX_CHARACTERS. At most STREAM_MAX_CHUNKS sentences are scored.
+STREAM_BATCH_SIZE = int(os.environ.get('STREAM_BATCH_SIZE', 32))
+STREAM_FIRST_BATCH_SIZE = int(os.environ.get('STREAM_FIRST_BATCH_SIZE', 4))
+STREAM_MAX_CHUNK_CHARS = int(os.environ.get('STREAM_MAX_CHUNK_CHARS', 1000))
+STREAM_MAX_CHUNKS = int(os.environ.get('STREAM_MAX_CHUNKS', 10000))
+STREAM_MAX_CHARACTERS = int(os.environ.get('STREAM_MAX_CHARACTERS', 1000000))
+
+
+# ------------------------------
+# Prediction cache (PREDICTION_CACHE_SIZE=0 disables it)
+# ------------------------------
+# Entries expire after PREDICTION_CACHE_TTL seconds. PREDICTION_CACHE_NEAR_DUP=1
+# also matches lightly reworded claims; PREDICTION_CACHE_REDIS_URL shares the
+# cache between workers instead of keeping one per process.
+PREDICTION_CACHE_SIZE = int(os.environ.get('PREDICTION_CACHE_SIZE', 10000))
+PREDICTION_CACHE_TTL = float(os.environ.get('PREDICTION_CACHE_TTL', 3600))
+prediction_cache = None
+if PREDICTION_CACHE_SIZE > 0:
+    try:
+        redis_url = os.environ.get('PREDICTION_CACHE_REDIS_URL')
+        if redis_url:
+            cache_backend = RedisBackend.from_url(redis_url, ttl=PREDICTION_CACHE_TTL)
+        else:
+            cache_backend = LocalLRUBackend(PREDICTION_CACHE_SIZE, ttl=PREDICTION_CACHE_TTL)
+        near_duplicates = None
+        if os.environ.get('PREDICTION_CACHE_NEAR_DUP', '').lower() in ('1', 'true', 'yes'):
+            near_duplicates = MinHashIndex(max_size=PREDICTION_CACHE_SIZE)
+        prediction_cache = PredictionCache(cache_backend, near_duplicates)
+    except Exception as e:
+        print(f"Error setting up prediction cache: {e}")
+
+
+# ------------------------------
+# Evidence index (built by scripts/build_evidence_index.py)
+# ------------------------------
+# /evidence returns the LIAR fact-checks most similar to a text; /predict adds
+# them when the JSON body has "evidence": true (or the number of matches).
+EVIDENCE_INDEX_DIR = os.environ.get('EVIDENCE_INDEX_DIR', os.path.join(MODEL_DIR, 'evidence'))
+EVIDENCE_TOP_K = int(os.environ.get('EVIDENCE_TOP_K', 5))
+EVIDENCE_MAX_K = int(os.environ.get('EVIDENCE_MAX_K', 50))
+evidence_index = LazyEvidenceIndex(EVIDENCE_INDEX_DIR,
+                                   check_interval=float(os.environ.get('MODEL_RELOAD_INTERVAL', 2)))
+if os.environ.get('MODEL_PRELOAD', '').lower() in ('1', 'true', 'yes') and evidence_index.is_available():
+    try:
+        evidence_index.get()
+    except Exception as e:
+        print(f"Error preloading evidence index: {e}")
+
+# ------------------------------
+# Dashboard results
+# ------------------------------
+# /dashboard_data serves RESULTS_PATH (written by the training and benchmark
+# scripts), falling back to the notebooks' markdown table when it is missing.
+RESULTS_PATH = os.environ.get('RESULTS_PATH', os.path.join('results', 'results.json'))
+DASHBOARD_EXPERIMENT = os.environ.get('DASHBOARD_EXPERIMENT', DEFAULT_EXPERIMENT)
+results_store = ResultsStore(RESULTS_PATH, fallback_paths=[os.path.join('results', 'ml_comparison_results.md')])
+
+
+def model_cache_version(loaded):
+    """Cache namespace for a loaded model version, so a hot swap never serves stale entries."""
+    return f"{loaded.name}@{loaded.version}"
+
+def stage_timer(model_name):
+    """timer(stage) recording into the per-stage latency histogram for model_name."""
+    return lambda stage: STAGE_SECONDS.time(stage, model_name)
+
+def cached_prediction(text, model_name=DEFAULT_MODEL):
+    if prediction_cache is None:
+        return None
+    version = get_scorer(model_name)[0]
+    with STAGE_SECONDS.time('cache', model_name):
+        result = prediction_cache.get(text, version)
+    if result is not None:
+        PREDICTIONS.inc(model_name, 'cache')
+    return result
+
+def run_model(loaded, texts):
+    """Apply the training-time preprocessing and score texts in one call."""
+    timer = stage_timer(loaded.name)
+    with timer('preprocess'):
+        texts = [preprocess(t) for t in texts]
+    return score_texts(loaded.model, texts, timer=timer)
+
+def get_scorer(model_name):
+    """Return (cache namespace, function scoring raw texts) for a model or the cascade."""
+    if model_name == CASCADE_MODEL:
+        cascade = cascade_file.get()
+        stages = ','.join(model_cache_version(registry.get(name)) for name in cascade.models)
+        def score(texts):
+            timer = stage_timer(CASCADE_MODEL)
+            with timer('preprocess'):
+                texts = [preprocess(t) for t in texts]
+            with timer('classify'):
+                return cascade.predict(lambda name: registry.get(name).model, texts)
+        return f"{CASCADE_MODEL}@{cascade.version}[{stages}]", score
+    loaded = registry.get(model_name)
+    return model_cache_version(loaded), lambda texts: run_model(loaded, texts)
+
+def is_known_model(model_name):
+    return model_name in registry or model_name == CASCADE_MODEL
+
+def is_model_available(model_name):
+    if model_name == CASCADE_MODEL:
+        return cascade_file.is_available()
+    return registry.is_available(model_name)
+
+def score_batch(texts, model_name=DEFAULT_MODEL, lookup=True):
+    """Score texts with model_name, answering repeated claims from the prediction cache.
+
+    With lookup=False the cache is only filled, for callers that already checked it.
+    """
+    version, score = get_scorer(model_name)
+    if prediction_cache is None:
+        PREDICTIONS.inc(model_name, 'model', amount=len(texts))
+        return score(texts)
+
+    with STAGE_SECONDS.time('cache', model_name):
+        results = [prediction_cache.get(t, version) if lookup else None for t in texts]
+    misses = [i for i, r in enumerate(results) if r is None]
+    PREDICTIONS.inc(model_name, 'cache', amount=len(texts) - len(misses))
+    if misses:
+        PREDICTIONS.inc(model_name, 'model', amount=len(misses))
+        scored = score([texts[i] for i in misses])
+        for i, result in zip(misses, scored):
+            results[i] = result
+            prediction_cache.put(texts[i], version, result)
+    return results
+
+
+_batchers = {}
+_batchers_lock = threading.Lock()
+
+def get_batcher(model_name):
+    """Return the micro-batcher for model_name, or None if micro-batching is off."""
+    if not MICROBATCH_ENABLED:
+        return None
+    with _batchers_lock:
+        if model_name not in _batchers:
+            _batchers[model_name] = MicroBatcher(
+                lambda texts: score_batch(texts, model_name, lookup=False),
+                max_batch_size=PREDICT_BATCH_SIZE, max_wait_ms=PREDICT_BATCH_WAIT_MS)
+        return _batchers[model_name]
+
+UNKNOWN_MODEL_LABEL = 'unknown'
 
-# Load the model (commented if not available)
-# import joblib
-# Load the model
-# Uncomment if model_pipeline.pkl is available
-# model_path = 'model/model_pipeline.pkl'
-# model = joblib.load(model_path)
+def requested_model():
+    """Model name from the ?model= query parameter, falling back to DEFAULT_MODEL."""
+    return request.args.get('model') or DEFAULT_MODEL
+
+def evidence_count(value):
+    """Number of matches requested by an "evidence"/"k" value, or None if none were asked for."""
+    if value is None or value is False:
+        return None
+    if value is True:
+        return EVIDENCE_TOP_K
+    k = int(value)
+    if not 1 <= k <= EVIDENCE_MAX_K:
+        raise ValueError(k)
+    return k
+
+def find_evidence(text, k):
+    """Top-k similar fact-checks, or None while the index has not been built."""
+    try:
+        with STAGE_SECONDS.time('evidence', ''):
+            return evidence_index.get().search(text, k)
+    except EvidenceUnavailableError:
+        return None
+
+def sse_event(event, data):
+    """One server-sent event carrying data as JSON."""
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
+
+def stream_chunk_results(pieces, model_name):
+    """Server-sent events: one `chunk` per scored sentence of the document, then the `verdict`."""
+    started = g.request_started
+    aggregator = VerdictAggregator()
+    chunks = split_sentences(pieces, max_chars=STREAM_MAX_CHUNK_CHARS)
+    batches = iter_batches(itertools.islice(chunks, STREAM_MAX_CHUNKS), STREAM_BATCH_SIZE, STREAM_FIRST_BATCH_SIZE)
+    try:
+        while True:
+            # reading and splitting the next sentences of the body
+            with STAGE_SECONDS.time('chunk', model_name):
+                batch = next(batches, None)
+            if batch is None:
+                break
+            results = score_batch([chunk.text for chunk in batch], model_name)
+            if not aggregator.chunks:
+                STAGE_SECONDS.observe(time.perf_counter() - started, 'first_result', model_name)
+            for chunk, result in zip(batch, results):
+                aggregator.add(chunk, result)
+                yield sse_event('chunk', dict(result, index=chunk.index, start=chunk.start, end=chunk.end,
+                                              text=chunk.text))
+        truncated = next(chunks, None) is not None
+        yield sse_event('verdict', dict(aggregator.verdict(), model=model_name, truncated=truncated))
+
+    except ModelUnavailableError:
+        yield sse_event('error', {'error': 'Model not available.'})
+
+    except Exception as e:
+        print(f"Error in /predict_stream: {e}")
+        yield sse_event('error', {'error': 'Internal server error.'})
+
+def unknown_model_response(model_name):
+    # metrics label the request with a fixed value: ?model= is client-supplied
+    g.model_name = UNKNOWN_MODEL_LABEL
+    return jsonify({'error': f'Unknown model "{model_name}".',
+                    'available_models': registry.names() + [CASCADE_MODEL]}), 400
 # ------------------------------
 
 @app.route('/')
@@ -24,7 +305,12 @@ def index():
 @app.route('/predict', methods=['POST'])
 def predict():
     try:
-        data = request.get_json(force=True)
+        model_name = requested_model()
+        if not is_known_model(model_name):
+            return unknown_model_response(model_name)
+        g.model_name = model_name
+        with STAGE_SECONDS.time('parse', model_name):
+            data = request.get_json(force=True)
         if not data or 'text' not in data:
             return jsonify({'error': 'Missing or incorrect key "text" in JSON data'}), 400
 
@@ -33,56 +319,216 @@ def predict():
         if not isinstance(text, str) or not text.strip():
             return jsonify({'error': '⚠️ Please enter some text before submitting.'}), 400
 
-        # Uncomment once you have model
-        # prediction = model.predict([text])[0]
-        # return jsonify({'prediction': int(prediction)})
+        try:
+            k = evidence_count(data.get('evidence'))
+        except (TypeError, ValueError):
+            return jsonify({'error': f'"evidence" must be true or a number from 1 to {EVIDENCE_MAX_K}.'}), 400
+
+        if not is_model_available(model_name):
+            # Temporary placeholder until the model artifact is available
+            result = {'message': 'Text received successfully!'}
+        else:
+            batcher = get_batcher(model_name)
+            if batcher is not None:
+                # cache hits skip the batching delay
+                result = cached_prediction(text, model_name) or batcher.predict(text)
+            else:
+                result = score_batch([text], model_name)[0]
+            result = dict(result, model=model_name)
 
-        # Temporary placeholder
-        return jsonify({'message': 'Text received successfully!'})
+        if k is not None:
+            result = dict(result, evidence=find_evidence(text, k))
+        return jsonify(result)
+
+    except ModelUnavailableError:
+        return jsonify({'error': 'Model not available.'}), 503
 
     except Exception as e:
         print(f"Error in /predict: {e}")
         return jsonify({'error': 'Internal server error.'}), 500
 
+@app.route('/predict_batch', methods=['POST'])
+def predict_batch():
+    try:
+        model_name = requested_model()
+        if not is_known_model(model_name):
+            return unknown_model_response(model_name)
+        g.model_name = model_name
+        with STAGE_SECONDS.time('parse', model_name):
+            data = request.get_json(force=True)
+        if not data or 'texts' not in data:
+            return jsonify({'error': 'Missing or incorrect key "texts" in JSON data'}), 400
+
+        texts = data['texts']
+
+        if not isinstance(texts, list) or not texts:
+            return jsonify({'error': '"texts" must be a non-empty list of strings.'}), 400
+        if len(texts) > PREDICT_BATCH_MAX_ITEMS:
+            return jsonify({'error': f'At most {PREDICT_BATCH_MAX_ITEMS} texts are allowed per request.'}), 400
+        invalid = [i for i, t in enumerate(texts) if not isinstance(t, str) or not t.strip()]
+        if invalid:
+            return jsonify({'error': 'Every item in "texts" must be a non-empty string.',
+                            'invalid_indices': invalid}), 400
+
+        return jsonify({'model': model_name, 'predictions': score_batch(texts, model_name)})
+
+    except ModelUnavailableError:
+        return jsonify({'error': 'Model not available.'}), 503
+
+    except Exception as e:
+        print(f"Error in /predict_batch: {e}")
+        return jsonify({'error': 'Internal server error.'}), 500
+
+@app.route('/predict_stream', methods=['POST'])
+def predict_stream():
+    try:
+        model_name = requested_model()
+        if not is_known_model(model_name):
+            return unknown_model_response(model_name)
+        g.model_name = model_name
+        if request.mimetype == 'text/plain':
+            # read as it is scored, so the article is never held in memory
+            pieces = nonblank_text(iter_text(request.stream))
+            if pieces is None:
+                return jsonify({'error': '⚠️ Please enter some text before submitting.'}), 400
+        else:
+            with STAGE_SECONDS.time('parse', model_name):
+                data = request.get_json(force=True)
+            if not data or 'text' not in data:
+                return jsonify({'error': 'Missing or incorrect key "text" in JSON data'}), 400
+            pieces = data['text']
+            if not isinstance(pieces, str) or not pieces.strip():
+                return jsonify({'error': '⚠️ Please enter some text before submitting.'}), 400
+            if len(pieces) > STREAM_MAX_CHARACTERS:
+                return jsonify({'error': f'At most {STREAM_MAX_CHARACTERS} characters are allowed in JSON; '
+                                         'send longer documents as text/plain.'}), 400
+
+        if not is_model_available(model_name):
+            return jsonify({'error': 'Model not available.'}), 503
+
+        response = Response(stream_with_context(stream_chunk_results(pieces, model_name)),
+                            mimetype='text/event-stream')
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Accel-Buffering'] = 'no'  # stop nginx from buffering the events
+        return response
+
+    except Exception as e:
+        print(f"Error in /predict_stream: {e}")
+        return jsonify({'error': 'Internal server error.'}), 500
+
+@app.route('/models')
+def list_models():
+    loaded = registry.loaded()
+    models = [{
+        'name': name,
+        'default': name == DEFAULT_MODEL,
+        'available': registry.is_available(name),
+        'version': loaded[name].version if name in loaded else None,
+    } for name in registry.names()]
+    cascade = {'name': CASCADE_MODEL, 'default': DEFAULT_MODEL == CASCADE_MODEL,
+               'available': cascade_file.is_available(), 'version': None}
+    if cascade['available']:
+        try:
+            config = cascade_file.get()
+            cascade.update(version=config.version, stages=config.to_config()['stages'])
+        except Exception as e:
+            print(f"Error reading cascade configuration: {e}")
+    return jsonify(models + [cascade])
+
+@app.route('/evidence', methods=['GET', 'POST'])
+def evidence():
+    """Previously fact-checked statements most similar to ?q= (or the JSON "text")."""
+    if request.method == 'POST':
+        data = request.get_json(force=True, silent=True) or {}
+        text, k = data.get('text'), data.get('k', EVIDENCE_TOP_K)
+    else:
+        text, k = request.args.get('q'), request.args.get('k', EVIDENCE_TOP_K)
+
+    if not isinstance(text, str) or not text.strip():
+        return jsonify({'error': 'Missing query: pass ?q= or a JSON body with "text".'}), 400
+    try:
+        k = evidence_count(k)
+    except (TypeError, ValueError):
+        return jsonify({'error': f'"k" must be a number from 1 to {EVIDENCE_MAX_K}.'}), 400
+
+    try:
+        results = evidence_index.get().search(text, k)
+    except EvidenceUnavailableError:
+        return jsonify({'error': 'Evidence index not available.'}), 503
+    return jsonify({'query': text, 'results': results})
+
+@app.route('/cache_stats')
+def cache_stats():
+    if prediction_cache is None:
+        return jsonify({'enabled': False})
+    return jsonify(dict(prediction_cache.stats(), enabled=True))
+
 # ------------------------------
 # New route: Dashboard Data API
 # ------------------------------
 @app.route('/dashboard_data')
 def dashboard_data():
-    data = []
-    file_path = os.path.join("results", "model_comparison.md")
-
-    if not os.path.exists(file_path):
-        return jsonify({'error': 'results/model_comparison.md not found'}), 404
-
+    """Model metrics for the dashboard; polling with If-None-Match gets a 304."""
+    experiment = request.args.get('experiment', DASHBOARD_EXPERIMENT)
+    # the dashboard experiment also carries the benchmark's latency/throughput columns
+    merge = (BENCHMARK_EXPERIMENT,) if experiment == DASHBOARD_EXPERIMENT else ()
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-
-        for line in lines:
-            if "|" in line and "Model" not in line:
-                parts = [p.strip() for p in line.split("|") if p.strip()]
-                if len(parts) >= 5:
-                    model = parts[0]
-                    try:
-                        accuracy = float(parts[1] or 0)
-                        precision = float(parts[2] or 0)
-                        recall = float(parts[3] or 0)
-                        f1 = float(parts[4] or 0)
-                    except ValueError:
-                        continue
-                    data.append({
-                        'model': model,
-                        'accuracy': accuracy,
-                        'precision': precision,
-                        'recall': recall,
-                        'f1': f1
-                    })
+        with STAGE_SECONDS.time('results', ''):
+            snapshot = results_store.snapshot(experiment, merge)
     except Exception as e:
-        print(f"Error reading {file_path}: {e}")
-        return jsonify({'error': 'Error parsing model_comparison.md'}), 500
+        print(f"Error reading model results: {e}")
+        return jsonify({'error': 'Error parsing model results'}), 500
+
+    if snapshot is None:
+        return jsonify({'error': f"no results for experiment '{experiment}'",
+                        'experiments': results_store.experiments()}), 404
+
+    response = app.response_class(snapshot.body, mimetype='application/json')
+    response.set_etag(snapshot.etag)
+    response.last_modified = snapshot.last_modified
+    response.cache_control.no_cache = True  # cache, but revalidate every time
+    return response.make_conditional(request)
+
+@app.route('/metrics')
+def prometheus_metrics():
+    return app.response_class(metrics.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+@app.before_request
+def start_request():
+    g.request_started = time.perf_counter()
+    if PROFILE_REQUESTS or (PROFILE_TOKEN and request.headers.get('X-Profile') == PROFILE_TOKEN):
+        g.profiler = SamplingProfiler(interval=PROFILE_INTERVAL_MS / 1000).start()
+
+@app.after_request
+def finish_request(response):
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    status = str(response.status_code)
+    model_name = g.get('model_name', '')
+    started = g.request_started
+    profiler = g.pop('profiler', None)
+
+    def record(path=None):
+        REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint, status)
+        REQUESTS.inc(endpoint, model_name, status)
+        if profiler is not None:
+            try:
+                return write_profile(profiler.stop(), PROFILE_DIR, endpoint, path)
+            except OSError as e:
+                print(f"Error writing profile: {e}")
+
+    if response.is_streamed:
+        # the body (e.g. /predict_stream's events) is produced after this hook
+        # returns, so latency and the profile are recorded once it has been sent
+        path = profile_path(PROFILE_DIR, endpoint) if profiler is not None else None
+        if path:
+            response.headers['X-Profile-File'] = path
+        response.call_on_close(lambda: record(path))
+    else:
+        path = record()
+        if path:
+            response.headers['X-Profile-File'] = path
+    return response
 
-    return jsonify(data)
 # ✅ Health check route
 @app.route('/health')
 def health():
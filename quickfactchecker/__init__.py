@@ -0,0 +1,5 @@
+"""Serving and training helpers shared by ``app.py``, the scripts and the notebooks.
+
+Submodules are imported explicitly (``from quickfactchecker.batching import
+MicroBatcher``) so that importing the package itself stays cheap.
+"""
@@ -0,0 +1,88 @@
+"""Server-side micro-batching of concurrent ``/predict`` calls.
+
+Requests that arrive within ``max_wait_ms`` of each other (inside the same
+worker process) are scored together in one vectorized call. This only pays
+off when a worker serves several requests at once, e.g. ``gunicorn
+--worker-class gthread --threads 8 app:app``; with plain sync workers every
+batch has a single item.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """Collect single-text submissions and score them in batches.
+
+    ``score_fn`` receives a list of texts and must return a list of results
+    of the same length and order. The worker thread is started lazily and
+    restarted after a fork, so a batcher created before gunicorn forks its
+    workers is safe to use in each of them.
+    """
+
+    def __init__(self, score_fn, max_batch_size=32, max_wait_ms=5.0):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must be non-negative")
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._thread = None
+
+    def _ensure_worker(self):
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return self._queue
+        with self._lock:
+            if self._pid != os.getpid() or not self._thread.is_alive():
+                self._queue = queue.Queue()
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._queue,), name="micro-batcher", daemon=True
+                )
+                self._thread.start()
+                self._pid = os.getpid()
+        return self._queue
+
+    def submit(self, text):
+        """Queue ``text`` for scoring and return a ``Future`` for its result."""
+        future = Future()
+        self._ensure_worker().put((text, future))
+        return future
+
+    def predict(self, text, timeout=None):
+        """Score ``text`` as part of the next batch and wait for the result."""
+        return self.submit(text).result(timeout=timeout)
+
+    def _collect(self, q):
+        batch = [q.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(q.get(timeout=remaining) if remaining > 0 else q.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self, q):
+        while True:
+            batch = self._collect(q)
+            texts = [text for text, _ in batch]
+            try:
+                results = self.score_fn(texts)
+                if len(results) != len(texts):
+                    raise RuntimeError(
+                        f"score_fn returned {len(results)} results for {len(texts)} texts"
+                    )
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
@@ -0,0 +1,239 @@
+"""Reproducible inference benchmarks for the registered models.
+
+For every model this measures:
+
+* cold start: a fresh interpreter that imports the registry, loads the
+  artifact and scores one text (wall time, per-step breakdown, peak RSS);
+* single-item latency percentiles of preprocessing + ``predict_proba``;
+* throughput at several batch sizes;
+* end-to-end ``/predict`` latency through the Flask test client, with the
+  prediction cache and micro-batching turned off;
+* for linear models exported with ``scripts/export_compact.py``, the cold
+  start, latency and throughput of the ``.compact`` artifact next to the
+  pickle's.
+
+Everything runs offline on statements from LIAR's ``test.tsv``. The cold
+start step is also this module's command line entry point::
+
+    python -m quickfactchecker.benchmark cold-start MODEL_DIR NAME [--compact]
+"""
+
+import csv
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LIAR_TEST_PATH = os.path.join(REPO_ROOT, "module", "dataset", "liar", "test.tsv")
+BENCHMARK_RESULTS_PATH = os.path.join(REPO_ROOT, "results", "benchmark.json")
+DEFAULT_BATCH_SIZES = (1, 8, 32, 128, 512)
+
+
+def load_statements(path=LIAR_TEST_PATH, limit=None):
+    """Statements (third column) from a LIAR-format TSV file."""
+    statements = []
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+            if len(row) > 2 and row[2].strip():
+                statements.append(row[2])
+                if limit is not None and len(statements) >= limit:
+                    break
+    return statements
+
+
+def latency_summary(seconds):
+    """Percentiles (in ms) of a list of per-call durations in seconds."""
+    ms = np.asarray(seconds, dtype=float) * 1000.0
+    return {
+        "n": int(ms.size),
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "max_ms": float(ms.max()),
+    }
+
+
+def measure_latency(fn, inputs, iterations=500, warmup=20):
+    """Time ``fn(item)`` once per item, cycling through ``inputs``."""
+    for i in range(min(warmup, iterations)):
+        fn(inputs[i % len(inputs)])
+    timings = []
+    for i in range(iterations):
+        item = inputs[i % len(inputs)]
+        start = time.perf_counter()
+        fn(item)
+        timings.append(time.perf_counter() - start)
+    return latency_summary(timings)
+
+
+def measure_throughput(score_batch, texts, batch_sizes=DEFAULT_BATCH_SIZES, min_seconds=1.0):
+    """Items per second of ``score_batch(list_of_texts)`` for each batch size."""
+    results = {}
+    for size in batch_sizes:
+        batches = [texts[i:i + size] for i in range(0, len(texts) - size + 1, size)] or [texts[:size]]
+        score_batch(batches[0])  # warm-up
+        items = calls = 0
+        start = time.perf_counter()
+        while True:
+            batch = batches[calls % len(batches)]
+            score_batch(batch)
+            items += len(batch)
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_seconds:
+                break
+        results[str(size)] = {"items_per_s": items / elapsed, "ms_per_batch": 1000.0 * elapsed / calls}
+    return results
+
+
+def measure_cold_start(model_dir, name, timeout=600, compact=False):
+    """Load ``name`` (its ``.compact`` export if ``compact``) in a fresh interpreter; returns timings and peak RSS."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-m", "quickfactchecker.benchmark", "cold-start", model_dir, name]
+        + (["--compact"] if compact else []),
+        capture_output=True, text=True, cwd=REPO_ROOT, timeout=timeout,
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"cold start of {name} failed: {proc.stderr.strip()[-500:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["process_wall_s"] = wall
+    return result
+
+
+def _cold_start_main(model_dir, name, compact=False):
+    t0 = time.perf_counter()
+    from quickfactchecker.inference import score_texts
+    from quickfactchecker.memory import peak_rss_mb
+    from quickfactchecker.preprocessing import preprocess
+    from quickfactchecker.registry import ModelRegistry, compact_artifacts
+
+    registry = ModelRegistry(model_dir, artifacts=compact_artifacts(model_dir) if compact else None)
+    t1 = time.perf_counter()
+    loaded = registry.get(name)
+    t2 = time.perf_counter()
+    score_texts(loaded.model, [preprocess("Says the unemployment rate doubled last year.")])
+    t3 = time.perf_counter()
+    print(json.dumps({
+        "import_s": t1 - t0,
+        "load_s": t2 - t1,
+        "first_predict_s": t3 - t2,
+        "peak_rss_mb": peak_rss_mb(),
+        "artifact": os.path.basename(loaded.path),
+        "sklearn_imported": "sklearn" in sys.modules,
+    }))
+
+
+def measure_http(app_module, name, texts, iterations=300, warmup=20):
+    """End-to-end ``/predict`` latency through the Flask test client."""
+    saved = app_module.prediction_cache, app_module.MICROBATCH_ENABLED
+    app_module.prediction_cache, app_module.MICROBATCH_ENABLED = None, False
+    try:
+        with app_module.app.test_client() as client:
+            def call(text):
+                response = client.post(f"/predict?model={name}", json={"text": text})
+                if response.status_code != 200:
+                    raise RuntimeError(f"/predict returned {response.status_code}: {response.get_data(as_text=True)}")
+            return measure_latency(call, texts, iterations=iterations, warmup=warmup)
+    finally:
+        app_module.prediction_cache, app_module.MICROBATCH_ENABLED = saved
+
+
+def environment():
+    info = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+    }
+    try:
+        import sklearn
+        info["sklearn"] = sklearn.__version__
+    except ImportError:
+        pass
+    try:
+        info["git_commit"] = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=REPO_ROOT, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    return info
+
+
+def _measure_scoring(model, texts, iterations, batch_sizes, min_seconds):
+    from quickfactchecker.inference import score_texts
+    from quickfactchecker.preprocessing import preprocess
+
+    return {
+        "latency": measure_latency(lambda t: score_texts(model, [preprocess(t)]), texts, iterations),
+        "throughput": measure_throughput(
+            lambda batch: score_texts(model, [preprocess(t) for t in batch]), texts, batch_sizes, min_seconds,
+        ),
+    }
+
+
+def benchmark_model(registry, name, texts, iterations=500, batch_sizes=DEFAULT_BATCH_SIZES,
+                    min_seconds=1.0, app_module=None, cold_start=True, compact=True):
+    from quickfactchecker.compact import COMPACT_SUFFIX, compact_path, load_compact
+
+    result = {}
+    if cold_start:
+        result["cold_start"] = measure_cold_start(registry.model_dir, name)
+
+    loaded = registry.get(name)
+    result.update(_measure_scoring(loaded.model, texts, iterations, batch_sizes, min_seconds))
+    if app_module is not None:
+        result["http"] = measure_http(app_module, name, texts, iterations=min(iterations, 300))
+
+    exported = compact_path(loaded.path) if loaded.path else None
+    if compact and exported and not loaded.path.endswith(COMPACT_SUFFIX) and os.path.exists(exported):
+        result["compact"] = _measure_scoring(load_compact(exported), texts, iterations, batch_sizes, min_seconds)
+        if cold_start:
+            result["compact"]["cold_start"] = measure_cold_start(registry.model_dir, name, compact=True)
+    return result
+
+
+def run_benchmarks(registry, names, texts, log=print, **kwargs):
+    """Benchmark each model in ``names``; failures are recorded, not raised."""
+    report = {"environment": environment(), "dataset": {"rows": len(texts)}, "models": {}}
+    for name in names:
+        log(f"⏱️ Benchmarking {name}...")
+        try:
+            report["models"][name] = benchmark_model(registry, name, texts, **kwargs)
+        except Exception as e:
+            log(f"⚠️ {name}: {type(e).__name__}: {e}")
+            report["models"][name] = {"error": f"{type(e).__name__}: {e}"}
+    return report
+
+
+def write_report(report, path=BENCHMARK_RESULTS_PATH):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return path
+
+
+if __name__ == "__main__":
+    if len(sys.argv) in (4, 5) and sys.argv[1] == "cold-start" and sys.argv[4:] in ([], ["--compact"]):
+        _cold_start_main(sys.argv[2], sys.argv[3], compact=len(sys.argv) == 5)
+    else:
+        sys.exit("usage: python -m quickfactchecker.benchmark cold-start MODEL_DIR NAME [--compact]")
@@ -0,0 +1,243 @@
+"""Prediction cache keyed on normalized claim text.
+
+Viral claims reach ``/predict`` many times with cosmetic differences
+(casing, punctuation, trailing links, ``RT @user:`` prefixes). Keys are a
+hash of the text after :func:`normalize_text` (the notebooks' ``clean_text``
+plus retweet-prefix stripping) and of the model version, so a new artifact
+never serves stale predictions.
+
+Two backends are provided: :class:`LocalLRUBackend` (in-process, LRU + TTL)
+and :class:`RedisBackend` (shared between workers, wraps any redis-py
+compatible client). The optional :class:`MinHashIndex` tier maps lightly
+reworded copies of a cached claim onto the cached entry.
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from quickfactchecker.preprocessing import clean_text
+
+_RETWEET_PREFIX = re.compile(r"^\s*(?:rt\b\s*:?\s*)?(?:@\w+\s*:?\s*)*", re.IGNORECASE)
+
+
+def normalize_text(text):
+    """Normalize ``text`` for cache lookups: strip retweet prefixes, clean, squeeze spaces."""
+    text = _RETWEET_PREFIX.sub("", str(text), count=1)
+    return " ".join(clean_text(text).split())
+
+
+def cache_key(normalized, model_version):
+    return hashlib.blake2b(f"{model_version}\0{normalized}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+class LocalLRUBackend:
+    """Thread-safe in-process store with LRU eviction and a per-entry TTL."""
+
+    def __init__(self, max_size=10000, ttl=3600.0, clock=time.monotonic):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.evictions = 0
+        self.expirations = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and self.clock() >= expires_at:
+                del self._data[key]
+                self.expirations += 1
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires_at = None if not self.ttl else self.clock() + self.ttl
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class RedisBackend:
+    """Shared backend on top of a redis-py compatible client.
+
+    Only ``get``, ``set(..., ex=...)`` and ``delete`` are used, so any object
+    implementing those (e.g. a dict-backed stand-in in tests) works. Values
+    must be JSON-serializable; eviction is left to the server's TTL and
+    ``maxmemory-policy`` settings.
+    """
+
+    def __init__(self, client, ttl=3600, prefix="qfc:pred:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        import redis
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, json.dumps(value), ex=int(self.ttl) if self.ttl else None)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+
+class MinHashIndex:
+    """Locality-sensitive index of word-shingle MinHash signatures.
+
+    Signatures have ``num_perm`` values split into ``bands`` LSH bands; two
+    texts become candidates when one band matches exactly, and a candidate is
+    accepted when the estimated Jaccard similarity reaches ``threshold``.
+    Only the newest ``max_size`` entries are kept.
+    """
+
+    _PRIME = (1 << 61) - 1
+
+    def __init__(self, num_perm=64, bands=16, threshold=0.8, shingle_size=2, max_size=10000, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 31, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, 1 << 31, size=num_perm).astype(np.uint64)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.max_size = max_size
+        self._entries = OrderedDict()  # key -> (scope, signature)
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def signature(self, normalized):
+        tokens = normalized.split()
+        k = min(self.shingle_size, len(tokens)) or 1
+        shingles = {" ".join(tokens[i:i + k]) for i in range(max(len(tokens) - k + 1, 1))}
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little")
+             for s in shingles),
+            dtype=np.uint64, count=len(shingles),
+        )
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % np.uint64(self._PRIME)
+        return permuted.min(axis=1)
+
+    def _band_keys(self, scope, signature):
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows]
+            yield (scope, band, chunk.tobytes())
+
+    def add(self, key, normalized, scope=""):
+        signature = self.signature(normalized)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            self._entries[key] = (scope, signature)
+            for band_key in self._band_keys(scope, signature):
+                self._buckets.setdefault(band_key, set()).add(key)
+            while len(self._entries) > self.max_size:
+                old_key, (old_scope, old_signature) = self._entries.popitem(last=False)
+                for band_key in self._band_keys(old_scope, old_signature):
+                    bucket = self._buckets.get(band_key)
+                    if bucket is not None:
+                        bucket.discard(old_key)
+                        if not bucket:
+                            del self._buckets[band_key]
+
+    def query(self, normalized, scope=""):
+        """Return the key of the most similar indexed text above ``threshold``, or None."""
+        signature = self.signature(normalized)
+        with self._lock:
+            candidates = set()
+            for band_key in self._band_keys(scope, signature):
+                candidates.update(self._buckets.get(band_key, ()))
+            best_key, best_score = None, self.threshold
+            for key in candidates:
+                score = float(np.mean(self._entries[key][1] == signature))
+                if score >= best_score:
+                    best_key, best_score = key, score
+            return best_key
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class PredictionCache:
+    """Cache of model outputs keyed on normalized text and model version."""
+
+    def __init__(self, backend=None, near_duplicates=None):
+        self.backend = backend if backend is not None else LocalLRUBackend()
+        self.near_duplicates = near_duplicates
+        self.hits = 0
+        self.near_duplicate_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, text, model_version):
+        normalized = normalize_text(text)
+        value = self.backend.get(cache_key(normalized, model_version))
+        near_duplicate = False
+        if value is None and self.near_duplicates is not None and normalized:
+            similar = self.near_duplicates.query(normalized, scope=model_version)
+            if similar is not None:
+                value = self.backend.get(similar)
+                near_duplicate = value is not None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.near_duplicate_hits += near_duplicate
+        return value
+
+    def put(self, text, model_version, value):
+        normalized = normalize_text(text)
+        key = cache_key(normalized, model_version)
+        self.backend.set(key, value)
+        if self.near_duplicates is not None and normalized:
+            self.near_duplicates.add(key, normalized, scope=model_version)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        stats = {
+            "hits": self.hits,
+            "near_duplicate_hits": self.near_duplicate_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+        if isinstance(self.backend, LocalLRUBackend):
+            stats.update(size=len(self.backend), max_size=self.backend.max_size,
+                         evictions=self.backend.evictions, expirations=self.backend.expirations)
+        return stats
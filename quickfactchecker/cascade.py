@@ -0,0 +1,224 @@
+"""Confidence-based cascade over the registered models.
+
+Texts are scored by the cheapest model first. A stage's prediction is kept
+when its confidence (the predicted label's probability, or the absolute
+decision margin for models such as ``LinearSVC``) reaches the stage's
+threshold; the remaining, uncertain texts are passed on as one batch to the
+next, more expensive model. The last stage decides whatever is left.
+
+Thresholds are calibrated offline on a validation split
+(``scripts/cascade.py calibrate``) and stored as JSON next to the models::
+
+    {"stages": [{"model": "svm", "threshold": 1.12},
+                {"model": "lr", "threshold": 0.97},
+                {"model": "xgb"}],
+     "validation": {...}}
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from quickfactchecker.inference import _to_builtin, predict_with_confidence
+from quickfactchecker.registry import ModelUnavailableError, artifact_version
+
+CASCADE_MODEL = "cascade"
+CASCADE_CONFIG = "cascade.json"
+DEFAULT_STAGES = ("svm", "lr", "xgb")
+
+
+class CascadeUnavailableError(ModelUnavailableError):
+    """No calibrated cascade configuration has been written."""
+
+
+@dataclass(frozen=True)
+class CascadeStage:
+    model: str
+    # predictions with at least this confidence are final; None on the last stage
+    threshold: Optional[float] = None
+
+
+class Cascade:
+    def __init__(self, stages, version=None):
+        if not stages:
+            raise ValueError("a cascade needs at least one stage")
+        self.stages = list(stages)
+        self.version = version
+
+    @classmethod
+    def from_config(cls, config, version=None):
+        stages = [CascadeStage(s["model"], s.get("threshold")) for s in config["stages"]]
+        return cls(stages[:-1] + [CascadeStage(stages[-1].model)], version=version)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls.from_config(json.load(f), version=artifact_version(path))
+
+    def to_config(self):
+        return {"stages": [{"model": s.model, "threshold": s.threshold} if s.threshold is not None
+                           else {"model": s.model} for s in self.stages]}
+
+    @property
+    def models(self):
+        return [s.model for s in self.stages]
+
+    def predict(self, get_model, texts):
+        """Score preprocessed ``texts``; ``get_model(name)`` returns a fitted pipeline.
+
+        Each result has the deciding ``stage`` and its ``confidence`` besides
+        the usual ``prediction`` and ``probability``.
+        """
+        texts = list(texts)
+        results = [None] * len(texts)
+        pending = np.arange(len(texts))
+        for i, stage in enumerate(self.stages):
+            if not len(pending):
+                break
+            labels, proba, confidence = predict_with_confidence(get_model(stage.model), [texts[j] for j in pending])
+            last = i == len(self.stages) - 1
+            accept = np.ones(len(pending), dtype=bool) if last else confidence >= stage.threshold
+            for j in np.flatnonzero(accept):
+                results[pending[j]] = {
+                    "prediction": _to_builtin(labels[j]),
+                    "probability": None if proba is None else float(proba[j]),
+                    "confidence": float(confidence[j]),
+                    "stage": stage.model,
+                }
+            pending = pending[~accept]
+        return results
+
+
+def stage_outputs(model, texts, batch_size=512):
+    """Labels, confidences and ms/sample of ``model`` on preprocessed ``texts``."""
+    labels, confidence = [], []
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        batch_labels, _, batch_confidence = predict_with_confidence(model, texts[i:i + batch_size])
+        labels.append(np.asarray(batch_labels))
+        confidence.append(np.asarray(batch_confidence, dtype=float))
+    elapsed = time.perf_counter() - start
+    return {
+        "labels": np.concatenate(labels),
+        "confidence": np.concatenate(confidence),
+        "ms_per_sample": 1000.0 * elapsed / max(len(texts), 1),
+    }
+
+
+def _threshold_for(confidence, correct, target):
+    """Lowest threshold whose accepted predictions are at least ``target`` accurate, or None."""
+    order = np.argsort(-confidence, kind="stable")
+    confidence, correct = confidence[order], correct[order]
+    accuracy = np.cumsum(correct) / np.arange(1, len(correct) + 1)
+    # a threshold accepts every tie, so only cut where the confidence drops
+    boundary = np.append(confidence[:-1] > confidence[1:], True)
+    ok = np.flatnonzero((accuracy >= target) & boundary)
+    return float(confidence[ok[-1]]) if len(ok) else None
+
+
+def simulate(stages, outputs, y_true):
+    """Accuracy, average cost and share decided per stage of ``stages`` on precomputed outputs."""
+    y_true = np.asarray(y_true)
+    decided = np.full(len(y_true), -1)
+    cost = np.zeros(len(y_true))
+    pending = np.ones(len(y_true), dtype=bool)
+    for i, stage in enumerate(stages):
+        out = outputs[stage.model]
+        cost[pending] += out["ms_per_sample"]
+        accept = pending.copy() if stage.threshold is None else pending & (out["confidence"] >= stage.threshold)
+        decided[accept] = i
+        pending &= ~accept
+    predictions = np.choose(decided, [outputs[s.model]["labels"] for s in stages])
+    return {
+        "accuracy": float(np.mean(predictions == y_true)),
+        "ms_per_sample": float(cost.mean()),
+        "decided_by": {s.model: float(np.mean(decided == i)) for i, s in enumerate(stages)},
+    }
+
+
+def calibrate(models, outputs, y_true, target_accuracy=None, tolerance=0.0):
+    """Choose a threshold for every stage but the last of ``models`` (cheapest first).
+
+    Each stage keeps the largest share of the texts that reach it whose
+    accuracy on the validation split is at least ``target_accuracy``
+    (default: the last model's overall accuracy minus ``tolerance``). A stage
+    that cannot reach the target is dropped, since it would only add cost.
+    Returns ``(cascade, report)``.
+    """
+    y_true = np.asarray(y_true)
+    if target_accuracy is None:
+        target_accuracy = float(np.mean(outputs[models[-1]]["labels"] == y_true)) - tolerance
+
+    stages, dropped = [], []
+    pending = np.ones(len(y_true), dtype=bool)
+    for name in models[:-1]:
+        out = outputs[name]
+        correct = (out["labels"] == y_true)[pending]
+        threshold = _threshold_for(out["confidence"][pending], correct, target_accuracy) if correct.size else None
+        if threshold is None:
+            dropped.append(name)
+            continue
+        stages.append(CascadeStage(name, threshold))
+        pending &= out["confidence"] < threshold
+    stages.append(CascadeStage(models[-1]))
+
+    report = {
+        "target_accuracy": target_accuracy,
+        "rows": int(len(y_true)),
+        "dropped_stages": dropped,
+        "cascade": simulate(stages, outputs, y_true),
+        "single_models": {name: simulate([CascadeStage(name)], outputs, y_true) for name in models},
+    }
+    return Cascade(stages), report
+
+
+def write_config(cascade, path, **extra):
+    """Atomically write ``cascade`` (plus ``extra`` keys, e.g. the calibration report) to ``path``."""
+    config = dict(cascade.to_config(), **extra)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(config, f, indent=2)
+            f.write("\n")
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return path
+
+
+class CascadeFile:
+    """The cascade configured at ``path``, reloaded when the file changes."""
+
+    def __init__(self, path, check_interval=2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._cascade = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def is_available(self):
+        return self._cascade is not None or os.path.exists(self.path)
+
+    def get(self):
+        cascade = self._cascade
+        if cascade is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return cascade
+        with self._lock:
+            try:
+                if self._cascade is None or artifact_version(self.path) != self._cascade.version:
+                    self._cascade = Cascade.load(self.path)
+            except FileNotFoundError:
+                if self._cascade is None:
+                    raise CascadeUnavailableError(f"No cascade configuration at {self.path}")
+            self._checked_at = time.monotonic()
+            return self._cascade
@@ -0,0 +1,210 @@
+"""Sentence chunking and verdict aggregation for long documents.
+
+``/predict`` scores a text as one document, which dilutes a full article into
+a single score. For long documents the article is split into sentences
+(claims), the sentences are scored in batches, and the per-sentence results
+are combined into an overall verdict.
+
+Everything here works incrementally: :func:`split_sentences` consumes the text
+as an iterable of pieces (e.g. blocks read from a request body) and keeps at
+most one unfinished sentence plus one piece in memory, :func:`iter_batches`
+holds one batch, and :class:`VerdictAggregator` keeps one running total per
+label. Memory therefore does not grow with the document, and the first batch
+is ready as soon as its sentences have been read.
+"""
+
+import codecs
+import itertools
+import re
+from dataclasses import dataclass
+
+# one /predict input in the front end is at most 1000 characters
+MAX_CHUNK_CHARS = 1000
+# fragments shorter than this ("Yes.", headings) are joined to the next sentence
+MIN_CHUNK_CHARS = 20
+READ_BLOCK_SIZE = 64 * 1024
+
+# end punctuation (and closing quotes/brackets) followed by whitespace, or a blank line
+_BOUNDARY = re.compile(r"""[.!?…]+["'”’)\]]*\s+|\n[ \t\r\f\v]*\n\s*""")
+_LAST_WORD = re.compile(r"(\S+)$")
+_ABBREVIATIONS = frozenset("""
+mr mrs ms dr prof sr jr st mt vs etc al e.g i.e u.s u.k u.n a.m p.m gov sen rep gen col lt sgt
+jan feb mar apr jun jul aug sep sept oct nov dec no inc ltd co corp dept est approx fig
+""".split())
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """A sentence of the document; ``start``/``end`` are character offsets into it."""
+
+    index: int
+    start: int
+    end: int
+    text: str
+
+
+def _is_sentence_end(buffer, match):
+    if match.group().count("\n") > 1:
+        return True  # paragraph break
+    following = buffer[match.end():match.end() + 1]
+    if following.islower():
+        return False
+    word = _LAST_WORD.search(buffer, max(0, match.start() - 40), match.start() + 1)
+    if word is None:
+        return True
+    word = word.group(1).lstrip("\"'(“‘[").rstrip(".").lower()
+    # initials ("J. Smith") and common abbreviations do not end a sentence
+    return not (len(word) == 1 and word.isalpha()) and word not in _ABBREVIATIONS
+
+
+def split_sentences(pieces, max_chars=MAX_CHUNK_CHARS, min_chars=MIN_CHUNK_CHARS):
+    """Yield the :class:`Chunk` s of a text given as a string or an iterable of strings.
+
+    Sentences end at ``.``, ``!``, ``?`` or ``…`` followed by whitespace and a
+    character that is not lowercase, or at a blank line. Sentences longer than
+    ``max_chars`` are cut at the last space before the limit.
+    """
+    if isinstance(pieces, str):
+        pieces = (pieces,)
+    if max_chars < 1:
+        raise ValueError("max_chars must be at least 1")
+
+    buffer = ""
+    offset = 0  # document position of buffer[0]
+    index = 0
+
+    def emit(begin, end):
+        nonlocal index
+        raw = buffer[begin:end]
+        text = raw.strip()
+        if not text:
+            return None
+        start = offset + begin + (len(raw) - len(raw.lstrip()))
+        chunk = Chunk(index, start, start + len(text), text)
+        index += 1
+        return chunk
+
+    for piece in pieces:
+        buffer += piece
+        start = 0
+        for match in _BOUNDARY.finditer(buffer):
+            # a boundary touching the end of the buffer may continue in the next piece
+            if match.end() >= len(buffer):
+                continue
+            if len(buffer[start:match.start()].strip()) + 1 < min_chars or not _is_sentence_end(buffer, match):
+                continue
+            chunk = emit(start, match.end())
+            if chunk is not None:
+                yield chunk
+            start = match.end()
+        while len(buffer) - start > max_chars:
+            window = buffer[start:start + max_chars]
+            cut = max(window.rfind(" "), window.rfind("\n"), window.rfind("\t"))
+            cut = cut + 1 if cut > 0 else max_chars
+            chunk = emit(start, start + cut)
+            if chunk is not None:
+                yield chunk
+            start += cut
+        buffer = buffer[start:]
+        offset += start
+
+    chunk = emit(0, len(buffer))
+    if chunk is not None:
+        yield chunk
+
+
+def iter_text(stream, block_size=READ_BLOCK_SIZE, encoding="utf-8"):
+    """Decode a binary stream block by block (multi-byte characters may span blocks)."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            break
+        text = decoder.decode(block)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def nonblank_text(pieces, block_size=READ_BLOCK_SIZE):
+    """``pieces`` as an iterator, or None if they contain only whitespace.
+
+    Reads up to the first piece that is not blank. The whitespace before it
+    is replayed as spaces, block by block, so chunk offsets still refer to the
+    original text and memory stays bounded.
+    """
+    pieces = iter(pieces)
+    skipped = 0
+    for piece in pieces:
+        if piece.strip():
+            return itertools.chain(_spaces(skipped, block_size), [piece], pieces)
+        skipped += len(piece)
+    return None
+
+
+def _spaces(n, block_size):
+    while n > 0:
+        yield " " * min(n, block_size)
+        n -= block_size
+
+
+def iter_batches(items, size, first_size=None):
+    """Yield lists of up to ``size`` items.
+
+    With ``first_size`` the batches start at that size and double up to
+    ``size``, so the first results of a long stream come back sooner.
+    """
+    if size < 1:
+        raise ValueError("size must be at least 1")
+    current = min(first_size or size, size)
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= current:
+            yield batch
+            batch = []
+            current = min(current * 2, size)
+    if batch:
+        yield batch
+
+
+class VerdictAggregator:
+    """Running verdict over scored chunks.
+
+    Every chunk votes for its predicted label with a weight of its length
+    times its probability (1 for models without probabilities), so long,
+    confidently classified sentences count most. The verdict is the label
+    with the largest total weight; ``share`` is that label's fraction of the
+    total weight.
+    """
+
+    def __init__(self):
+        self.chunks = 0
+        self.characters = 0
+        self._labels = {}  # prediction -> [chunks, weight]
+
+    def add(self, chunk, result):
+        probability = result.get("probability")
+        weight = len(chunk.text) * (1.0 if probability is None else probability)
+        totals = self._labels.setdefault(result["prediction"], [0, 0.0])
+        totals[0] += 1
+        totals[1] += weight
+        self.chunks += 1
+        self.characters += len(chunk.text)
+
+    def verdict(self):
+        total = sum(weight for _, weight in self._labels.values())
+        labels = [
+            {"prediction": label, "chunks": n, "share": weight / total if total else 0.0}
+            for label, (n, weight) in sorted(self._labels.items(), key=lambda item: -item[1][1])
+        ]
+        best = labels[0] if labels else {"prediction": None, "share": None}
+        return {
+            "prediction": best["prediction"],
+            "share": best["share"],
+            "chunks": self.chunks,
+            "characters": self.characters,
+            "labels": labels,
+        }
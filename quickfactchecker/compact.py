@@ -0,0 +1,389 @@
+"""Compact, NumPy-only export of the linear text pipelines (NB, LR, linear SVM).
+
+Unpickling a ``TfidfVectorizer`` rebuilds its vocabulary as a Python dict
+(one string object and one int per n-gram), and importing scikit-learn pulls
+in SciPy; on a cold container the two dominate start-up time and memory. A
+fitted linear pipeline only needs a few arrays at prediction time, so
+:func:`export_pipeline` writes them to a single ``.compact`` file::
+
+    magic (8 bytes) | header length (uint64) | JSON header | arrays
+
+with every array 64-byte aligned (offsets in the header are relative to the
+first aligned byte after it):
+
+    vocab      the n-grams as UTF-8, sorted (fixed-width bytes)
+    idf        float32 IDF weight per n-gram (TF-IDF pipelines only)
+    weights    float32 (n_features, n_outputs) coefficients, rows in vocab order
+    intercept  float64 (n_outputs,)
+
+:func:`load_compact` memory-maps the file (workers share its pages) and
+returns a :class:`CompactLinearModel` that tokenizes exactly like the
+original vectorizer, looks the n-grams of a whole batch up with one
+``searchsorted`` and computes the sparse dot products with ``bincount``.
+Nothing here imports scikit-learn except the exporter itself.
+
+``MultinomialNB`` is stored in the same linear form: its per-class feature
+log-probabilities are centred per feature (softmax is unchanged by that), and
+a binary model is reduced to the difference of its two classes.
+
+Exports are exact up to float32 rounding. ``prune`` drops n-grams whose
+weights are all within ``prune * max|weight|`` of zero; this shrinks the
+file, but the dropped n-grams no longer count towards a document's TF-IDF
+norm, so pruned exports are approximate: check them with
+:func:`compare_predictions` (``scripts/export_compact.py`` does).
+"""
+
+import json
+import mmap
+import os
+import re
+import struct
+import tempfile
+import unicodedata
+
+import numpy as np
+
+from quickfactchecker.inference import _to_builtin
+
+COMPACT_SUFFIX = ".compact"
+MAGIC = b"QFCLIN01"
+FORMAT_VERSION = 1
+_ALIGN = 64
+# how the outputs turn into probabilities; "margin" models (LinearSVC) have none
+OUTPUTS = ("sigmoid", "softmax", "ovr", "margin")
+
+
+def compact_path(path):
+    """``model/model_pipeline_lr.pkl`` -> ``model/model_pipeline_lr.compact``."""
+    return os.path.splitext(path)[0] + COMPACT_SUFFIX
+
+
+# ------------------------------
+# Export (needs scikit-learn)
+# ------------------------------
+
+def _vectorizer_config(steps):
+    from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer, TfidfVectorizer
+
+    steps = [step for step in steps if step is not None and step != "passthrough"]
+    if not steps or not isinstance(steps[0], CountVectorizer) or len(steps) > 2:
+        raise ValueError("expected a CountVectorizer or TfidfVectorizer followed by the classifier")
+    vectorizer = steps[0]
+    if vectorizer.analyzer != "word" or vectorizer.tokenizer is not None or vectorizer.preprocessor is not None:
+        raise ValueError("only the built-in word analyzer can be exported")
+    if isinstance(vectorizer, TfidfVectorizer):
+        tfidf = vectorizer
+    elif len(steps) == 2 and isinstance(steps[1], TfidfTransformer):
+        tfidf = steps[1]
+    elif len(steps) == 1:
+        tfidf = None
+    else:
+        raise ValueError(f"unsupported transformer {type(steps[1]).__name__}")
+
+    stop_words = vectorizer.get_stop_words()
+    config = {
+        "lowercase": bool(vectorizer.lowercase),
+        "strip_accents": vectorizer.strip_accents,
+        "token_pattern": vectorizer.token_pattern,
+        "ngram_range": list(vectorizer.ngram_range),
+        "stop_words": sorted(stop_words) if stop_words else None,
+        "binary": bool(vectorizer.binary),
+        "sublinear_tf": bool(tfidf is not None and tfidf.sublinear_tf),
+        "norm": tfidf.norm if tfidf is not None else None,
+    }
+    idf = np.asarray(tfidf.idf_) if tfidf is not None and tfidf.use_idf else None
+    return vectorizer, config, idf
+
+
+def _is_one_vs_rest(clf):
+    """Whether a multiclass LogisticRegression normalizes per-class sigmoids.
+
+    Mirrors sklearn < 1.8, where ``multi_class="ovr"``, and the default
+    ("auto"/"deprecated") with the liblinear solver, fit one-vs-rest models.
+    """
+    multi_class = getattr(clf, "multi_class", "auto")
+    if multi_class in ("ovr", "warn"):
+        return True
+    return multi_class in ("auto", "deprecated") and getattr(clf, "solver", None) == "liblinear"
+
+
+def _linear_form(clf):
+    """``(weights (n_features, n_outputs), intercept, output kind)`` of a fitted classifier."""
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.naive_bayes import MultinomialNB
+    from sklearn.svm import LinearSVC
+
+    if isinstance(clf, MultinomialNB):
+        log_prob = np.asarray(clf.feature_log_prob_, dtype=np.float64)
+        prior = np.asarray(clf.class_log_prior_, dtype=np.float64)
+        if len(clf.classes_) == 2:
+            return (log_prob[1] - log_prob[0])[:, None], prior[1:] - prior[:1], "sigmoid"
+        return (log_prob - log_prob.mean(axis=0)).T, prior, "softmax"
+
+    if isinstance(clf, (LogisticRegression, LinearSVC)):
+        coef = np.asarray(clf.coef_, dtype=np.float64)
+        intercept = np.broadcast_to(np.asarray(clf.intercept_, dtype=np.float64), coef.shape[:1])
+        if isinstance(clf, LinearSVC):
+            kind = "margin"
+        elif coef.shape[0] == 1:
+            kind = "sigmoid"
+        else:
+            kind = "ovr" if _is_one_vs_rest(clf) else "softmax"
+        return coef.T, intercept, kind
+
+    raise ValueError(f"{type(clf).__name__} is not a supported linear model (MultinomialNB, "
+                     "LogisticRegression or LinearSVC)")
+
+
+def export_pipeline(pipeline, path, prune=None):
+    """Write the fitted ``pipeline`` to ``path`` in the compact format; returns a summary.
+
+    ``prune`` (e.g. ``1e-3``) drops n-grams whose largest absolute weight is
+    at most that fraction of the largest weight in the model; by default
+    every n-gram is kept and the export is exact. The file is written next to
+    ``path`` and renamed into place, so running workers can hot-swap it.
+    """
+    steps = [step for _, step in pipeline.steps]
+    vectorizer, config, idf = _vectorizer_config(steps[:-1])
+    weights, intercept, kind = _linear_form(steps[-1])
+
+    terms = np.array(sorted(vectorizer.vocabulary_, key=lambda t: t.encode("utf-8")), dtype=object)
+    columns = np.fromiter((vectorizer.vocabulary_[t] for t in terms), dtype=np.int64, count=len(terms))
+    weights = weights[columns]
+    idf = idf[columns] if idf is not None else None
+
+    keep = np.ones(len(terms), dtype=bool)
+    if prune:
+        largest = np.abs(weights).max(axis=1)
+        keep = largest > prune * largest.max()
+    vocab = np.array([t.encode("utf-8") for t in terms[keep]], dtype=bytes)
+    arrays = {
+        "vocab": vocab if len(vocab) else np.zeros(0, dtype="S1"),
+        "weights": np.ascontiguousarray(weights[keep], dtype=np.float32),
+        "intercept": np.asarray(intercept, dtype=np.float64),
+    }
+    if idf is not None:
+        arrays["idf"] = np.ascontiguousarray(idf[keep], dtype=np.float32)
+
+    summary = {
+        "estimator": type(steps[-1]).__name__,
+        "n_features": int(len(terms)),
+        "kept_features": int(keep.sum()),
+        "prune": prune,
+    }
+    header = {
+        "format": FORMAT_VERSION,
+        "output": kind,
+        "classes": [_to_builtin(c) for c in steps[-1].classes_],
+        "analyzer": config,
+        "source": summary,
+    }
+    summary["bytes"] = _write(path, header, arrays)
+    return summary
+
+
+def _align(offset):
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def _write(path, header, arrays):
+    # array offsets are relative to the first aligned byte after the header
+    blobs, layout, offset = [], {}, 0
+    for name, array in arrays.items():
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        blobs.append((offset, array.tobytes()))
+        offset = _align(offset + array.nbytes)
+    encoded = json.dumps(dict(header, arrays=layout)).encode("utf-8")
+    data_start = _align(len(MAGIC) + 8 + len(encoded))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC + struct.pack("<Q", len(encoded)) + encoded)
+            for start, blob in blobs:
+                f.write(b"\0" * (data_start + start - f.tell()))
+                f.write(blob)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return os.path.getsize(path)
+
+
+# ------------------------------
+# Loading and scoring (NumPy only)
+# ------------------------------
+
+def _strip_accents_unicode(text):
+    normalized = unicodedata.normalize("NFKD", text)
+    if normalized == text:
+        return text
+    return "".join(c for c in normalized if not unicodedata.combining(c))
+
+
+def _strip_accents_ascii(text):
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+
+
+_ACCENT_STRIPPERS = {None: None, "unicode": _strip_accents_unicode, "ascii": _strip_accents_ascii}
+
+
+class CompactLinearModel:
+    """A memory-mapped linear pipeline with the scikit-learn prediction interface.
+
+    ``decision_function``/``predict`` take raw texts, like the pipeline they
+    were exported from; see :class:`CompactProbabilisticModel` for models
+    that also have ``predict_proba``.
+    """
+
+    def __init__(self, header, arrays, path=None):
+        self.path = path
+        self.header = header
+        self.output = header["output"]
+        self.classes_ = np.asarray(header["classes"])
+        self.vocab = arrays["vocab"]
+        self.weights = arrays["weights"]
+        self.intercept = arrays["intercept"]
+        self.idf = arrays.get("idf")
+
+        config = header["analyzer"]
+        self.lowercase = config["lowercase"]
+        self.ngram_range = tuple(config["ngram_range"])
+        self.binary = config["binary"]
+        self.sublinear_tf = config["sublinear_tf"]
+        self.norm = config["norm"]
+        self._strip_accents = _ACCENT_STRIPPERS[config["strip_accents"]]
+        self._token = re.compile(config["token_pattern"])
+        self._stop_words = frozenset(config["stop_words"] or ())
+
+    @property
+    def n_features(self):
+        return len(self.vocab)
+
+    def analyze(self, text):
+        """The n-grams of ``text``, as the original vectorizer's ``build_analyzer()`` produces them."""
+        if self.lowercase:
+            text = text.lower()
+        if self._strip_accents is not None:
+            text = self._strip_accents(text)
+        tokens = self._token.findall(text)
+        if self._stop_words:
+            tokens = [t for t in tokens if t not in self._stop_words]
+        low, high = self.ngram_range
+        if high == 1:
+            return tokens
+        grams = list(tokens) if low == 1 else []
+        for n in range(max(low, 2), min(high, len(tokens)) + 1):
+            grams.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return grams
+
+    def transform(self, texts):
+        """Sparse TF-IDF rows as ``(doc, feature, value)`` arrays, sorted by document."""
+        doc_ids, grams = [], []
+        for i, text in enumerate(texts):
+            doc_grams = self.analyze(text)
+            grams.extend(g.encode("utf-8") for g in doc_grams)
+            doc_ids.extend([i] * len(doc_grams))
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+
+        # one vectorized lookup for the whole batch; longer n-grams cannot be in the vocabulary
+        width = self.vocab.dtype.itemsize
+        fits = np.fromiter((len(g) <= width for g in grams), dtype=bool, count=len(grams))
+        query = np.array([g for g, ok in zip(grams, fits) if ok], dtype=self.vocab.dtype)
+        doc_ids = doc_ids[fits]
+        if self.n_features and len(query):
+            found = np.minimum(np.searchsorted(self.vocab, query), self.n_features - 1)
+            hit = self.vocab[found] == query
+            doc_ids, features = doc_ids[hit], found[hit]
+        else:
+            doc_ids, features = doc_ids[:0], doc_ids[:0]
+
+        keys, counts = np.unique(doc_ids * max(self.n_features, 1) + features, return_counts=True)
+        docs, features = np.divmod(keys, max(self.n_features, 1))
+        values = np.ones(len(keys)) if self.binary else counts.astype(np.float64)
+        if self.sublinear_tf:
+            values = np.log(values) + 1.0
+        if self.idf is not None:
+            values = values * self.idf[features]
+        if self.norm is not None:
+            squares = values * values if self.norm == "l2" else np.abs(values)
+            norms = np.bincount(docs, squares, minlength=len(texts))
+            if self.norm == "l2":
+                norms = np.sqrt(norms)
+            norms[norms == 0] = 1.0
+            values = values / norms[docs]
+        return docs, features, values
+
+    def decision_function(self, texts):
+        texts = list(texts)
+        docs, features, values = self.transform(texts)
+        weights = self.weights[features]
+        scores = np.empty((len(texts), self.weights.shape[1]))
+        for j in range(scores.shape[1]):
+            scores[:, j] = np.bincount(docs, values * weights[:, j], minlength=len(texts))
+        scores += self.intercept
+        return scores.ravel() if scores.shape[1] == 1 else scores
+
+    def predict(self, texts):
+        scores = self.decision_function(texts)
+        if scores.ndim == 1:
+            return self.classes_[(scores > 0).astype(int)]
+        return self.classes_[scores.argmax(axis=1)]
+
+
+class CompactProbabilisticModel(CompactLinearModel):
+    """A :class:`CompactLinearModel` of a classifier with ``predict_proba`` (NB, LR)."""
+
+    def predict_proba(self, texts):
+        scores = self.decision_function(texts)
+        if self.output == "sigmoid":
+            p = np.exp(-np.logaddexp(0.0, -scores))
+            return np.column_stack([1.0 - p, p])
+        if self.output == "ovr":
+            p = np.exp(-np.logaddexp(0.0, -scores))
+            return p / p.sum(axis=1, keepdims=True)
+        scores = np.exp(scores - scores.max(axis=1, keepdims=True))
+        return scores / scores.sum(axis=1, keepdims=True)
+
+
+def load_compact(path, mmap_mode="r"):
+    """Open a ``.compact`` file; with ``mmap_mode=None`` it is read into memory instead of mapped."""
+    with open(path, "rb") as f:
+        if mmap_mode is None:
+            buffer = f.read()
+        else:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if bytes(buffer[:len(MAGIC)]) != MAGIC:
+        raise ValueError(f"{path} is not a compact model file")
+    (header_len,) = struct.unpack_from("<Q", buffer, len(MAGIC))
+    start = len(MAGIC) + 8
+    header = json.loads(bytes(buffer[start:start + header_len]).decode("utf-8"))
+    if header.get("format") != FORMAT_VERSION or header["output"] not in OUTPUTS:
+        raise ValueError(f"unsupported compact model format in {path}")
+
+    data_start = _align(start + header_len)
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        arrays[name] = np.frombuffer(buffer, dtype=dtype, count=count,
+                                     offset=data_start + spec["offset"]).reshape(spec["shape"])
+    cls = CompactLinearModel if header["output"] == "margin" else CompactProbabilisticModel
+    return cls(header, arrays, path=path)
+
+
+def compare_predictions(reference, compact, texts):
+    """How closely ``compact`` reproduces ``reference`` (e.g. the sklearn pipeline) on ``texts``."""
+    texts = list(texts)
+    expected, actual = np.asarray(reference.predict(texts)), np.asarray(compact.predict(texts))
+    report = {"rows": len(texts), "label_agreement": float(np.mean(expected == actual)) if texts else 1.0}
+    if hasattr(reference, "predict_proba") and hasattr(compact, "predict_proba"):
+        diff = np.abs(np.asarray(reference.predict_proba(texts)) - compact.predict_proba(texts))
+        report["max_probability_diff"] = float(diff.max()) if diff.size else 0.0
+    else:
+        diff = np.abs(np.asarray(reference.decision_function(texts)) - compact.decision_function(texts))
+        report["max_margin_diff"] = float(diff.max()) if diff.size else 0.0
+    return report
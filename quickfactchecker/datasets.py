@@ -0,0 +1,382 @@
+"""Shared loaders for the LIAR and Fake/True corpora, backed by a columnar cache.
+
+The first load of a source parses it, cleans its text with
+:func:`quickfactchecker.preprocessing.preprocess_batch` and writes one
+directory per source under ``.cache/datasets``::
+
+    meta.json              schema, categories, row count, source hashes
+    <col>.codes.npy        category columns: int codes (-1 = missing)
+    <col>.npy              numeric columns
+    <col>.offsets.npy      text columns: start of row i in <col>.data.npy
+    <col>.data.npy         text columns: UTF-8, each row NUL-terminated
+
+The directory name is derived from the SHA-256 of the source files and of
+the preprocessing code, so editing either rebuilds the cache; file hashes are
+remembered per (path, size, mtime) so an unchanged source is not re-read.
+Later loads only memory-map the arrays: :class:`Dataset` decodes the columns
+(:meth:`Dataset.select`) and rows (:meth:`Dataset.iter_batches`) it is asked
+for, and cleaned text is available as the ``clean_text`` column.
+
+    liar = load_liar()                                  # train + valid + test
+    texts, labels = liar.column("clean_text"), liar.column("label")
+    news = load_fake_true("True.csv", "Fake.csv")
+    frame = news.to_pandas(["clean_text", "label"])
+"""
+
+import csv
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+DATASET_CACHE_DIR = os.path.join(".cache", "datasets")
+LIAR_DIR = os.path.join("module", "dataset", "liar")
+FORMAT_VERSION = 1
+
+LIAR_COLUMNS = [
+    "id", "label", "statement", "subject", "speaker", "job", "state", "party",
+    "barely_true_counts", "false_counts", "half_true_counts", "mostly_true_counts",
+    "pants_on_fire_counts", "context"
+]
+LIAR_COUNT_COLUMNS = LIAR_COLUMNS[8:13]
+# pandas.read_csv arguments that parse LIAR like iter_liar_rows (no quoting), for chunked reads
+LIAR_READ_CSV_OPTIONS = {"sep": "\t", "header": None, "names": LIAR_COLUMNS, "quoting": csv.QUOTE_NONE}
+LIAR_LABELS = ["pants-fire", "false", "barely-true", "half-true", "mostly-true", "true"]
+
+# column kinds: "text", "category" or a numpy dtype
+TEXT, CATEGORY = "text", "category"
+LIAR_SCHEMA = {
+    "id": TEXT, "label": CATEGORY, "statement": TEXT, "subject": CATEGORY, "speaker": CATEGORY,
+    "job": CATEGORY, "state": CATEGORY, "party": CATEGORY,
+    **{name: "float32" for name in LIAR_COUNT_COLUMNS},
+    "context": CATEGORY, "split": CATEGORY, "clean_text": TEXT,
+}
+FAKE_TRUE_SCHEMA = {
+    "title": TEXT, "text": TEXT, "subject": CATEGORY, "date": CATEGORY,
+    "label": "int8", "source": CATEGORY, "clean_text": TEXT,
+}
+
+
+def file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cached_file_sha256(path, cache_dir=DATASET_CACHE_DIR):
+    """:func:`file_sha256`, remembered in ``cache_dir`` until the file's size or mtime changes."""
+    st = os.stat(path)
+    memo_path = os.path.join(cache_dir, "hashes.json")
+    try:
+        with open(memo_path, encoding="utf-8") as f:
+            memo = json.load(f)
+    except (OSError, ValueError):
+        memo = {}
+    key = os.path.abspath(path)
+    entry = memo.get(key)
+    if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+        return entry["sha256"]
+
+    digest = file_sha256(path)
+    memo[key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(memo, f, indent=1)
+    os.replace(tmp, memo_path)
+    return digest
+
+
+def liar_paths(splits=("train", "valid", "test"), directory=LIAR_DIR):
+    return [os.path.join(directory, f"{split}.tsv") for split in splits]
+
+
+def iter_liar_rows(path):
+    """Yield the raw 14 fields of every well-formed row of a LIAR TSV file.
+
+    LIAR is tab-separated without quoting; rows with another number of fields
+    are skipped.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+            if len(row) == len(LIAR_COLUMNS):
+                yield row
+
+
+# ------------------------------
+# Reading a cache entry
+# ------------------------------
+
+class Dataset:
+    """A memory-mapped cache entry; see the module docstring for the layout.
+
+    ``columns`` restricts the view to a subset of the stored columns. Text
+    columns are returned as lists of ``str``, category columns as object
+    arrays of their values (``None`` where missing) and numeric columns as
+    read-only arrays backed by the cache file.
+    """
+
+    def __init__(self, path, columns=None):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.schema = {name: spec["kind"] for name, spec in self.meta["columns"].items()}
+        unknown = [name for name in columns or () if name not in self.schema]
+        if unknown:
+            raise KeyError(f"unknown column(s) {unknown}; available: {list(self.schema)}")
+        self.columns = list(columns or self.schema)
+        self._arrays = {}
+        self._categories = {}
+
+    def __len__(self):
+        return self.meta["rows"]
+
+    def select(self, columns):
+        """The same rows restricted to ``columns`` (nothing is read)."""
+        return Dataset(self.path, columns)
+
+    def _array(self, filename):
+        array = self._arrays.get(filename)
+        if array is None:
+            full = os.path.join(self.path, filename)
+            try:
+                array = np.load(full, mmap_mode="r")
+            except ValueError:  # zero-length arrays cannot be mapped
+                array = np.load(full)
+            self._arrays[filename] = array
+        return array
+
+    def categories(self, name):
+        categories = self._categories.get(name)
+        if categories is None:
+            categories = self._categories[name] = np.array(self.meta["columns"][name]["categories"] + [None],
+                                                           dtype=object)
+        return categories
+
+    def codes(self, name, start=0, stop=None):
+        """Integer codes of a category column (``-1`` where missing)."""
+        return self._array(f"{name}.codes.npy")[start:stop]
+
+    def column(self, name, start=0, stop=None):
+        if name not in self.columns:
+            raise KeyError(f"column {name!r} not selected; available: {self.columns}")
+        kind = self.schema[name]
+        stop = len(self) if stop is None else min(stop, len(self))
+        if kind == TEXT:
+            if stop <= start:
+                return []
+            offsets, data = self._array(f"{name}.offsets.npy"), self._array(f"{name}.data.npy")
+            blob = data[offsets[start]:offsets[stop]].tobytes().decode("utf-8")
+            return blob.split("\0")[:-1]
+        if kind == CATEGORY:
+            # code -1 picks the trailing None
+            return self.categories(name)[self.codes(name, start, stop)]
+        return self._array(f"{name}.npy")[start:stop]
+
+    def iter_batches(self, batch_size=10000, columns=None):
+        """Yield ``{column: values}`` dicts of at most ``batch_size`` consecutive rows."""
+        columns = columns or self.columns
+        for start in range(0, len(self), batch_size):
+            yield {name: self.column(name, start, start + batch_size) for name in columns}
+
+    def to_pandas(self, columns=None, start=0, stop=None):
+        """A DataFrame of ``columns``; category columns become ``pd.Categorical`` without decoding."""
+        import pandas as pd
+
+        data = {}
+        for name in columns or self.columns:
+            if name not in self.columns:
+                raise KeyError(f"column {name!r} not selected; available: {self.columns}")
+            if self.schema[name] == CATEGORY:
+                data[name] = pd.Categorical.from_codes(np.asarray(self.codes(name, start, stop)),
+                                                       categories=self.meta["columns"][name]["categories"])
+            else:
+                data[name] = self.column(name, start, stop)
+        return pd.DataFrame(data)
+
+
+# ------------------------------
+# Writing a cache entry
+# ------------------------------
+
+def _code_dtype(n_categories):
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def _write_text(path, name, values):
+    encoded = [("" if _is_missing(v) else str(v)).replace("\0", "").encode("utf-8") + b"\0" for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(v) for v in encoded], out=offsets[1:])
+    np.save(os.path.join(path, f"{name}.offsets.npy"), offsets)
+    np.save(os.path.join(path, f"{name}.data.npy"), np.frombuffer(b"".join(encoded), dtype=np.uint8))
+    return {"kind": TEXT}
+
+
+def _write_category(path, name, values, categories=None):
+    values = ["" if _is_missing(v) else str(v) for v in values]
+    categories = list(categories or sorted(set(values) - {""}))
+    index = {value: i for i, value in enumerate(categories)}
+    codes = np.fromiter((index.get(v, -1) for v in values), dtype=np.int64, count=len(values))
+    np.save(os.path.join(path, f"{name}.codes.npy"), codes.astype(_code_dtype(len(categories))))
+    return {"kind": CATEGORY, "categories": categories}
+
+
+def _write_numeric(path, name, values, dtype):
+    array = np.asarray(values, dtype=np.float64) if np.dtype(dtype).kind == "f" else np.asarray(values)
+    np.save(os.path.join(path, f"{name}.npy"), array.astype(dtype))
+    return {"kind": np.dtype(dtype).name}
+
+
+def _write_entry(path, schema, data, categories=None, **meta):
+    categories = categories or {}
+    columns = {}
+    rows = len(next(iter(data.values())))
+    for name, kind in schema.items():
+        if kind == TEXT:
+            columns[name] = _write_text(path, name, data[name])
+        elif kind == CATEGORY:
+            columns[name] = _write_category(path, name, data[name], categories.get(name))
+        else:
+            columns[name] = _write_numeric(path, name, data[name], kind)
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(dict(meta, format=FORMAT_VERSION, rows=rows, columns=columns), f, indent=1, ensure_ascii=False)
+
+
+def _preprocessing_hash():
+    from quickfactchecker import preprocessing
+    return file_sha256(preprocessing.__file__)
+
+
+def _cached(kind, paths, build, cache_dir, columns, rebuild, params=None):
+    """Open the cache entry for ``paths``, calling ``build(paths) -> (schema, data, extra)`` on a miss."""
+    sources = [{"path": os.path.abspath(p), "sha256": cached_file_sha256(p, cache_dir)} for p in paths]
+    payload = {"kind": kind, "sources": [s["sha256"] for s in sources], "params": params,
+               "preprocessing": _preprocessing_hash(), "format": FORMAT_VERSION}
+    key = hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+    entry = os.path.join(cache_dir, f"{kind}-{key}")
+    if rebuild and os.path.exists(entry):
+        shutil.rmtree(entry, ignore_errors=True)
+
+    if not os.path.exists(os.path.join(entry, "meta.json")):
+        start = time.perf_counter()
+        schema, data, extra = build(paths)
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=cache_dir, prefix=f".{kind}-{key}-")
+        try:
+            _write_entry(tmp, schema, data, sources=sources, params=params,
+                         build_seconds=time.perf_counter() - start, **extra)
+            os.replace(tmp, entry)
+        except OSError:
+            # another process stored the same entry first
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not os.path.exists(os.path.join(entry, "meta.json")):
+                raise
+    return Dataset(entry, columns)
+
+
+def _clean(texts):
+    from quickfactchecker.preprocessing import preprocess_batch
+    return preprocess_batch(["" if _is_missing(t) else str(t) for t in texts])
+
+
+# ------------------------------
+# Sources
+# ------------------------------
+
+def _build_liar(paths):
+    data = {name: [] for name in LIAR_COLUMNS + ["split"]}
+    skipped = 0
+    for path in paths:
+        split = os.path.splitext(os.path.basename(path))[0]
+        with open(path, encoding="utf-8", newline="") as f:
+            total = sum(1 for _ in csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE))
+        rows = 0
+        for row in iter_liar_rows(path):
+            for name, value in zip(LIAR_COLUMNS, row):
+                data[name].append(value)
+            data["split"].append(split)
+            rows += 1
+        skipped += total - rows
+    for name in LIAR_COUNT_COLUMNS:
+        data[name] = [float(v) if v.strip() else np.nan for v in data[name]]
+    data["clean_text"] = _clean(data["statement"])
+    return LIAR_SCHEMA, data, {"skipped_rows": skipped, "label_order": LIAR_LABELS}
+
+
+def load_liar(paths=None, cache_dir=DATASET_CACHE_DIR, columns=None, rebuild=False):
+    """The LIAR splits at ``paths`` (one path or a list; default train, valid and test) as one :class:`Dataset`.
+
+    Rows keep the files' order; the ``split`` column names the file each row
+    came from.
+    """
+    paths = [paths] if isinstance(paths, (str, os.PathLike)) else list(paths or liar_paths())
+    return _cached("liar", [os.fspath(p) for p in paths], _build_liar, cache_dir, columns, rebuild)
+
+
+def _build_fake_true(paths):
+    import pandas as pd
+
+    true_path, fake_path = paths
+    # same order and extra columns as module/dataset.ipynb's News.csv
+    fake, true = pd.read_csv(fake_path), pd.read_csv(true_path)
+    fake["label"], fake["source"] = 0, "fake"
+    true["label"], true["source"] = 1, "true"
+    news = pd.concat([fake, true], ignore_index=True)
+    data = {name: news[name].tolist() for name in FAKE_TRUE_SCHEMA if name in news}
+    data["clean_text"] = _clean(data["text"])
+    return FAKE_TRUE_SCHEMA, data, {}
+
+
+def load_fake_true(true_path, fake_path, cache_dir=DATASET_CACHE_DIR, columns=None, rebuild=False):
+    """``Fake.csv`` followed by ``True.csv`` (labels 0 and 1, ``source`` "fake"/"true") as one :class:`Dataset`."""
+    return _cached("fake_true", [os.fspath(true_path), os.fspath(fake_path)], _build_fake_true,
+                   cache_dir, columns, rebuild)
+
+
+def _table_schema(frame, text_col):
+    schema = {}
+    for name in frame.columns:
+        series = frame[name]
+        if series.dtype.kind in "biuf":
+            schema[name] = "int8" if series.dtype.kind == "b" else series.dtype.name
+        elif name == text_col or series.nunique() > len(series) // 2:
+            schema[name] = TEXT
+        else:
+            schema[name] = CATEGORY
+    schema["clean_text"] = TEXT
+    return schema
+
+
+def load_table(path, text_col, sep=None, cache_dir=DATASET_CACHE_DIR, columns=None, rebuild=False):
+    """Any CSV/TSV with a header row; ``clean_text`` is the cleaned ``text_col``.
+
+    Numeric columns keep their dtype; string columns with many distinct
+    values are stored as text and the others as categories.
+    """
+    path = os.fspath(path)
+    sep = sep or ("\t" if path.endswith(".tsv") else ",")
+
+    def build(paths):
+        import pandas as pd
+
+        frame = pd.read_csv(paths[0], sep=sep)
+        if text_col not in frame:
+            raise KeyError(f"no column {text_col!r} in {paths[0]}; columns: {list(frame.columns)}")
+        data = {str(name): frame[name].tolist() for name in frame.columns}
+        data["clean_text"] = _clean(data[text_col])
+        return _table_schema(frame, text_col), data, {}
+
+    return _cached("table", [path], build, cache_dir, columns, rebuild, params={"text_col": text_col, "sep": sep})
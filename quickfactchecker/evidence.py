@@ -0,0 +1,359 @@
+"""BM25 search over previously fact-checked LIAR statements.
+
+An index directory holds one immutable segment plus an append-only log of
+statements added since it was built::
+
+    meta.json           corpus statistics and BM25 parameters
+    vocab.json          term -> term id
+    offsets.npy         postings of term t are [offsets[t], offsets[t + 1])
+    postings_doc.npy    document ids, int32
+    postings_tf.npy     term frequencies, int32
+    doc_len.npy         tokens per document, int32
+    docs.jsonl          one JSON object per document (label, speaker, ...)
+    doc_offsets.npy     byte offsets of the documents in docs.jsonl
+    added.jsonl         documents added with EvidenceIndex.add()
+
+The arrays and the document store are memory-mapped, so opening an index
+reads little more than the vocabulary and workers started from the same
+files share their pages. A query touches only the postings of its terms and
+decodes only the top-k documents. Added documents are kept in a small
+in-memory segment that is searched alongside the main one; other processes
+pick them up with :meth:`EvidenceIndex.refresh`, and :meth:`compact` folds
+them into a new main segment.
+"""
+
+import json
+import math
+import mmap
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+
+from quickfactchecker.datasets import LIAR_COLUMNS, iter_liar_rows
+from quickfactchecker.preprocessing import ENGLISH_STOPWORDS
+
+# columns returned with each match
+EVIDENCE_FIELDS = ("id", "label", "statement", "subject", "speaker", "job", "state", "party", "context")
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_ARRAYS = ("offsets", "postings_doc", "postings_tf", "doc_len", "doc_offsets")
+ADDED_LOG = "added.jsonl"
+
+
+def analyze(text):
+    """Lowercased alphanumeric tokens without English stopwords."""
+    return [t for t in _TOKEN.findall(str(text).lower()) if t not in ENGLISH_STOPWORDS]
+
+
+def read_liar(path, split=None):
+    """Yield LIAR rows from a TSV file as dicts of :data:`EVIDENCE_FIELDS` (plus ``split``)."""
+    split = split or os.path.splitext(os.path.basename(path))[0]
+    for row in iter_liar_rows(path):
+        if not row[2].strip():
+            continue
+        doc = {name: value for name, value in zip(LIAR_COLUMNS, row) if name in EVIDENCE_FIELDS}
+        doc["split"] = split
+        yield doc
+
+
+def _write_segment(path, docs, k1, b):
+    """Write ``docs`` as a main segment into the empty directory ``path``."""
+    doc_ids = []
+    term_ids = {}
+    postings = []  # (term id, doc id, tf)
+    doc_len = np.zeros(len(docs), dtype=np.int32)
+    doc_offsets = np.zeros(len(docs) + 1, dtype=np.int64)
+
+    with open(os.path.join(path, "docs.jsonl"), "wb") as f:
+        for i, doc in enumerate(docs):
+            counts = Counter(analyze(doc["statement"]))
+            doc_len[i] = sum(counts.values())
+            for term, tf in counts.items():
+                postings.append((term_ids.setdefault(term, len(term_ids)), i, tf))
+            line = (json.dumps(doc, ensure_ascii=False) + "\n").encode("utf-8")
+            f.write(line)
+            doc_offsets[i + 1] = doc_offsets[i] + len(line)
+            doc_ids.append(doc["id"])
+
+    postings = np.array(postings, dtype=np.int64).reshape(-1, 3)
+    postings = postings[np.lexsort((postings[:, 1], postings[:, 0]))]
+    offsets = np.zeros(len(term_ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(postings[:, 0], minlength=len(term_ids)), out=offsets[1:])
+
+    arrays = {
+        "offsets": offsets,
+        "postings_doc": postings[:, 1].astype(np.int32),
+        "postings_tf": postings[:, 2].astype(np.int32),
+        "doc_len": doc_len,
+        "doc_offsets": doc_offsets,
+    }
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), array)
+    with open(os.path.join(path, "vocab.json"), "w", encoding="utf-8") as f:
+        json.dump(term_ids, f, ensure_ascii=False)
+    with open(os.path.join(path, "ids.json"), "w", encoding="utf-8") as f:
+        json.dump(doc_ids, f)
+    open(os.path.join(path, ADDED_LOG), "wb").close()
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"format": 1, "n_docs": len(docs), "n_terms": len(term_ids),
+                   "total_len": int(doc_len.sum()), "k1": k1, "b": b}, f, indent=2)
+
+
+def build_index(docs, path, k1=1.2, b=0.75):
+    """Build an index from ``docs`` (dicts with at least ``id`` and ``statement``).
+
+    Duplicate ids keep their first occurrence. An existing index at ``path``
+    is replaced only once the new one is complete.
+    """
+    seen, unique = set(), []
+    for doc in docs:
+        if doc["id"] not in seen:
+            seen.add(doc["id"])
+            unique.append(doc)
+
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=parent, prefix=f".{os.path.basename(path)}-")
+    try:
+        _write_segment(tmp, unique, k1, b)
+        old = None
+        if os.path.exists(path):
+            old = tempfile.mkdtemp(dir=parent, prefix=f".{os.path.basename(path)}-old-")
+            os.rmdir(old)
+            os.replace(path, old)
+        os.replace(tmp, path)
+        if old is not None:
+            shutil.rmtree(old, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return path
+
+
+class EvidenceIndex:
+    """A memory-mapped BM25 index; see the module docstring for the layout."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        with open(os.path.join(path, "vocab.json"), encoding="utf-8") as f:
+            self.vocab = json.load(f)
+        for name in _ARRAYS:
+            setattr(self, name, np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r"))
+        self.k1 = self.meta["k1"]
+        self.b = self.meta["b"]
+        self.n_main = self.meta["n_docs"]
+
+        with open(os.path.join(path, "docs.jsonl"), "rb") as f:
+            self._docs = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.n_main else b""
+
+        self._lock = threading.Lock()
+        self._signature = self._meta_signature()
+        self._ids = None
+        self._log_offset = 0
+        # in-memory segment: (documents, term -> (doc ids, tfs), their lengths,
+        # length norm of every document); replaced as a whole so searches never
+        # see half an add
+        self._view = ([], {}, [], self._length_norm([]))
+        self.refresh()
+
+    def __len__(self):
+        return len(self._view[3])
+
+    def _meta_signature(self):
+        st = os.stat(os.path.join(self.path, "meta.json"))
+        return st.st_ino, st.st_mtime_ns
+
+    def is_stale(self):
+        """True once the main segment on disk was rebuilt (e.g. by :meth:`compact`)."""
+        try:
+            return self._meta_signature() != self._signature
+        except OSError:
+            return False
+
+    def _length_norm(self, added_lengths):
+        # BM25's per-document length normalization, over both segments
+        lengths = np.concatenate([np.asarray(self.doc_len, dtype=np.float32),
+                                  np.asarray(added_lengths, dtype=np.float32)])
+        avgdl = float(lengths.sum()) / max(len(lengths), 1) or 1.0
+        return (self.k1 * (1 - self.b + self.b * lengths / avgdl)).astype(np.float32)
+
+    def _known_ids(self):
+        if self._ids is None:
+            with open(os.path.join(self.path, "ids.json"), encoding="utf-8") as f:
+                self._ids = set(json.load(f))
+            self._ids.update(doc["id"] for doc in self._view[0])
+        return self._ids
+
+    def _unseen(self, docs):
+        known, unseen = self._known_ids(), []
+        for doc in docs:
+            if doc["id"] not in known:
+                known.add(doc["id"])
+                unseen.append(doc)
+        return unseen
+
+    def _index_added(self, docs):
+        if not docs:
+            return
+        added, postings, lengths, _ = self._view
+        added, postings, lengths = list(added), dict(postings), list(lengths)
+        for doc in docs:
+            counts = Counter(analyze(doc["statement"]))
+            doc_id = self.n_main + len(added)
+            for term, tf in counts.items():
+                ids, tfs = postings.get(term, ((), ()))
+                postings[term] = (ids + (doc_id,), tfs + (tf,))
+            added.append(doc)
+            lengths.append(sum(counts.values()))
+        self._view = (added, postings, lengths, self._length_norm(lengths))
+
+    def refresh(self):
+        """Index documents appended to the add log (by any process) since the last call."""
+        with self._lock:
+            try:
+                with open(os.path.join(self.path, ADDED_LOG), "rb") as f:
+                    f.seek(self._log_offset)
+                    data = f.read()
+            except FileNotFoundError:
+                return 0
+            # a writer may be mid-line; leave the partial line for the next call
+            complete = data[:data.rfind(b"\n") + 1]
+            if not complete:
+                return 0
+            self._log_offset += len(complete)
+            docs = self._unseen(json.loads(line) for line in complete.splitlines() if line.strip())
+            self._index_added(docs)
+            return len(docs)
+
+    def add(self, docs):
+        """Index new fact-checks without a rebuild; returns how many were new.
+
+        Documents whose id is already indexed are skipped. New ones are
+        appended to the add log, so they survive a restart and other
+        processes see them on :meth:`refresh`.
+        """
+        rows = []
+        for doc in docs:
+            if not str(doc.get("statement", "")).strip() or not str(doc.get("id", "")).strip():
+                raise ValueError("every document needs a non-empty 'id' and 'statement'")
+            row = {name: str(doc.get(name, "")) for name in EVIDENCE_FIELDS}
+            row["split"] = doc.get("split", "added")
+            rows.append(row)
+
+        self.refresh()
+        with self._lock:
+            new = self._unseen(rows)
+            if not new:
+                return 0
+            payload = "".join(json.dumps(doc, ensure_ascii=False) + "\n" for doc in new).encode("utf-8")
+            with open(os.path.join(self.path, ADDED_LOG), "ab") as f:
+                f.write(payload)
+            self._log_offset += len(payload)
+            self._index_added(new)
+            return len(new)
+
+    def document(self, doc_id):
+        if doc_id >= self.n_main:
+            return dict(self._view[0][doc_id - self.n_main])
+        start, end = int(self.doc_offsets[doc_id]), int(self.doc_offsets[doc_id + 1])
+        return json.loads(self._docs[start:end])
+
+    def search(self, query, k=5):
+        """Top-``k`` documents for ``query`` as dicts with a ``score``, best first."""
+        terms = set(analyze(query))
+        added_docs, added_postings, _, norm = self._view
+        n_docs = len(norm)
+        if not terms or not n_docs or k <= 0:
+            return []
+        scores = np.zeros(n_docs, dtype=np.float32)
+        k1 = self.k1 + 1
+        for term in terms:
+            term_id = self.vocab.get(term)
+            added = added_postings.get(term)
+            main_df = 0
+            if term_id is not None:
+                start, end = int(self.offsets[term_id]), int(self.offsets[term_id + 1])
+                main_df = end - start
+            df = main_df + (len(added[0]) if added else 0)
+            if not df:
+                continue
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            if main_df:
+                docs = self.postings_doc[start:end]
+                tf = self.postings_tf[start:end].astype(np.float32)
+                scores[docs] += idf * tf * k1 / (tf + norm[docs])
+            if added:
+                docs = np.asarray(added[0])
+                tf = np.asarray(added[1], dtype=np.float32)
+                scores[docs] += idf * tf * k1 / (tf + norm[docs])
+
+        k = min(k, n_docs)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        results = []
+        for i in top:
+            if scores[i] <= 0:
+                break
+            doc = dict(added_docs[i - self.n_main]) if i >= self.n_main else self.document(int(i))
+            results.append(dict(doc, score=round(float(scores[i]), 4)))
+        return results
+
+    def compact(self):
+        """Fold added documents into a new main segment; returns the reopened index."""
+        self.refresh()
+        docs = [self.document(i) for i in range(len(self))]
+        self.close()
+        build_index(docs, self.path, k1=self.k1, b=self.b)
+        return EvidenceIndex(self.path)
+
+    def close(self):
+        if isinstance(self._docs, mmap.mmap):
+            self._docs.close()
+
+
+class EvidenceUnavailableError(LookupError):
+    """The evidence index has not been built."""
+
+
+class LazyEvidenceIndex:
+    """Opens the index at ``path`` on first use and keeps it current.
+
+    Like :class:`~quickfactchecker.registry.ModelRegistry`, it re-checks the
+    directory at most every ``check_interval`` seconds: statements added by
+    another process are picked up with :meth:`EvidenceIndex.refresh`, and a
+    rebuilt index is reopened.
+    """
+
+    def __init__(self, path, check_interval=2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._index = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def is_available(self):
+        return self._index is not None or os.path.exists(os.path.join(self.path, "meta.json"))
+
+    def get(self):
+        index = self._index
+        if index is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return index
+        with self._lock:
+            if self._index is None or self._index.is_stale():
+                try:
+                    self._index = EvidenceIndex(self.path)
+                except FileNotFoundError:
+                    if self._index is None:
+                        raise EvidenceUnavailableError(f"Evidence index not found at {self.path}")
+            else:
+                self._index.refresh()
+            self._checked_at = time.monotonic()
+            return self._index
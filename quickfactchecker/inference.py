@@ -0,0 +1,83 @@
+"""Vectorized scoring helpers for the fitted text-classification pipelines."""
+
+from contextlib import nullcontext
+
+import numpy as np
+
+
+def _to_builtin(value):
+    """Convert numpy scalars (e.g. ``np.int64`` labels) into JSON-friendly values."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _no_timer(stage):
+    return nullcontext()
+
+
+def score_texts(model, texts, timer=None):
+    """Score ``texts`` with a single ``predict_proba`` call.
+
+    Returns one ``{'prediction': label, 'probability': p}`` dict per input, in
+    order. ``probability`` is the probability of the predicted label, or
+    ``None`` for estimators without ``predict_proba`` (e.g. ``LinearSVC``).
+
+    ``timer(stage)`` returns a context manager wrapped around the
+    ``"vectorize"`` and ``"classify"`` steps; for that, pipelines run their
+    transformers and final estimator separately, as ``Pipeline`` itself does.
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+
+    timer = timer or _no_timer
+    steps = getattr(model, "steps", None)
+    if steps and len(steps) > 1:
+        with timer("vectorize"):
+            for _, step in steps[:-1]:
+                if step is not None and step != "passthrough":
+                    texts = step.transform(texts)
+        model = steps[-1][1]
+
+    with timer("classify"):
+        return _score(model, texts)
+
+
+def _score(model, texts):
+    if hasattr(model, "predict_proba"):
+        proba = np.asarray(model.predict_proba(texts))
+        classes = np.asarray(model.classes_)
+        best = proba.argmax(axis=1)
+        return [
+            {
+                "prediction": _to_builtin(classes[j]),
+                "probability": float(proba[i, j]),
+            }
+            for i, j in enumerate(best)
+        ]
+
+    predictions = model.predict(texts)
+    return [{"prediction": _to_builtin(p), "probability": None} for p in predictions]
+
+
+def predict_with_confidence(model, texts):
+    """Vectorized labels and confidence scores for ``texts``.
+
+    Returns ``(labels, probabilities, confidence)`` arrays. For estimators
+    with ``predict_proba`` the confidence is the probability of the predicted
+    label; otherwise it is the absolute ``decision_function`` margin (for
+    multi-class models, the gap between the two best classes) and
+    ``probabilities`` is None.
+    """
+    texts = list(texts)
+    if hasattr(model, "predict_proba"):
+        proba = np.asarray(model.predict_proba(texts))
+        best = proba.argmax(axis=1)
+        confidence = proba[np.arange(len(texts)), best]
+        return np.asarray(model.classes_)[best], confidence, confidence
+
+    margin = np.asarray(model.decision_function(texts))
+    if margin.ndim == 1:
+        labels = np.asarray(model.classes_)[(margin > 0).astype(int)]
+        return labels, None, np.abs(margin)
+    top2 = np.sort(margin, axis=1)[:, -2:]
+    return np.asarray(model.classes_)[margin.argmax(axis=1)], None, top2[:, 1] - top2[:, 0]
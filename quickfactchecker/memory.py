@@ -0,0 +1,30 @@
+"""Process memory measurements shared by the training and benchmark scripts."""
+
+import sys
+
+
+def _vm_hwm_mb():
+    # Linux keeps ru_maxrss across fork() and exec(), so a benchmark subprocess
+    # would report its parent's peak; VmHWM belongs to the current image only
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where unsupported."""
+    peak = _vm_hwm_mb()
+    if peak is not None:
+        return peak
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
@@ -0,0 +1,128 @@
+"""Out-of-core training for corpora that do not fit in memory.
+
+The dataset is read in chunks and vectorized with a stateless
+``HashingVectorizer``, so there is no vocabulary to fit up front and memory
+use depends on the chunk size rather than on the number of rows. Models that
+support ``partial_fit`` are updated chunk by chunk. Rows are assigned to the
+held-out split by a hash of their text, which keeps the split stable across
+passes and runs without storing row ids.
+"""
+
+import zlib
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.naive_bayes import MultinomialNB
+
+from quickfactchecker.memory import peak_rss_mb
+
+
+def make_streaming_models(random_state=42):
+    """Incremental counterparts of the in-memory baselines.
+
+    Random Forest has no ``partial_fit`` and is not trained in streaming mode;
+    SGD with log loss stands in for Logistic Regression.
+    """
+    return {
+        "Naive Bayes": MultinomialNB(alpha=0.01),
+        "Logistic Regression (SGD)": SGDClassifier(loss="log_loss", alpha=1e-5, random_state=random_state),
+    }
+
+
+def make_hashing_vectorizer(n_features=2 ** 18):
+    # alternate_sign=False keeps features non-negative, as MultinomialNB requires
+    return HashingVectorizer(n_features=n_features, alternate_sign=False, stop_words="english", norm="l2")
+
+
+def is_held_out(texts, test_percent):
+    """Boolean mask of rows that belong to the held-out split."""
+    return np.fromiter(
+        (zlib.crc32(str(t).encode("utf-8")) % 100 < test_percent for t in texts),
+        dtype=bool, count=len(texts),
+    )
+
+
+def iter_chunks(path, text_col, label_col, chunksize=10000, **read_csv_kwargs):
+    """Yield ``(texts, labels)`` arrays from a CSV/TSV file, ``chunksize`` rows at a time."""
+    reader = pd.read_csv(path, usecols=[text_col, label_col], chunksize=chunksize, **read_csv_kwargs)
+    for chunk in reader:
+        chunk = chunk.dropna(subset=[text_col, label_col])
+        yield chunk[text_col].astype(str).to_numpy(), chunk[label_col].to_numpy()
+
+
+def scan_classes(path, label_col, chunksize=100000, **read_csv_kwargs):
+    """Collect the label set in a cheap first pass; ``partial_fit`` needs it up front."""
+    classes = set()
+    for chunk in pd.read_csv(path, usecols=[label_col], chunksize=chunksize, **read_csv_kwargs):
+        classes.update(chunk[label_col].dropna().unique().tolist())
+    return np.array(sorted(classes))
+
+
+def scores_from_confusion(cm):
+    """Accuracy and macro precision/recall/F1 (zero_division=0) from a confusion matrix."""
+    cm = np.asarray(cm, dtype=float)
+    tp = np.diag(cm)
+    predicted = cm.sum(axis=0)
+    actual = cm.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(predicted > 0, tp / predicted, 0.0)
+        recall = np.where(actual > 0, tp / actual, 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+    # like sklearn, average only over labels that occur in y_true or y_pred
+    present = (predicted + actual) > 0
+    total = cm.sum()
+    return {
+        "accuracy": float(tp.sum() / total) if total else 0.0,
+        "precision": float(precision[present].mean()) if present.any() else 0.0,
+        "recall": float(recall[present].mean()) if present.any() else 0.0,
+        "f1": float(f1[present].mean()) if present.any() else 0.0,
+    }
+
+
+def train_streaming(path, text_col, label_col, models=None, vectorizer=None, chunksize=10000,
+                    test_percent=20, epochs=1, read_csv_kwargs=None):
+    """Train ``models`` with ``partial_fit`` over a file read in chunks.
+
+    Makes one pass to collect the classes, ``epochs`` training passes and one
+    evaluation pass over the held-out rows. Returns ``(results, models)`` where
+    ``results`` maps model name to its scores, the confusion matrix, the
+    number of rows seen and the peak RSS in MB.
+    """
+    read_csv_kwargs = read_csv_kwargs or {}
+    models = models if models is not None else make_streaming_models()
+    vectorizer = vectorizer if vectorizer is not None else make_hashing_vectorizer()
+    classes = scan_classes(path, label_col, **read_csv_kwargs)
+    class_index = {c: i for i, c in enumerate(classes)}
+
+    train_rows = 0
+    for _ in range(epochs):
+        for texts, labels in iter_chunks(path, text_col, label_col, chunksize, **read_csv_kwargs):
+            train = ~is_held_out(texts, test_percent)
+            if not train.any():
+                continue
+            X = vectorizer.transform(texts[train])
+            for model in models.values():
+                model.partial_fit(X, labels[train], classes=classes)
+            train_rows += int(train.sum())
+
+    confusion = {name: np.zeros((len(classes), len(classes)), dtype=np.int64) for name in models}
+    test_rows = 0
+    for texts, labels in iter_chunks(path, text_col, label_col, chunksize, **read_csv_kwargs):
+        test = is_held_out(texts, test_percent)
+        if not test.any():
+            continue
+        X = vectorizer.transform(texts[test])
+        y_true = np.array([class_index[c] for c in labels[test]])
+        for name, model in models.items():
+            y_pred = np.array([class_index[c] for c in model.predict(X)])
+            np.add.at(confusion[name], (y_true, y_pred), 1)
+        test_rows += int(test.sum())
+
+    peak = peak_rss_mb()
+    results = {}
+    for name, cm in confusion.items():
+        results[name] = dict(scores_from_confusion(cm), confusion=cm, classes=classes,
+                             train_rows=train_rows, test_rows=test_rows, peak_rss_mb=peak)
+    return results, models
@@ -0,0 +1,121 @@
+"""Text preprocessing shared by the training notebooks and the server.
+
+The notebooks in ``module/`` used to carry their own ``clean_text`` (eight
+``re.sub`` passes plus a per-character replace loop) and
+``remove_stopwords_from_sentence`` (rebuilding the NLTK stopword set and
+running ``word_tokenize`` per row). The functions here produce byte-identical
+output with patterns compiled once, a frozen stopword set and a tokenizer
+that only does the work ``word_tokenize`` would do on cleaned text, so models
+trained on the old output stay valid.
+
+Why the shortcuts are exact:
+
+* After ``[^a-zA-Z?.!,¿]+`` is replaced by a space, the text only contains
+  letters, spaces and ``?.!,¿``. Of the later steps only the removal of
+  ``string.punctuation`` can still change anything, and it only deletes
+  ``?.!,``; the tag, newline, digit-word and character-loop steps are no-ops.
+* On such text ``word_tokenize`` finds a single sentence (no ``.?!`` left),
+  and the only Treebank rules that can fire are whitespace splitting and
+  the ``cannot``/``gimme``/``gonna``/``gotta``/``lemme``/``wanna`` splits.
+  Anything else is handed to NLTK unchanged.
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+_BRACKETS = re.compile(r"\[.*?\]")
+_LINKS = re.compile(r"https?://\S+|www\.\S+")
+_NON_LETTERS = re.compile(r"[^a-zA-Z?.!,¿]+")
+_KEPT_PUNCTUATION = str.maketrans("", "", "?.!,")
+
+# Text made only of these characters can skip NLTK (see tokenize).
+_NEEDS_NLTK = re.compile(r"[^A-Za-z¿ ]")
+# NLTK's MacIntyre contractions that need no apostrophe, in one pattern.
+_CONTRACTIONS = re.compile(
+    r"(?i)\b(?:(can)(not)\b|(gim)(me)\b|(gon)(na)\b|(got)(ta)\b|(lem)(me)\b|(wan)(na)(?=\s))"
+)
+
+# nltk.corpus.stopwords.words('english'). Newer NLTK data releases add
+# contracted forms ("i'm", "they've", ...); those contain apostrophes, which
+# clean_text strips, so they never match cleaned text either way.
+ENGLISH_STOPWORDS = frozenset("""
+i me my myself we our ours ourselves you you're you've you'll you'd your yours
+yourself yourselves he him his himself she she's her hers herself it it's its
+itself they them their theirs themselves what which who whom this that that'll
+these those am is are was were be been being have has had having do does did
+doing a an the and but if or because as until while of at by for with about
+against between into through during before after above below to from up down
+in out on off over under again further then once here there when where why how
+all any both each few more most other some such no nor not only own same so
+than too very s t can will just don don't should should've now d ll m o re ve y
+ain aren aren't couldn couldn't didn didn't doesn doesn't hadn hadn't hasn
+hasn't haven haven't isn isn't ma mightn mightn't mustn mustn't needn needn't
+shan shan't shouldn shouldn't wasn wasn't weren weren't won won't wouldn
+wouldn't
+""".split())
+
+# Below this many texts preprocess_batch stays in-process; a pool costs more
+# to start than it saves.
+PARALLEL_THRESHOLD = 20000
+
+
+def clean_text(text):
+    '''Make text lowercase, remove text in square brackets,remove links,remove punctuation
+    and remove words containing numbers.'''
+    text = str(text).lower()
+    if "[" in text:
+        text = _BRACKETS.sub("", text)
+    if "http" in text or "www." in text:
+        text = _LINKS.sub("", text)
+    return _NON_LETTERS.sub(" ", text).translate(_KEPT_PUNCTUATION)
+
+
+def _split_contraction(match):
+    return " %s %s " % tuple(g for g in match.groups() if g is not None)
+
+
+def tokenize(sentence):
+    """Tokenize like ``nltk.word_tokenize``, without NLTK for already cleaned text."""
+    if _NEEDS_NLTK.search(sentence):
+        from nltk.tokenize import word_tokenize
+        return word_tokenize(sentence)
+    # NLTK pads the sentence with spaces before applying the contractions
+    return _CONTRACTIONS.sub(_split_contraction, sentence + " ").split()
+
+
+def remove_stopwords_from_sentence(sentence, stop_words=ENGLISH_STOPWORDS):
+    return " ".join(token for token in tokenize(sentence) if token not in stop_words)
+
+
+def preprocess(text):
+    """``clean_text`` followed by ``remove_stopwords_from_sentence``, as used for training."""
+    return remove_stopwords_from_sentence(clean_text(text))
+
+
+def _preprocess_chunk(args):
+    texts, clean, remove_stopwords = args
+    if clean:
+        texts = [clean_text(t) for t in texts]
+    if remove_stopwords:
+        texts = [remove_stopwords_from_sentence(t) for t in texts]
+    return texts
+
+
+def preprocess_batch(texts, workers=None, chunksize=5000, clean=True, remove_stopwords=True):
+    """Preprocess a corpus, fanning out over a process pool for large inputs.
+
+    ``workers=None`` uses one process per CPU once there are more than
+    ``PARALLEL_THRESHOLD`` texts; ``workers=1`` always stays in-process.
+    ``clean``/``remove_stopwords`` select the steps, so the notebooks can keep
+    inspecting the intermediate cleaned text. Returns a list in input order.
+    """
+    texts = list(texts)
+    if workers is None:
+        workers = (os.cpu_count() or 1) if len(texts) > PARALLEL_THRESHOLD else 1
+    if workers <= 1 or len(texts) <= chunksize:
+        return _preprocess_chunk((texts, clean, remove_stopwords))
+
+    chunks = [(texts[i:i + chunksize], clean, remove_stopwords) for i in range(0, len(texts), chunksize)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [text for chunk in pool.map(_preprocess_chunk, chunks) for text in chunk]
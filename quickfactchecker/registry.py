@@ -0,0 +1,278 @@
+"""Lazily loaded, hot-swappable registry of the trained model artifacts.
+
+Artifacts are loaded on first use with ``joblib.load(..., mmap_mode='r')`` so
+the numpy arrays inside them (TF-IDF ``idf_``, coefficients, tree arrays) are
+memory-mapped from the page cache instead of copied onto each worker's heap.
+All gunicorn workers mapping the same file share those pages; loading them
+before the fork (``MODEL_PRELOAD=1`` with ``gunicorn --preload``) additionally
+shares the unpickled Python objects copy-on-write.
+
+A new version is deployed by writing it next to the old one and renaming it
+into place (see :func:`publish_artifact`). Each worker notices the changed
+file on its next lookup and swaps the new model in atomically: requests that
+already hold the old :class:`LoadedModel` finish with it, later requests get
+the new one. Never overwrite a mapped artifact in place.
+"""
+
+import itertools
+import os
+import pickle
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+# Artifact file names as saved by the notebooks in module/.
+DEFAULT_ARTIFACTS = {
+    "nb": "model_pipeline.pkl",
+    "lr": "model_pipeline_lr.pkl",
+    "svm": "model_pipeline_svm.pkl",
+    "xgb": "model_pipeline_xgb.pkl",
+    "lstm": "lstm_model.h5",
+}
+
+
+_memory_versions = itertools.count(1)
+
+
+class ModelNotFoundError(KeyError):
+    """Raised when asking for a model name that was never registered."""
+
+
+class ModelUnavailableError(LookupError):
+    """Raised when a registered model's artifact is missing on disk."""
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    name: str
+    model: Any
+    version: str
+    path: Optional[str] = None
+    loaded_at: float = field(default_factory=time.time)
+
+
+def artifact_version(path):
+    """Identify an artifact version by file size and modification time.
+
+    The value is the same in every worker that sees the same file, so it can
+    be used to key shared caches.
+    """
+    st = os.stat(path)
+    return f"{st.st_mtime_ns:x}-{st.st_size:x}"
+
+
+def load_joblib(path, mmap_mode="r"):
+    import joblib
+    return joblib.load(path, mmap_mode=mmap_mode)
+
+
+class KerasTextModel:
+    """Adapt the saved LSTM + tokenizer to the ``predict_proba(texts)`` interface."""
+
+    classes_ = [0, 1]
+
+    def __init__(self, model, tokenizer, max_len=200):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.max_len = max_len
+
+    def predict_proba(self, texts):
+        import numpy as np
+        from tensorflow.keras.preprocessing.sequence import pad_sequences
+
+        sequences = self.tokenizer.texts_to_sequences(list(texts))
+        padded = pad_sequences(sequences, maxlen=self.max_len, padding="post")
+        p = np.asarray(self.model.predict(padded, verbose=0)).reshape(-1)
+        return np.column_stack([1.0 - p, p])
+
+    def predict(self, texts):
+        return self.predict_proba(texts).argmax(axis=1)
+
+
+def load_keras(path, mmap_mode=None):
+    """Load ``lstm_model.h5`` together with the ``tokenizer.pkl`` saved beside it."""
+    from tensorflow.keras.models import load_model
+
+    tokenizer_path = os.path.join(os.path.dirname(path), "tokenizer.pkl")
+    with open(tokenizer_path, "rb") as f:
+        tokenizer = pickle.load(f)
+    return KerasTextModel(load_model(path), tokenizer)
+
+
+def load_compact(path, mmap_mode="r"):
+    from quickfactchecker.compact import load_compact
+    return load_compact(path, mmap_mode=mmap_mode)
+
+
+def default_loader(path):
+    if path.endswith((".h5", ".keras")):
+        return load_keras
+    return load_compact if path.endswith(".compact") else load_joblib
+
+
+def compact_artifacts(model_dir, artifacts=None):
+    """``artifacts`` with each pickle replaced by its ``.compact`` export where one exists in ``model_dir``.
+
+    Compact exports (``scripts/export_compact.py``) load without importing
+    scikit-learn; see :mod:`quickfactchecker.compact`.
+    """
+    resolved = {}
+    for name, filename in (DEFAULT_ARTIFACTS if artifacts is None else artifacts).items():
+        compact = os.path.splitext(filename)[0] + ".compact"
+        resolved[name] = compact if os.path.exists(os.path.join(model_dir, compact)) else filename
+    return resolved
+
+
+def publish_artifact(model, path, compress=0):
+    """Atomically write ``model`` to ``path`` so running workers pick it up.
+
+    The model is dumped uncompressed (memory-mappable) to a temporary file in
+    the same directory and then renamed over ``path``. Workers that still map
+    the previous file keep reading the old inode until they swap.
+    """
+    import joblib
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        joblib.dump(model, tmp_path, compress=compress)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return artifact_version(path)
+
+
+class ModelRegistry:
+    """Name -> model mapping with lazy loading and atomic hot swap.
+
+    ``check_interval`` is how often (in seconds) :meth:`get` re-stats an
+    artifact to look for a new version; ``0`` checks on every call and
+    ``None`` disables automatic reloads. ``on_load(name, seconds)`` is called
+    after every artifact load, e.g. to record load times.
+    """
+
+    def __init__(self, model_dir="model", artifacts=None, mmap_mode="r", check_interval=2.0, on_load=None):
+        self.model_dir = model_dir
+        self.mmap_mode = mmap_mode
+        self.check_interval = check_interval
+        self.on_load = on_load
+        self._specs = {}
+        self._loaded = {}
+        self._checked_at = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        for name, filename in (DEFAULT_ARTIFACTS if artifacts is None else artifacts).items():
+            self.register(name, filename)
+
+    def register(self, name, path, loader: Optional[Callable] = None):
+        """Register ``name`` for the artifact at ``path`` (relative to ``model_dir``).
+
+        ``loader(path, mmap_mode=...)`` defaults to joblib, to the Keras
+        loader for ``.h5``/``.keras`` files, or to the NumPy-only scorer for
+        ``.compact`` files.
+        """
+        if not os.path.isabs(path):
+            path = os.path.join(self.model_dir, path)
+        with self._lock:
+            self._specs[name] = (path, loader or default_loader(path))
+            self._locks.setdefault(name, threading.Lock())
+
+    def names(self):
+        return list(self._specs)
+
+    def __contains__(self, name):
+        return name in self._specs
+
+    def path(self, name):
+        if name not in self._specs:
+            raise ModelNotFoundError(name)
+        return self._specs[name][0]
+
+    def is_available(self, name):
+        """True if ``name`` is loaded or its artifact exists on disk."""
+        path = self.path(name)
+        return name in self._loaded or (path is not None and os.path.exists(path))
+
+    def loaded(self):
+        """Snapshot of the currently loaded models."""
+        return dict(self._loaded)
+
+    def get(self, name):
+        """Return the current :class:`LoadedModel` for ``name``, loading it if needed."""
+        path = self.path(name)
+        current = self._loaded.get(name)
+        if current is not None and not self._is_stale(name, current):
+            return current
+        with self._locks[name]:
+            current = self._loaded.get(name)
+            if current is not None and not self._is_stale(name, current, force=True):
+                return current
+            if path is None or not os.path.exists(path):
+                if current is not None:
+                    # keep serving the last good version if the file vanished
+                    return current
+                raise ModelUnavailableError(f"Model artifact for '{name}' not found at {path}")
+            return self._load(name, path)
+
+    def _is_stale(self, name, current, force=False):
+        if current.path is None or self.check_interval is None:
+            return False
+        now = time.monotonic()
+        if not force and now - self._checked_at.get(name, 0.0) < self.check_interval:
+            return False
+        self._checked_at[name] = now
+        try:
+            return artifact_version(current.path) != current.version
+        except OSError:
+            return False
+
+    def _load(self, name, path):
+        loader = self._specs[name][1]
+        version = artifact_version(path)
+        start = time.perf_counter()
+        model = loader(path, mmap_mode=self.mmap_mode)
+        if self.on_load is not None:
+            self.on_load(name, time.perf_counter() - start)
+        loaded = LoadedModel(name=name, model=model, version=version, path=path)
+        self._loaded[name] = loaded
+        self._checked_at[name] = time.monotonic()
+        return loaded
+
+    def swap(self, name, model=None, path=None, version=None):
+        """Replace ``name`` with a new model object or artifact path.
+
+        The replacement is fully loaded before it becomes visible, so
+        concurrent :meth:`get` calls see either the old or the new model.
+        """
+        if (model is None) == (path is None):
+            raise ValueError("Pass exactly one of 'model' or 'path'")
+        if path is not None:
+            self.register(name, path)
+            with self._locks[name]:
+                return self._load(name, self._specs[name][0])
+        with self._lock:
+            self._locks.setdefault(name, threading.Lock())
+            self._specs.setdefault(name, (None, None))
+        loaded = LoadedModel(name=name, model=model, version=version or f"mem-{next(_memory_versions)}")
+        with self._locks[name]:
+            self._loaded[name] = loaded
+        return loaded
+
+    def unload(self, name):
+        self._loaded.pop(name, None)
+
+    def preload(self, names=None):
+        """Load every available model now, e.g. in the gunicorn master before forking."""
+        loaded = {}
+        for name in names or self.names():
+            try:
+                loaded[name] = self.get(name)
+            except ModelUnavailableError:
+                continue
+        return loaded
@@ -0,0 +1,247 @@
+"""Structured model results shared by the training scripts and the dashboard.
+
+Results live in one JSON file, grouped by experiment (a dataset and set of
+models evaluated together)::
+
+    {"experiments": {"model_comparison": {"dataset": "...", "updated_at": "...",
+                                          "models": {"SVM": {"accuracy": 0.99, ...}}}}}
+
+Writers merge into a model's entry, so a run only replaces the columns it
+measured. The inference benchmark writes its latency figures to an
+experiment of its own, which readers can merge into another experiment's
+rows (see :meth:`ResultsStore.snapshot`). Readers go
+through :class:`ResultsStore`, which parses the file once per modification
+and keeps the serialized payload and its ETag ready to serve.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from datetime import datetime, timezone
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_PATH = os.path.join(REPO_ROOT, "results", "results.json")
+DEFAULT_EXPERIMENT = "model_comparison"
+# latency/throughput rows from scripts/benchmark_inference.py, kept apart from the quality results
+BENCHMARK_EXPERIMENT = "inference_benchmark"
+
+# registry names used by the server and benchmarks -> names in the results
+MODEL_DISPLAY_NAMES = {
+    "nb": "Naive Bayes",
+    "lr": "Logistic Regression",
+    "svm": "SVM",
+    "xgb": "XGBoost",
+    "lstm": "LSTM",
+}
+
+# column headers used in the markdown/CSV results -> result keys
+COLUMN_KEYS = {
+    "model": "model",
+    "accuracy": "accuracy",
+    "precision": "precision",
+    "recall": "recall",
+    "f1": "f1",
+    "f1-score": "f1",
+    "f1 score": "f1",
+    "predict time (s)": "predict_time_s",
+    "ms/sample": "ms_per_sample",
+}
+
+
+def column_key(header):
+    header = header.strip().lower()
+    return COLUMN_KEYS.get(header, re.sub(r"[^a-z0-9]+", "_", header).strip("_"))
+
+
+def normalize_row(row):
+    """Map a results row with display headers (``"F1"``, ``"ms/sample"``) to result keys."""
+    normalized = {}
+    for header, value in row.items():
+        key = column_key(header)
+        if key != "model" and value is not None:
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                continue
+        normalized[key] = value
+    return normalized
+
+
+def parse_markdown_table(text):
+    """Rows of the first markdown table in ``text``, keyed by its header.
+
+    Lines before a header row that has a ``Model`` column are ignored, as are
+    separator rows and rows with a non-numeric metric.
+    """
+    rows, keys = [], None
+    for line in text.splitlines():
+        if "|" not in line:
+            continue
+        cells = [c.strip() for c in line.strip().strip("|").split("|")]
+        if keys is None:
+            if any(c.lower() == "model" for c in cells):
+                keys = [column_key(c) for c in cells]
+            continue
+        if all(set(c) <= set("-: ") for c in cells):
+            continue
+        if len(cells) != len(keys):
+            continue
+        row = dict(zip(keys, cells))
+        try:
+            rows.append(dict({k: float(v) for k, v in row.items() if k != "model" and v}, model=row["model"]))
+        except (KeyError, ValueError):
+            continue
+    return rows
+
+
+def load_results(path=RESULTS_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"experiments": {}}
+
+
+def update_experiment(experiment, rows, path=RESULTS_PATH, dataset=None):
+    """Merge ``rows`` (dicts with a model name) into ``experiment`` and rewrite the file atomically."""
+    path = os.fspath(path)
+    results = load_results(path)
+    entry = results.setdefault("experiments", {}).setdefault(experiment, {"models": {}})
+    for row in rows:
+        row = normalize_row(row)
+        entry["models"].setdefault(row.pop("model"), {}).update(row)
+    if dataset is not None:
+        entry["dataset"] = dataset
+    entry["updated_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return path
+
+
+def benchmark_rows(report):
+    """Latency/throughput columns from a :mod:`quickfactchecker.benchmark` report."""
+    rows = []
+    for name, result in report.get("models", {}).items():
+        if "error" in result:
+            continue
+        row = {"model": MODEL_DISPLAY_NAMES.get(name, name)}
+        latency = result.get("latency")
+        if latency:
+            row.update(p50_ms=latency["p50_ms"], p95_ms=latency["p95_ms"], p99_ms=latency["p99_ms"])
+        throughput = result.get("throughput")
+        if throughput:
+            batch_size, best = max(throughput.items(), key=lambda item: item[1]["items_per_s"])
+            row.update(throughput_per_s=best["items_per_s"], throughput_batch_size=int(batch_size))
+        cold_start = result.get("cold_start")
+        if cold_start:
+            row.update(cold_start_s=cold_start["process_wall_s"], peak_rss_mb=cold_start["peak_rss_mb"])
+        if "http" in result:
+            row["http_p50_ms"] = result["http"]["p50_ms"]
+        compact = result.get("compact")
+        if compact:
+            row["compact_p50_ms"] = compact["latency"]["p50_ms"]
+            if "cold_start" in compact:
+                row.update(compact_cold_start_s=compact["cold_start"]["process_wall_s"],
+                           compact_peak_rss_mb=compact["cold_start"]["peak_rss_mb"])
+        rows.append(row)
+    return rows
+
+
+class Snapshot:
+    """A parsed results file ready to serve: JSON body, ETag and modification time."""
+
+    __slots__ = ("rows", "body", "etag", "last_modified")
+
+    def __init__(self, rows, mtime):
+        self.rows = rows
+        self.body = json.dumps(rows, separators=(",", ":")).encode("utf-8")
+        self.etag = hashlib.blake2b(self.body, digest_size=16).hexdigest()
+        self.last_modified = datetime.fromtimestamp(int(mtime), tz=timezone.utc)
+
+
+class ResultsStore:
+    """Memoized reader for the dashboard.
+
+    ``snapshot(experiment)`` holds the experiment's models as a list of dicts
+    (``{"model": ..., "accuracy": ..., "p50_ms": ...}``), already serialized.
+    The file is only re-read when its mtime or size changes. When the JSON file is missing,
+    the first existing markdown table in ``fallback_paths`` is served as the
+    default experiment.
+    """
+
+    def __init__(self, path=RESULTS_PATH, fallback_paths=()):
+        self.path = path
+        self.fallback_paths = tuple(fallback_paths)
+        self._lock = threading.Lock()
+        self._signature = None
+        self._results = None
+        self._snapshots = {}
+
+    def _source(self):
+        for path in (self.path,) + self.fallback_paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            return path, (path, st.st_mtime_ns, st.st_size)
+        return None, None
+
+    def _read(self, path):
+        with open(path, encoding="utf-8") as f:
+            if path == self.path:
+                return json.load(f)
+            models = {row.pop("model"): row for row in parse_markdown_table(f.read())}
+            return {"experiments": {DEFAULT_EXPERIMENT: {"models": models}}}
+
+    def snapshot(self, experiment=DEFAULT_EXPERIMENT, merge=()):
+        """The current :class:`Snapshot` of ``experiment``, or None if there is none.
+
+        Columns from the experiments in ``merge`` (e.g. :data:`BENCHMARK_EXPERIMENT`)
+        are added to the rows of the models ``experiment`` has, without
+        overriding its own columns.
+        """
+        path, signature = self._source()
+        if path is None:
+            return None
+        with self._lock:
+            if signature != self._signature:
+                self._results = self._read(path)
+                self._signature = signature
+                self._snapshots = {}
+            key = (experiment, tuple(merge))
+            if key not in self._snapshots:
+                experiments = self._results.get("experiments", {})
+                entry = experiments.get(experiment)
+                if entry is None:
+                    return None
+                rows = []
+                for name, metrics in entry.get("models", {}).items():
+                    row = dict(model=name, **metrics)
+                    for other in merge:
+                        for column, value in experiments.get(other, {}).get("models", {}).get(name, {}).items():
+                            row.setdefault(column, value)
+                    rows.append(row)
+                self._snapshots[key] = Snapshot(rows, signature[1] / 1e9)
+            return self._snapshots[key]
+
+    def experiments(self):
+        path, _ = self._source()
+        if path is None:
+            return []
+        self.snapshot()
+        with self._lock:
+            return sorted(self._results.get("experiments", {}))
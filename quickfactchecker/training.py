@@ -0,0 +1,163 @@
+"""Parallel training harness with an on-disk feature-matrix cache.
+
+Vectorized train/test matrices are stored as sparse ``.npz`` files under a
+key derived from the dataset's content hash and the vectorizer and split
+parameters, so re-running a comparison on unchanged data skips
+featurization. Models are fitted in a process pool; each worker loads the
+cached matrices itself instead of receiving them pickled, and results are
+handed back as soon as each model finishes.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import scipy.sparse as sp
+import sklearn
+from sklearn.metrics import accuracy_score, confusion_matrix, f1_score, precision_score, recall_score
+
+FEATURE_CACHE_DIR = os.path.join(".cache", "features")
+
+
+def feature_key(dataset_hash, vectorizer, split_params, extra=None):
+    """Content address for a featurized split.
+
+    Covers the dataset bytes, the vectorizer class and parameters, the split
+    parameters and the scikit-learn version (which can change tokenization).
+    """
+    payload = {
+        "dataset": dataset_hash,
+        "vectorizer": type(vectorizer).__name__,
+        "params": {k: repr(v) for k, v in sorted(vectorizer.get_params().items())},
+        "split": split_params,
+        "sklearn": sklearn.__version__,
+        "extra": extra,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+
+
+def _label_array(labels):
+    # object arrays would need pickle to load; string labels are stored as unicode
+    labels = np.asarray(labels)
+    return labels.astype(str) if labels.dtype == object else labels
+
+
+class FeatureCache:
+    """Directory of featurized splits, one sub-directory per key."""
+
+    FILES = ("X_train.npz", "X_test.npz", "y_train.npy", "y_test.npy")
+
+    def __init__(self, cache_dir=FEATURE_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def __contains__(self, key):
+        entry = self.entry_dir(key)
+        return all(os.path.exists(os.path.join(entry, name)) for name in self.FILES)
+
+    def store(self, key, X_train, X_test, y_train, y_test):
+        """Write a split atomically: readers never see a half-written entry."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=self.cache_dir, prefix=f".{key}-")
+        try:
+            sp.save_npz(os.path.join(tmp, "X_train.npz"), sp.csr_matrix(X_train))
+            sp.save_npz(os.path.join(tmp, "X_test.npz"), sp.csr_matrix(X_test))
+            np.save(os.path.join(tmp, "y_train.npy"), _label_array(y_train))
+            np.save(os.path.join(tmp, "y_test.npy"), _label_array(y_test))
+            os.replace(tmp, self.entry_dir(key))
+        except OSError:
+            # another process stored the same key first
+            shutil.rmtree(tmp, ignore_errors=True)
+            if key not in self:
+                raise
+        return self.entry_dir(key)
+
+
+def load_split(entry_dir):
+    return (
+        sp.load_npz(os.path.join(entry_dir, "X_train.npz")),
+        sp.load_npz(os.path.join(entry_dir, "X_test.npz")),
+        np.load(os.path.join(entry_dir, "y_train.npy")),
+        np.load(os.path.join(entry_dir, "y_test.npy")),
+    )
+
+
+def featurize(cache, key, load_data, vectorizer, split):
+    """Return the cache entry for ``key``, building it on a miss.
+
+    ``load_data()`` returns ``(texts, labels)`` and ``split(X, y)`` returns
+    ``(X_train, X_test, y_train, y_test)``; neither is called on a hit.
+    Returns ``(entry_dir, hit)``.
+    """
+    if key in cache:
+        return cache.entry_dir(key), True
+    texts, labels = load_data()
+    X = vectorizer.fit_transform(texts)
+    return cache.store(key, *split(X, np.asarray(labels))), False
+
+
+def fit_and_score(name, model, entry_dir):
+    """Worker: fit ``model`` on a cached split and score it on the test part."""
+    X_train, X_test, y_train, y_test = load_split(entry_dir)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    y_pred = model.predict(X_test)
+    predict_time = time.perf_counter() - start
+
+    return {
+        "name": name,
+        "accuracy": accuracy_score(y_test, y_pred),
+        "precision": precision_score(y_test, y_pred, average="macro", zero_division=0),
+        "recall": recall_score(y_test, y_pred, average="macro", zero_division=0),
+        "f1": f1_score(y_test, y_pred, average="macro", zero_division=0),
+        "confusion": confusion_matrix(y_test, y_pred),
+        "fit_time_s": fit_time,
+        "predict_time_s": predict_time,
+        "ms_per_sample": 1000.0 * predict_time / max(len(y_test), 1),
+    }
+
+
+def train_models(models, entry_dir, max_workers=None, on_result=None):
+    """Fit ``models`` (name -> unfitted estimator) concurrently on a cached split.
+
+    ``on_result(result)`` is called in the parent process as each model
+    finishes, so plots and result files can be written immediately. A model
+    that fails yields ``{"name": ..., "error": ...}`` instead of metrics.
+    Returns the results in completion order.
+    """
+    max_workers = max_workers or min(len(models), os.cpu_count() or 1)
+    results = []
+
+    def finish(result):
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+
+    if max_workers <= 1:
+        for name, model in models.items():
+            try:
+                result = fit_and_score(name, model, entry_dir)
+            except Exception as e:
+                result = {"name": name, "error": f"{type(e).__name__}: {e}"}
+            finish(result)
+        return results
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(fit_and_score, name, model, entry_dir): name for name, model in models.items()}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"name": futures[future], "error": f"{type(e).__name__}: {e}"}
+            finish(result)
+    return results
@@ -0,0 +1,98 @@
+"""Benchmark the serving models offline on LIAR's test split.
+
+    python scripts/benchmark_inference.py                  # every artifact found in model/
+    python scripts/benchmark_inference.py --models nb svm --iterations 200
+
+Writes cold start, latency percentiles, batch throughput, peak RSS and
+end-to-end /predict latency to results/benchmark.json, and merges the
+latency/throughput columns into results/results.json for the dashboard.
+Models with a .compact export (scripts/export_compact.py) are measured in
+both formats.
+"""
+
+import argparse
+import os
+import sys
+
+# make the repository root importable when run as `python scripts/benchmark_inference.py`
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from quickfactchecker.benchmark import (BENCHMARK_RESULTS_PATH, DEFAULT_BATCH_SIZES, LIAR_TEST_PATH,
+                                        load_statements, run_benchmarks, write_report)
+from quickfactchecker.memory import peak_rss_mb
+from quickfactchecker.registry import ModelRegistry
+from quickfactchecker.results_store import BENCHMARK_EXPERIMENT, benchmark_rows, update_experiment
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Measure inference latency, throughput and memory per model.")
+    parser.add_argument("--model-dir", default="model")
+    parser.add_argument("--models", nargs="+", default=None,
+                        help="model names (default: every registered model whose artifact exists)")
+    parser.add_argument("--data", default=LIAR_TEST_PATH, help="LIAR-format TSV providing the statements")
+    parser.add_argument("--limit", type=int, default=None, help="use only the first N statements")
+    parser.add_argument("--iterations", type=int, default=500, help="single-item calls per latency measurement")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=list(DEFAULT_BATCH_SIZES))
+    parser.add_argument("--min-seconds", type=float, default=1.0, help="minimum run time per batch size")
+    parser.add_argument("--no-http", action="store_true", help="skip the Flask /predict measurement")
+    parser.add_argument("--no-cold-start", action="store_true", help="skip the fresh-process load measurement")
+    parser.add_argument("--no-compact", action="store_true",
+                        help="skip the .compact exports written by scripts/export_compact.py")
+    parser.add_argument("--output", default=BENCHMARK_RESULTS_PATH)
+    parser.add_argument("--experiment", default=BENCHMARK_EXPERIMENT,
+                        help="experiment in results/results.json that receives the latency columns")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    registry = ModelRegistry(args.model_dir)
+    names = args.models or [name for name in registry.names() if registry.is_available(name)]
+    if not names:
+        print(f"🛑 No model artifacts found in {args.model_dir}")
+        sys.exit(1)
+    try:
+        texts = load_statements(args.data, limit=args.limit)
+    except FileNotFoundError:
+        print(f"🛑 Dataset not found at: {args.data}")
+        sys.exit(1)
+
+    app_module = None
+    if not args.no_http:
+        import app as app_module
+        app_module.registry = registry
+
+    report = run_benchmarks(
+        registry, names, texts, iterations=args.iterations, batch_sizes=args.batch_sizes,
+        min_seconds=args.min_seconds, app_module=app_module, cold_start=not args.no_cold_start,
+        compact=not args.no_compact,
+    )
+    report["dataset"]["path"] = os.path.relpath(args.data)
+    report["peak_rss_mb"] = peak_rss_mb()
+    print(f"✅ Results saved to {write_report(report, args.output)}")
+    update_experiment(args.experiment, benchmark_rows(report))
+
+    print("\n{:<8} {:>9} {:>9} {:>9} {:>12} {:>10}".format("Model", "p50 ms", "p95 ms", "p99 ms", "items/s@32", "cold s"))
+    for name, result in report["models"].items():
+        if "error" in result:
+            print(f"{name:<8} {result['error']}")
+            continue
+        latency = result["latency"]
+        throughput = result["throughput"].get("32", {}).get("items_per_s", float("nan"))
+        cold = result.get("cold_start", {}).get("process_wall_s", float("nan"))
+        print("{:<8} {:>9.3f} {:>9.3f} {:>9.3f} {:>12.0f} {:>10.2f}".format(
+            name, latency["p50_ms"], latency["p95_ms"], latency["p99_ms"], throughput, cold))
+
+    compact = {name: result["compact"] for name, result in report["models"].items() if "compact" in result}
+    if compact:
+        print("\n{:<8} {:>14} {:>14} {:>14} {:>14}".format("Compact", "cold s", "pickle cold s", "peak RSS MB",
+                                                            "pickle RSS MB"))
+        for name, result in compact.items():
+            cold, pickled = result.get("cold_start", {}), report["models"][name].get("cold_start", {})
+            print("{:<8} {:>14.2f} {:>14.2f} {:>14.1f} {:>14.1f}".format(
+                name, cold.get("process_wall_s", float("nan")), pickled.get("process_wall_s", float("nan")),
+                cold.get("peak_rss_mb", float("nan")), pickled.get("peak_rss_mb", float("nan"))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Build or extend the BM25 evidence index over LIAR statements.
+
+    python scripts/build_evidence_index.py                         # train + valid + test -> model/evidence
+    python scripts/build_evidence_index.py --add new_checks.tsv    # index new fact-checks, no rebuild
+    python scripts/build_evidence_index.py --compact               # fold added fact-checks into the main index
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# make the repository root importable when run as `python scripts/build_evidence_index.py`
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from quickfactchecker.datasets import liar_paths
+from quickfactchecker.evidence import EvidenceIndex, build_index, read_liar
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build the evidence index served by /evidence.")
+    parser.add_argument("--out", default=os.environ.get("EVIDENCE_INDEX_DIR", os.path.join("model", "evidence")))
+    parser.add_argument("--data", nargs="+", default=liar_paths(), help="LIAR-format TSV files to index")
+    parser.add_argument("--add", nargs="+", metavar="TSV",
+                        help="add the statements of these LIAR-format files to an existing index")
+    parser.add_argument("--compact", action="store_true", help="merge added statements into the main index")
+    parser.add_argument("--k1", type=float, default=1.2)
+    parser.add_argument("-b", type=float, default=0.75)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    start = time.perf_counter()
+    if args.add or args.compact:
+        try:
+            index = EvidenceIndex(args.out)
+        except FileNotFoundError:
+            print(f"🛑 No evidence index at {args.out}; build it first.")
+            sys.exit(1)
+        if args.add:
+            added = index.add(doc for path in args.add for doc in read_liar(path, split="added"))
+            print(f"✅ Added {added} new statements ({len(index)} indexed)")
+        if args.compact:
+            index = index.compact()
+            print(f"✅ Compacted {len(index)} statements into {args.out}")
+    else:
+        docs = []
+        for path in args.data:
+            try:
+                docs.extend(read_liar(path))
+            except FileNotFoundError:
+                print(f"🛑 Dataset not found at: {path}")
+                sys.exit(1)
+        build_index(docs, args.out, k1=args.k1, b=args.b)
+        print(f"✅ Indexed {len(EvidenceIndex(args.out))} statements into {args.out}")
+    print(f"⏱️ Done in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Calibrate and benchmark the confidence-based model cascade.
+
+    python scripts/cascade.py calibrate --stages svm lr xgb   # thresholds from LIAR valid.tsv -> model/cascade.json
+    python scripts/cascade.py benchmark                       # cascade vs. each model on LIAR test.tsv
+
+LIAR's six ratings are mapped to the served models' binary labels (true,
+mostly-true, half-true -> 1; the rest -> 0). To calibrate on the held-out
+part of the Fake/True news data instead, pass it with --data, --text-col and
+--label-col.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# make the repository root importable when run as `python scripts/cascade.py`
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from quickfactchecker.cascade import (CASCADE_CONFIG, DEFAULT_STAGES, Cascade, calibrate, stage_outputs,
+                                      write_config)
+from quickfactchecker.datasets import LIAR_DIR, load_liar, load_table
+from quickfactchecker.registry import ModelRegistry, ModelUnavailableError
+from quickfactchecker.results_store import MODEL_DISPLAY_NAMES, update_experiment
+
+LIAR_BINARY_LABELS = {"true": 1, "mostly-true": 1, "half-true": 1, "barely-true": 0, "false": 0, "pants-fire": 0}
+BENCHMARK_PATH = os.path.join("results", "cascade_benchmark.json")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Calibrate or benchmark the model cascade.")
+    parser.add_argument("command", choices=["calibrate", "benchmark"])
+    parser.add_argument("--model-dir", default="model")
+    parser.add_argument("--config", default=None, help=f"cascade configuration (default: MODEL_DIR/{CASCADE_CONFIG})")
+    parser.add_argument("--stages", nargs="+", default=list(DEFAULT_STAGES),
+                        help="models to cascade, cheapest first (calibrate only)")
+    parser.add_argument("--data", default=None,
+                        help="validation (calibrate) or test (benchmark) data; default: LIAR valid.tsv / test.tsv")
+    parser.add_argument("--text-col", default=None, help="text column of a CSV --data file")
+    parser.add_argument("--label-col", default=None, help="0/1 label column of a CSV --data file")
+    parser.add_argument("--target-accuracy", type=float, default=None,
+                        help="accuracy each early stage must keep (default: the last model's accuracy)")
+    parser.add_argument("--tolerance", type=float, default=0.0,
+                        help="accuracy the cascade may give up relative to the last model")
+    parser.add_argument("--output", default=BENCHMARK_PATH, help="benchmark results (benchmark only)")
+    return parser.parse_args()
+
+
+def load_split(args, split):
+    """Preprocessed texts and 0/1 labels, from the dataset cache."""
+    path = args.data or os.path.join(LIAR_DIR, f"{split}.tsv")
+    if args.text_col:
+        df = load_table(path, args.text_col).to_pandas(["clean_text", args.label_col]).dropna()
+        return df["clean_text"].tolist(), df[args.label_col].astype(int).to_numpy()
+    liar = load_liar(path, columns=["label", "statement", "clean_text"])
+    keep = [i for i, (label, statement) in enumerate(zip(liar.column("label"), liar.column("statement")))
+            if label in LIAR_BINARY_LABELS and statement.strip()]
+    texts, labels = liar.column("clean_text"), liar.column("label")
+    return [texts[i] for i in keep], np.array([LIAR_BINARY_LABELS[labels[i]] for i in keep])
+
+
+def run_calibrate(args, registry, config_path):
+    texts, labels = load_split(args, "valid")
+    outputs = {}
+    for name in args.stages:
+        print(f"⏱️ Scoring validation split with {name}...")
+        outputs[name] = stage_outputs(registry.get(name).model, texts)
+    cascade, report = calibrate(args.stages, outputs, labels,
+                                target_accuracy=args.target_accuracy, tolerance=args.tolerance)
+    report["data"] = args.data or os.path.join(LIAR_DIR, "valid.tsv")
+    write_config(cascade, config_path, validation=report)
+    print(f"✅ Cascade saved to {config_path}")
+    for stage in cascade.stages:
+        print(f"   {stage.model:<6} threshold {stage.threshold if stage.threshold is not None else '-'}")
+    if report["dropped_stages"]:
+        print(f"ℹ️ Dropped (never confident enough): {', '.join(report['dropped_stages'])}")
+    return report
+
+
+def run_benchmark(args, registry, config_path, batch_size=512):
+    cascade = Cascade.load(config_path)
+    texts, labels = load_split(args, "test")
+    report = {"data": args.data or os.path.join(LIAR_DIR, "test.tsv"), "rows": len(texts),
+              "config": cascade.to_config(), "models": {}}
+
+    for name in dict.fromkeys(cascade.models + args.stages):
+        if not registry.is_available(name):
+            continue
+        out = stage_outputs(registry.get(name).model, texts, batch_size)
+        report["models"][name] = {"accuracy": float(np.mean(out["labels"] == labels)),
+                                  "ms_per_sample": out["ms_per_sample"]}
+
+    predictions = []
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        predictions.extend(cascade.predict(lambda name: registry.get(name).model, texts[i:i + batch_size]))
+    elapsed = time.perf_counter() - start
+    stages = [p["stage"] for p in predictions]
+    report["models"]["cascade"] = {
+        "accuracy": float(np.mean(np.array([p["prediction"] for p in predictions]) == labels)),
+        "ms_per_sample": 1000.0 * elapsed / max(len(texts), 1),
+        "decided_by": {name: stages.count(name) / len(stages) for name in cascade.models},
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+    update_experiment("cascade", [
+        {"model": "Cascade" if name == "cascade" else MODEL_DISPLAY_NAMES.get(name, name),
+         "accuracy": result["accuracy"], "ms_per_sample": result["ms_per_sample"]}
+        for name, result in report["models"].items()
+    ], dataset=report["data"])
+
+    print(f"\n{'Model':<10} {'Accuracy':>9} {'ms/sample':>10}")
+    for name, result in report["models"].items():
+        print(f"{name:<10} {result['accuracy']:>9.4f} {result['ms_per_sample']:>10.4f}")
+    shares = ", ".join(f"{name} {share:.0%}" for name, share in report["models"]["cascade"]["decided_by"].items())
+    print(f"\nDecided by: {shares}")
+    print(f"✅ Results saved to {args.output}")
+    return report
+
+
+def main():
+    args = parse_args()
+    if bool(args.text_col) != bool(args.label_col):
+        print("🛑 --text-col and --label-col go together")
+        sys.exit(1)
+    registry = ModelRegistry(args.model_dir)
+    config_path = args.config or os.path.join(args.model_dir, CASCADE_CONFIG)
+    try:
+        if args.command == "calibrate":
+            run_calibrate(args, registry, config_path)
+        else:
+            run_benchmark(args, registry, config_path)
+    except FileNotFoundError as e:
+        print(f"🛑 File not found: {e.filename}")
+        sys.exit(1)
+    except ModelUnavailableError as e:
+        print(f"🛑 {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Export the linear model pipelines to the compact NumPy-only format.
+
+    python scripts/export_compact.py                    # nb, lr, svm in model/ -> model/*.compact
+    python scripts/export_compact.py --models lr --prune 1e-3
+
+Each export is checked against its pickle on LIAR's test statements; an
+export whose predictions differ is reported (pruned exports may differ
+slightly, see quickfactchecker/compact.py). Serve the exports with
+MODEL_COMPACT=1.
+"""
+
+import argparse
+import os
+import sys
+
+# make the repository root importable when run as `python scripts/export_compact.py`
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from quickfactchecker.benchmark import LIAR_TEST_PATH, load_statements
+from quickfactchecker.compact import compact_path, compare_predictions, export_pipeline, load_compact
+from quickfactchecker.preprocessing import preprocess_batch
+from quickfactchecker.registry import ModelRegistry, ModelUnavailableError
+
+LINEAR_MODELS = ["nb", "lr", "svm"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Write .compact exports of the linear model pipelines.")
+    parser.add_argument("--model-dir", default="model")
+    parser.add_argument("--models", nargs="+", default=LINEAR_MODELS)
+    parser.add_argument("--prune", type=float, default=None,
+                        help="drop n-grams whose weights are within this fraction of the largest weight of zero")
+    parser.add_argument("--data", default=LIAR_TEST_PATH, help="LIAR-format TSV used to check the exports")
+    parser.add_argument("--limit", type=int, default=None, help="check only the first N statements")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    registry = ModelRegistry(args.model_dir, check_interval=None)
+    try:
+        texts = preprocess_batch(load_statements(args.data, limit=args.limit))
+    except FileNotFoundError:
+        print(f"⚠️ Dataset not found at {args.data}; exports are not checked")
+        texts = None
+
+    failed = False
+    for name in args.models:
+        try:
+            loaded = registry.get(name)
+        except ModelUnavailableError as e:
+            print(f"⚠️ {name}: {e}")
+            continue
+        path = compact_path(loaded.path)
+        try:
+            summary = export_pipeline(loaded.model, path, prune=args.prune)
+        except ValueError as e:
+            print(f"🛑 {name}: {e}")
+            failed = True
+            continue
+        print(f"✅ {name}: {summary['estimator']}, {summary['kept_features']}/{summary['n_features']} n-grams, "
+              f"{summary['bytes'] / 1e6:.1f} MB ({os.path.getsize(loaded.path) / 1e6:.1f} MB pickled) -> {path}")
+        if texts:
+            check = compare_predictions(loaded.model, load_compact(path), texts)
+            diff = check.get("max_probability_diff", check.get("max_margin_diff"))
+            status = "✅" if check["label_agreement"] == 1.0 else "⚠️"
+            print(f"{status} {name}: {check['label_agreement']:.2%} of {check['rows']} predictions match, "
+                  f"max score difference {diff:.2e}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
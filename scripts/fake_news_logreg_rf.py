@@ -1,133 +1,253 @@
-import pandas as pd
+import argparse
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.model_selection import train_test_split
 from sklearn.naive_bayes import MultinomialNB
 from sklearn.linear_model import LogisticRegression
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import accuracy_score, precision_score, f1_score, confusion_matrix
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+import shutil
 import sys
+import time
 from pathlib import Path
 
+# make the repository root importable when run as `python scripts/fake_news_logreg_rf.py`
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from quickfactchecker.datasets import (FORMAT_VERSION as DATASET_FORMAT, LIAR_COLUMNS, LIAR_READ_CSV_OPTIONS,
+                                       cached_file_sha256, load_liar, load_table)
+from quickfactchecker.memory import peak_rss_mb
+from quickfactchecker.online_training import make_hashing_vectorizer, train_streaming
+from quickfactchecker.results_store import update_experiment
+from quickfactchecker.training import FEATURE_CACHE_DIR, FeatureCache, featurize, feature_key, train_models
+
 # -------------------------
 # Configurable dataset path
 # -------------------------
-DATASET_PATH = Path("QuickFactChecker/dataset/liar/train.tsv")
+DATASET_PATH = Path("module/dataset/liar/train.tsv")
 RESULTS_DIR = Path("results")
-RESULTS_DIR.mkdir(exist_ok=True)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Train & evaluate Naive Bayes, Logistic Regression and Random Forest.")
+    parser.add_argument("--data", type=Path, default=DATASET_PATH,
+                        help="LIAR-format TSV (no header), or any CSV/TSV with --text-col/--label-col")
+    parser.add_argument("--stream", action="store_true",
+                        help="out-of-core mode: read in chunks, hash features and train with partial_fit")
+    parser.add_argument("--chunksize", type=int, default=10000, help="rows per chunk in --stream mode")
+    parser.add_argument("--epochs", type=int, default=1, help="training passes over the file in --stream mode")
+    parser.add_argument("--n-features", type=int, default=2 ** 18, help="hashing vectorizer width in --stream mode")
+    parser.add_argument("--text-col", default="statement",
+                        help="text column; clean_text is the cleaned text stored in the dataset cache")
+    parser.add_argument("--label-col", default="label")
+    parser.add_argument("--sep", default=None, help="field separator (default: tab for .tsv, comma otherwise)")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="models trained in parallel (default: one process per model, up to the CPU count)")
+    parser.add_argument("--cache-dir", default=FEATURE_CACHE_DIR, help="where featurized splits are cached")
+    parser.add_argument("--no-cache", action="store_true", help="rebuild the cached TF-IDF features")
+    parser.add_argument("--header", action="store_true",
+                        help="the file has a header row (default: LIAR's 14 unnamed columns)")
+    parser.add_argument("--experiment", default="liar_baselines",
+                        help="experiment name under which results/results.json stores the scores")
+    return parser.parse_args()
+
+
+def read_csv_options(args):
+    sep = args.sep or ("\t" if args.data.suffix == ".tsv" else ",")
+    options = {"on_bad_lines": "warn"}
+    if not args.header:
+        # the same parsing as load_liar, so both training modes see the same rows
+        options.update(LIAR_READ_CSV_OPTIONS)
+    options["sep"] = sep
+    return options
+
 
 # -------------------------
-# Load and preprocess dataset
+# Load dataset (parsed and cleaned once, then memory-mapped from .cache/datasets)
 # -------------------------
-try:
-    df = pd.read_csv(DATASET_PATH, sep="\t", on_bad_lines="warn")
-except FileNotFoundError:
-    print(f"🛑 Dataset not found at: {DATASET_PATH}")
-    sys.exit(1)
-except Exception as e:
-    print(f"🛑 Error loading dataset: {type(e).__name__}: {e}")
-    sys.exit(1)
-
-# ✅ Validate expected column count
-expected_cols = 14
-if df.shape[1] != expected_cols:
-    print(f"⚠️ Unexpected column count: {df.shape[1]} (expected {expected_cols})")
-    sys.exit(1)
-
-df.columns = [
-    "id", "label", "statement", "subject", "speaker", "job", "state", "party",
-    "barely_true_counts", "false_counts", "half_true_counts", "mostly_true_counts",
-    "pants_on_fire_counts", "context"
-]
-
-X = df["statement"]
-y = df["label"]
-
-# Convert text into TF-IDF features
-vectorizer = TfidfVectorizer(max_features=5000, stop_words="english")
-X_vec = vectorizer.fit_transform(X)
-
-# Split dataset
-X_train, X_test, y_train, y_test = train_test_split(
-    X_vec, y, test_size=0.2, random_state=42
-)
+def load_dataset(args):
+    try:
+        if args.header:
+            dataset = load_table(args.data, args.text_col, sep=args.sep)
+        else:
+            dataset = load_liar(args.data)
+            if not len(dataset):
+                print(f"⚠️ No rows with the {len(LIAR_COLUMNS)} LIAR columns in {args.data}")
+                sys.exit(1)
+        df = dataset.to_pandas([args.text_col, args.label_col])
+    except FileNotFoundError:
+        print(f"🛑 Dataset not found at: {args.data}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"🛑 Error loading dataset: {type(e).__name__}: {e}")
+        sys.exit(1)
+
+    df = df.dropna(subset=[args.text_col, args.label_col])
+    return df[args.text_col].astype(str), df[args.label_col]
+
 
 # -------------------------
 # Helper function for training
 # -------------------------
-def train_and_evaluate(model, name, results):
+def save_confusion_matrix(cm, name):
+    plt.figure(figsize=(6, 4))
+    sns.heatmap(cm, annot=True, fmt='d', cmap='Blues')
+    plt.title(f"{name} Confusion Matrix")
+    plt.savefig(RESULTS_DIR / f"{name.lower().replace(' ', '_')}_confusion.png")
+    plt.close()
+
+
+RESULT_KEYS = ("accuracy", "precision", "recall", "f1", "fit_time_s", "predict_time_s", "ms_per_sample")
+
+
+def baseline_models():
+    return {
+        "Naive Bayes": MultinomialNB(),
+        "Logistic Regression": LogisticRegression(max_iter=1000),
+        "Random Forest": RandomForestClassifier(n_estimators=100, random_state=42),
+    }
+
+
+def run_in_memory(args):
+    # Convert text into TF-IDF features (cached on disk, keyed by dataset hash and parameters)
+    vectorizer = TfidfVectorizer(max_features=5000, stop_words="english")
+    split_params = {"test_size": 0.2, "random_state": 42}
     try:
-        model.fit(X_train, y_train)
-        y_pred = model.predict(X_test)
-        acc = accuracy_score(y_test, y_pred)
-        prec = precision_score(y_test, y_pred, average="macro", zero_division=0)
-        f1 = f1_score(y_test, y_pred, average="macro", zero_division=0)
-        cm = confusion_matrix(y_test, y_pred)
-
-        results[name] = {"accuracy": acc, "precision": prec, "f1": f1}
-
-        # ✅ Save confusion matrix as image
-        plt.figure(figsize=(6, 4))
-        sns.heatmap(cm, annot=True, fmt='d', cmap='Blues')
-        plt.title(f"{name} Confusion Matrix")
-        plt.savefig(RESULTS_DIR / f"{name.lower().replace(' ', '_')}_confusion.png")
-        plt.close()
+        dataset_hash = cached_file_sha256(args.data)
+    except FileNotFoundError:
+        print(f"🛑 Dataset not found at: {args.data}")
+        sys.exit(1)
+    key = feature_key(dataset_hash, vectorizer, split_params,
+                      extra=[args.text_col, args.label_col, args.header, args.sep, f"datasets-v{DATASET_FORMAT}"])
+    cache = FeatureCache(args.cache_dir)
+    if args.no_cache and key in cache:
+        shutil.rmtree(cache.entry_dir(key))
+
+    # Split dataset
+    entry_dir, hit = featurize(
+        cache, key, lambda: load_dataset(args), vectorizer,
+        lambda X, y: train_test_split(X, y, **split_params),
+    )
+    print(f"{'♻️ Reusing cached' if hit else '💾 Cached'} TF-IDF features: {entry_dir}")
+
+    results = {}
+
+    def on_result(result):
+        name = result["name"]
+        if "error" in result:
+            print(f"⚠️ Error training {name}: {result['error']}")
+            results[name] = {"accuracy": 0.0, "precision": 0.0, "f1": 0.0}
+        else:
+            print(f"✅ {name} finished in {result['fit_time_s']:.1f}s")
+            results[name] = {k: result[k] for k in RESULT_KEYS}
+            # ✅ Save confusion matrix as image
+            try:
+                save_confusion_matrix(result["confusion"], name)
+            except Exception as e:
+                print(f"⚠️ Error saving confusion matrix for {name}: {type(e).__name__}: {e}")
+        save_markdown(results)
+
+    start = time.perf_counter()
+    train_models(baseline_models(), entry_dir, max_workers=args.jobs, on_result=on_result)
+    print(f"⏱️ Trained {len(results)} models in {time.perf_counter() - start:.1f}s")
+    # keep the registration order in the final report
+    return {name: results[name] for name in baseline_models() if name in results}
+
+
+def run_streaming(args):
+    try:
+        streamed, _ = train_streaming(
+            args.data, args.text_col, args.label_col, chunksize=args.chunksize,
+            vectorizer=make_hashing_vectorizer(args.n_features),
+            epochs=args.epochs, read_csv_kwargs=read_csv_options(args),
+        )
+    except FileNotFoundError:
+        print(f"🛑 Dataset not found at: {args.data}")
+        sys.exit(1)
+
+    results = {}
+    for name, scores in streamed.items():
+        results[name] = {k: scores[k] for k in ("accuracy", "precision", "recall", "f1")}
+        try:
+            save_confusion_matrix(scores["confusion"], name)
+        except Exception as e:
+            print(f"⚠️ Error saving confusion matrix for {name}: {type(e).__name__}: {e}")
+    any_scores = next(iter(streamed.values()))
+    print(f"\nStreamed {any_scores['train_rows']} training rows and {any_scores['test_rows']} held-out rows "
+          f"in chunks of {args.chunksize}.")
+    print("ℹ️ Random Forest has no partial_fit and is skipped in --stream mode.")
+    return results
 
-    except Exception as e:
-        print(f"⚠️ Error training {name}: {type(e).__name__}: {e}")
-        results[name] = {"accuracy": 0.0, "precision": 0.0, "f1": 0.0}
 
 # -------------------------
-# Train models
+# Save results to markdown
 # -------------------------
-results = {}
+def save_markdown(results):
+    try:
+        with open(RESULTS_DIR / "model_comparison.md", "w") as f:
+            f.write("# Model Comparison Results\n\n")
+            f.write("| Model              | Accuracy | Precision | F1-Score |\n")
+            f.write("|--------------------|----------|-----------|----------|\n")
+            for model, scores in results.items():
+                f.write(f"| {model} | {scores['accuracy']:.4f} | {scores['precision']:.4f} | {scores['f1']:.4f} |\n")
+    except Exception as e:
+        print(f"⚠️ Error saving markdown file: {type(e).__name__}: {e}")
+
+
+def save_results(results, args):
+    try:
+        rows = [dict(scores, model=model) for model, scores in results.items()]
+        update_experiment(args.experiment, rows, dataset=str(args.data))
+    except Exception as e:
+        print(f"⚠️ Error saving results: {type(e).__name__}: {e}")
 
-train_and_evaluate(MultinomialNB(), "Naive Bayes", results)
-train_and_evaluate(LogisticRegression(max_iter=1000), "Logistic Regression", results)
-train_and_evaluate(RandomForestClassifier(n_estimators=100, random_state=42), "Random Forest", results)
 
 # -------------------------
 # Print results in table
 # -------------------------
-print("\nModel Performance Comparison:\n")
-print("{:<20} {:<10} {:<10} {:<10}".format("Model", "Accuracy", "Precision", "F1-Score"))
-for model, scores in results.items():
-    print("{:<20} {:.4f}    {:.4f}    {:.4f}".format(model, scores["accuracy"], scores["precision"], scores["f1"]))
+def report(results):
+    print("\nModel Performance Comparison:\n")
+    print("{:<26} {:<10} {:<10} {:<10}".format("Model", "Accuracy", "Precision", "F1-Score"))
+    for model, scores in results.items():
+        print("{:<26} {:.4f}    {:.4f}    {:.4f}".format(model, scores["accuracy"], scores["precision"], scores["f1"]))
 
-# -------------------------
-# Save results to markdown
-# -------------------------
-try:
-    with open(RESULTS_DIR / "model_comparison.md", "w") as f:
-        f.write("# Model Comparison Results\n\n")
-        f.write("| Model              | Accuracy | Precision | F1-Score |\n")
-        f.write("|--------------------|----------|-----------|----------|\n")
-        for model, scores in results.items():
-            f.write(f"| {model} | {scores['accuracy']:.4f} | {scores['precision']:.4f} | {scores['f1']:.4f} |\n")
-except Exception as e:
-    print(f"⚠️ Error saving markdown file: {type(e).__name__}: {e}")
+    peak = peak_rss_mb()
+    if peak is not None:
+        print(f"\nPeak memory (RSS): {peak:.1f} MB")
 
-# -------------------------
-# Plot comparison
-# -------------------------
-# new changes
-try:
-    models = list(results.keys())
-    accuracies = [results[m]["accuracy"] for m in models]
-
-    plt.figure(figsize=(8, 5))
-    plt.bar(models, accuracies, color=['skyblue', 'lightgreen', 'salmon'])
-    plt.ylim(0, 0.5)
-    plt.xlabel("Models")
-    plt.ylabel("Accuracy")
-    plt.title("Model Accuracy Comparison")
-
-    for i, acc in enumerate(accuracies):
-        plt.text(i, acc + 0.01, f"{acc:.2f}", ha='center', fontsize=12)
-
-    plt.savefig(RESULTS_DIR / "comparison.png")
-    plt.show()
-except Exception as e:
-    print(f"⚠️ Error generating plot: {type(e).__name__}: {e}")
\ No newline at end of file
+    save_markdown(results)
+
+    # -------------------------
+    # Plot comparison
+    # -------------------------
+    try:
+        models = list(results.keys())
+        accuracies = [results[m]["accuracy"] for m in models]
+
+        plt.figure(figsize=(8, 5))
+        plt.bar(models, accuracies, color=['skyblue', 'lightgreen', 'salmon'][:len(models)])
+        plt.ylim(0, 0.5)
+        plt.xlabel("Models")
+        plt.ylabel("Accuracy")
+        plt.title("Model Accuracy Comparison")
+
+        for i, acc in enumerate(accuracies):
+            plt.text(i, acc + 0.01, f"{acc:.2f}", ha='center', fontsize=12)
+
+        plt.savefig(RESULTS_DIR / "comparison.png")
+        plt.show()
+    except Exception as e:
+        print(f"⚠️ Error generating plot: {type(e).__name__}: {e}")
+
+
+def main():
+    args = parse_args()
+    RESULTS_DIR.mkdir(exist_ok=True)
+    results = run_streaming(args) if args.stream else run_in_memory(args)
+    save_results(results, args)
+    report(results)
+
+
+if __name__ == "__main__":
+    main()
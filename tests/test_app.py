@@ -26,3 +26,299 @@ def test_predict_missing_text(client):
     assert response.status_code == 400
     data = response.get_json()
     assert "error" in data
+
+
+class FakeModel:
+    """Minimal stand-in for a fitted pipeline: texts mentioning "fake" are class 0."""
+    classes_ = [0, 1]
+
+    def __init__(self):
+        self.calls = []
+
+    def predict_proba(self, texts):
+        self.calls.append(list(texts))
+        return [[0.9, 0.1] if "fake" in t.lower() else [0.2, 0.8] for t in texts]
+
+
+@pytest.fixture
+def fake_model(monkeypatch, tmp_path):
+    import app as app_module
+    from quickfactchecker.cache import PredictionCache
+    from quickfactchecker.registry import ModelRegistry
+    registry = ModelRegistry(str(tmp_path), artifacts={"svm": "model_pipeline_svm.pkl"})
+    model = FakeModel()
+    registry.swap("nb", model=model)
+    monkeypatch.setattr(app_module, "registry", registry)
+    monkeypatch.setattr(app_module, "DEFAULT_MODEL", "nb")
+    monkeypatch.setattr(app_module, "prediction_cache", PredictionCache())
+    return model
+
+def test_predict_with_model(client, fake_model):
+    response = client.post("/predict", json={"text": "This is fake news"})
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["prediction"] == 0
+    assert data["probability"] == pytest.approx(0.9)
+
+def test_predict_batch_scores_in_one_call(client, fake_model):
+    response = client.post("/predict_batch", json={"texts": ["fake claim", "real claim", "another"]})
+    assert response.status_code == 200
+    predictions = response.get_json()["predictions"]
+    assert [p["prediction"] for p in predictions] == [0, 1, 1]
+    assert len(fake_model.calls) == 1
+
+def test_predict_batch_rejects_invalid_items(client, fake_model):
+    response = client.post("/predict_batch", json={"texts": ["ok", "", 3]})
+    assert response.status_code == 400
+    assert response.get_json()["invalid_indices"] == [1, 2]
+
+def test_predict_batch_enforces_limit(client, fake_model, monkeypatch):
+    import app as app_module
+    monkeypatch.setattr(app_module, "PREDICT_BATCH_MAX_ITEMS", 2)
+    response = client.post("/predict_batch", json={"texts": ["a", "b", "c"]})
+    assert response.status_code == 400
+
+def test_predict_batch_without_model(client):
+    response = client.post("/predict_batch", json={"texts": ["hello"]})
+    assert response.status_code == 503
+
+def test_predict_uses_micro_batcher(client, fake_model, monkeypatch):
+    import app as app_module
+    monkeypatch.setattr(app_module, "MICROBATCH_ENABLED", True)
+    monkeypatch.setattr(app_module, "_batchers", {})
+    response = client.post("/predict", json={"text": "real claim"})
+    assert response.status_code == 200
+    assert response.get_json()["prediction"] == 1
+    assert "nb" in app_module._batchers
+
+def test_predict_selects_model_by_query(client, fake_model):
+    response = client.post("/predict?model=unknown", json={"text": "claim"})
+    assert response.status_code == 400
+    assert "nb" in response.get_json()["available_models"]
+
+    # registered but artifact missing on disk
+    response = client.post("/predict_batch?model=svm", json={"texts": ["claim"]})
+    assert response.status_code == 503
+
+def test_models_endpoint(client, fake_model):
+    response = client.get("/models")
+    assert response.status_code == 200
+    models = {m["name"]: m for m in response.get_json()}
+    assert models["nb"]["available"] and models["nb"]["default"]
+    assert not models["svm"]["available"]
+
+def test_repeated_claims_are_served_from_cache(client, fake_model):
+    client.post("/predict", json={"text": "The moon landing was FAKE!"})
+    response = client.post("/predict", json={"text": "RT @someone: the moon landing was fake https://t.co/x"})
+    assert response.get_json()["prediction"] == 0
+    assert len(fake_model.calls) == 1
+
+    response = client.post("/predict_batch", json={"texts": ["the moon landing was fake", "new claim"]})
+    assert [p["prediction"] for p in response.get_json()["predictions"]] == [0, 1]
+    assert fake_model.calls[-1] == ["new claim"]
+
+    stats = client.get("/cache_stats").get_json()
+    assert stats["enabled"] and stats["hits"] == 2 and stats["misses"] == 2
+
+def test_dashboard_data_revalidates_with_etag(client, monkeypatch, tmp_path):
+    import app as app_module
+    from quickfactchecker.results_store import ResultsStore, update_experiment
+    path = str(tmp_path / "results.json")
+    update_experiment("model_comparison", [{"model": "SVM", "accuracy": 0.99, "p50_ms": 0.4}], path=path)
+    monkeypatch.setattr(app_module, "results_store", ResultsStore(path))
+
+    response = client.get("/dashboard_data")
+    assert response.status_code == 200
+    assert response.get_json() == [{"model": "SVM", "accuracy": 0.99, "p50_ms": 0.4}]
+    assert response.headers["ETag"] and response.headers["Last-Modified"]
+
+    cached = client.get("/dashboard_data", headers={"If-None-Match": response.headers["ETag"]})
+    assert cached.status_code == 304 and cached.data == b""
+    missing = client.get("/dashboard_data?experiment=liar")
+    assert missing.status_code == 404 and missing.get_json()["experiments"] == ["model_comparison"]
+
+
+def test_dashboard_data_includes_benchmark_columns(client, monkeypatch, tmp_path):
+    import app as app_module
+    from quickfactchecker.results_store import BENCHMARK_EXPERIMENT, ResultsStore, update_experiment
+    path = str(tmp_path / "results.json")
+    update_experiment("model_comparison", [{"model": "SVM", "accuracy": 0.99}], path=path)
+    update_experiment(BENCHMARK_EXPERIMENT, [{"model": "SVM", "p50_ms": 0.4}], path=path)
+    monkeypatch.setattr(app_module, "results_store", ResultsStore(path))
+
+    assert client.get("/dashboard_data").get_json() == [{"model": "SVM", "accuracy": 0.99, "p50_ms": 0.4}]
+    assert client.get(f"/dashboard_data?experiment={BENCHMARK_EXPERIMENT}").get_json() == [
+        {"model": "SVM", "p50_ms": 0.4}]
+
+
+@pytest.fixture
+def evidence(monkeypatch, tmp_path):
+    import app as app_module
+    from quickfactchecker.evidence import LazyEvidenceIndex, build_index
+    path = build_index([
+        {"id": "1.json", "label": "false", "statement": "Fake cures for cancer are sold online.", "speaker": "x"},
+        {"id": "2.json", "label": "true", "statement": "The senate passed the budget."},
+    ], str(tmp_path / "evidence"))
+    monkeypatch.setattr(app_module, "evidence_index", LazyEvidenceIndex(path))
+
+
+def test_evidence_endpoint(client, evidence):
+    response = client.get("/evidence?q=cancer cures&k=1")
+    assert response.status_code == 200
+    assert [r["id"] for r in response.get_json()["results"]] == ["1.json"]
+    response = client.post("/evidence", json={"text": "senate budget"})
+    assert response.get_json()["results"][0]["label"] == "true"
+    assert client.get("/evidence").status_code == 400
+    assert client.get("/evidence?q=x&k=0").status_code == 400
+
+
+def test_predict_includes_evidence_on_request(client, fake_model, evidence):
+    data = client.post("/predict", json={"text": "This fake cancer cure", "evidence": 1}).get_json()
+    assert data["prediction"] == 0 and [r["id"] for r in data["evidence"]] == ["1.json"]
+    assert "evidence" not in client.post("/predict", json={"text": "senate budget"}).get_json()
+    assert client.post("/predict", json={"text": "x", "evidence": "many"}).status_code == 400
+
+
+def test_evidence_unavailable(client, monkeypatch, tmp_path):
+    import app as app_module
+    from quickfactchecker.evidence import LazyEvidenceIndex
+    monkeypatch.setattr(app_module, "evidence_index", LazyEvidenceIndex(str(tmp_path / "missing")))
+    assert client.get("/evidence?q=anything").status_code == 503
+    assert client.post("/predict", json={"text": "anything", "evidence": True}).get_json()["evidence"] is None
+
+
+def test_predict_with_cascade_reports_deciding_stage(client, fake_model, monkeypatch, tmp_path):
+    import app as app_module
+    from quickfactchecker.cascade import Cascade, CascadeFile, CascadeStage, write_config
+    strong = FakeModel()
+    app_module.registry.swap("xgb", model=strong)
+    path = write_config(Cascade([CascadeStage("nb", 0.85), CascadeStage("xgb")]), str(tmp_path / "cascade.json"))
+    monkeypatch.setattr(app_module, "cascade_file", CascadeFile(path))
+
+    # FakeModel is 0.9 sure of "fake" texts and 0.8 sure of the rest
+    response = client.post("/predict_batch?model=cascade", json={"texts": ["fake claim", "other claim"]})
+    assert response.status_code == 200
+    predictions = response.get_json()["predictions"]
+    assert [p["stage"] for p in predictions] == ["nb", "xgb"]
+    assert strong.calls == [["claim"]]
+
+    data = client.post("/predict?model=cascade", json={"text": "fake claim"}).get_json()
+    assert data["model"] == "cascade" and data["stage"] == "nb"
+    models = {m["name"]: m for m in client.get("/models").get_json()}
+    assert models["cascade"]["available"] and models["cascade"]["stages"][-1] == {"model": "xgb"}
+
+
+def test_metrics_endpoint_reports_stages(client, fake_model):
+    client.post("/predict", json={"text": "fake claim"})
+    client.post("/predict", json={})
+    response = client.get("/metrics")
+    assert response.status_code == 200 and response.mimetype == "text/plain"
+    body = response.get_data(as_text=True)
+    for stage in ("parse", "cache", "preprocess", "classify"):
+        assert f'qfc_stage_duration_seconds_count{{stage="{stage}",model="nb"}}' in body
+    assert 'qfc_requests_total{endpoint="/predict",model="nb",status="400"}' in body
+    assert 'qfc_request_duration_seconds_bucket{endpoint="/predict",status="200",le="+Inf"}' in body
+
+
+def test_unknown_models_do_not_add_metric_series(client, fake_model):
+    def send_bogus(name):
+        for endpoint in ("/predict", "/predict_batch", "/predict_stream"):
+            assert client.post(f"{endpoint}?model={name}", json={"text": "claim"}).status_code == 400
+
+    def series_count():
+        return sum(1 for line in client.get("/metrics").get_data(as_text=True).splitlines()
+                   if not line.startswith("#"))
+
+    send_bogus("bogus-0")
+    before = series_count()
+    for i in range(1, 6):
+        send_bogus(f"bogus-{i}")
+    assert series_count() == before
+    body = client.get("/metrics").get_data(as_text=True)
+    assert "bogus" not in body
+    assert 'qfc_requests_total{endpoint="/predict",model="unknown",status="400"}' in body
+
+
+def test_profile_requested_with_token(client, fake_model, monkeypatch, tmp_path):
+    import app as app_module
+    monkeypatch.setattr(app_module, "PROFILE_TOKEN", "secret")
+    monkeypatch.setattr(app_module, "PROFILE_DIR", str(tmp_path))
+    assert "X-Profile-File" not in client.post("/predict", json={"text": "claim"}).headers
+    assert "X-Profile-File" not in client.post("/predict", json={"text": "claim"},
+                                               headers={"X-Profile": "wrong"}).headers
+    response = client.post("/predict", json={"text": "claim"}, headers={"X-Profile": "secret"})
+    assert response.status_code == 200
+    assert os.path.exists(response.headers["X-Profile-File"])
+
+
+def read_events(response):
+    import json
+    events = []
+    for block in response.get_data(as_text=True).strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_predict_stream_scores_sentences_then_verdict(client, fake_model, monkeypatch):
+    import app as app_module
+    monkeypatch.setattr(app_module, "STREAM_FIRST_BATCH_SIZE", 1)
+    text = "This claim is fake and made up. The senate passed the budget. Officials confirmed the vote."
+    response = client.post("/predict_stream", json={"text": text})
+    assert response.status_code == 200 and response.mimetype == "text/event-stream"
+    events = read_events(response)
+    assert [e for e, _ in events] == ["chunk"] * 3 + ["verdict"]
+    assert [d["prediction"] for _, d in events[:3]] == [0, 1, 1]
+    assert all(text[d["start"]:d["end"]] == d["text"] for _, d in events[:3])
+    assert [len(batch) for batch in fake_model.calls] == [1, 2]
+    verdict = events[-1][1]
+    assert verdict["prediction"] == 1 and verdict["chunks"] == 3 and not verdict["truncated"]
+
+
+def test_predict_stream_reads_plain_text_body(client, fake_model, monkeypatch):
+    import app as app_module
+    monkeypatch.setattr(app_module, "STREAM_MAX_CHUNKS", 2)
+    body = "The senate passed the budget today. " * 5
+    response = client.post("/predict_stream", data=body.encode(), content_type="text/plain; charset=utf-8")
+    events = read_events(response)
+    assert [e for e, _ in events] == ["chunk", "chunk", "verdict"]
+    assert events[-1][1]["truncated"]
+
+
+def test_predict_stream_rejects_bad_requests(client, fake_model, monkeypatch):
+    import app as app_module
+    assert client.post("/predict_stream", json={}).status_code == 400
+    assert client.post("/predict_stream", data=b"", content_type="text/plain").status_code == 400
+    blank = client.post("/predict_stream", data=b" \n\t  \n", content_type="text/plain")
+    assert blank.status_code == 400
+    assert blank.get_json() == client.post("/predict", json={"text": " \n "}).get_json()
+    assert client.post("/predict_stream?model=unknown", json={"text": "claim"}).status_code == 400
+    assert client.post("/predict_stream?model=svm", json={"text": "claim"}).status_code == 503
+    monkeypatch.setattr(app_module, "STREAM_MAX_CHARACTERS", 10)
+    assert client.post("/predict_stream", json={"text": "a much longer claim"}).status_code == 400
+
+
+def test_stream_latency_and_profile_cover_the_whole_stream(client, fake_model, monkeypatch, tmp_path):
+    import time
+    import app as app_module
+    monkeypatch.setattr(app_module, "PROFILE_TOKEN", "secret")
+    monkeypatch.setattr(app_module, "PROFILE_DIR", str(tmp_path))
+    predict_proba = fake_model.predict_proba
+
+    def slow_predict_proba(texts):
+        time.sleep(0.05)
+        return predict_proba(texts)
+
+    monkeypatch.setattr(fake_model, "predict_proba", slow_predict_proba)
+    histogram = app_module.REQUEST_SECONDS
+    labels = ("/predict_stream", "200")
+    count, total = histogram.count(*labels), histogram._series.get(labels, [None, 0.0])[1]
+
+    response = client.post("/predict_stream", json={"text": "The senate passed the budget today."},
+                           headers={"X-Profile": "secret"})
+    assert histogram.count(*labels) == count  # nothing recorded before the body is sent
+    assert read_events(response)[-1][0] == "verdict"
+    response.close()
+    assert histogram.count(*labels) == count + 1
+    assert histogram._series[labels][1] - total >= 0.05
+    assert os.path.exists(response.headers["X-Profile-File"])
@@ -0,0 +1,52 @@
+import os, sys
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from quickfactchecker.batching import MicroBatcher
+
+
+def test_concurrent_submissions_share_a_batch():
+    batches = []
+
+    def score(texts):
+        batches.append(list(texts))
+        return [t.upper() for t in texts]
+
+    batcher = MicroBatcher(score, max_batch_size=8, max_wait_ms=200)
+    futures = [batcher.submit(t) for t in ["a", "b", "c"]]
+    assert [f.result(timeout=5) for f in futures] == ["A", "B", "C"]
+    assert batches == [["a", "b", "c"]]
+
+
+def test_batches_are_capped_at_max_size():
+    batches = []
+
+    def score(texts):
+        batches.append(len(texts))
+        return texts
+
+    batcher = MicroBatcher(score, max_batch_size=2, max_wait_ms=100)
+    futures = [batcher.submit(str(i)) for i in range(5)]
+    assert [f.result(timeout=5) for f in futures] == ["0", "1", "2", "3", "4"]
+    assert max(batches) <= 2
+    assert sum(batches) == 5
+
+
+def test_errors_propagate_to_every_caller():
+    def score(texts):
+        raise ValueError("boom")
+
+    batcher = MicroBatcher(score, max_wait_ms=50)
+    futures = [batcher.submit("x"), batcher.submit("y")]
+    for f in futures:
+        with pytest.raises(ValueError):
+            f.result(timeout=5)
+    # the worker keeps running after a failed batch
+    batcher.score_fn = lambda texts: texts
+    assert batcher.predict("z", timeout=5) == "z"
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        MicroBatcher(lambda t: t, max_batch_size=0)
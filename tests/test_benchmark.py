@@ -0,0 +1,82 @@
+import json
+import os, sys
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sklearn")
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+import app
+from quickfactchecker.benchmark import latency_summary, load_statements, run_benchmarks, write_report
+from quickfactchecker.registry import ModelRegistry, publish_artifact
+
+ROWS = [
+    ["1.json", "true", "The senate passed the budget bill.", "budget"],
+    ["2.json", "false", "Aliens built the pyramids last year.", "history"],
+    ["3.json", "half-true", "", "empty"],
+    ["4.json", "true", "Taxes rose by two percent.", "taxes"],
+]
+
+
+@pytest.fixture
+def liar_tsv(tmp_path):
+    path = tmp_path / "test.tsv"
+    path.write_text("".join("\t".join(row) + "\n" for row in ROWS), encoding="utf-8")
+    return str(path)
+
+
+def test_load_statements_skips_empty_rows(liar_tsv):
+    assert load_statements(liar_tsv) == [ROWS[0][2], ROWS[1][2], ROWS[3][2]]
+    assert load_statements(liar_tsv, limit=1) == [ROWS[0][2]]
+
+
+def test_latency_summary_percentiles():
+    summary = latency_summary([0.001 * i for i in range(1, 101)])
+    assert summary["n"] == 100
+    assert summary["p50_ms"] == pytest.approx(50.5)
+    assert summary["p99_ms"] == pytest.approx(99.01)
+    assert summary["max_ms"] == pytest.approx(100.0)
+
+
+def test_run_benchmarks_reports_every_measurement(tmp_path, liar_tsv, monkeypatch):
+    texts = load_statements(liar_tsv)
+    pipeline = Pipeline([("tfidf", TfidfVectorizer()), ("clf", LogisticRegression())]).fit(texts, [1, 0, 1])
+    publish_artifact(pipeline, str(tmp_path / "model_pipeline_lr.pkl"))
+    registry = ModelRegistry(str(tmp_path))
+    monkeypatch.setattr(app, "registry", registry)
+
+    report = run_benchmarks(registry, ["lr", "svm"], texts, log=lambda msg: None, iterations=5,
+                            batch_sizes=[1, 2], min_seconds=0.01, app_module=app)
+
+    lr = report["models"]["lr"]
+    assert set(lr) == {"cold_start", "latency", "throughput", "http"}
+    assert lr["cold_start"]["load_s"] >= 0
+    assert lr["latency"]["n"] == 5 and lr["http"]["n"] == 5
+    assert set(lr["throughput"]) == {"1", "2"}
+    assert "error" in report["models"]["svm"]  # no artifact
+
+    path = write_report(report, str(tmp_path / "out" / "benchmark.json"))
+    with open(path) as f:
+        assert json.load(f)["models"]["lr"]["latency"]["p50_ms"] == lr["latency"]["p50_ms"]
+
+
+def test_benchmark_compares_compact_export(tmp_path, liar_tsv):
+    from quickfactchecker.compact import export_pipeline
+    texts = load_statements(liar_tsv)
+    pipeline = Pipeline([("tfidf", TfidfVectorizer()), ("clf", LogisticRegression())]).fit(texts, [1, 0, 1])
+    publish_artifact(pipeline, str(tmp_path / "model_pipeline_lr.pkl"))
+    export_pipeline(pipeline, str(tmp_path / "model_pipeline_lr.compact"))
+
+    report = run_benchmarks(ModelRegistry(str(tmp_path)), ["lr"], texts, log=lambda msg: None, iterations=5,
+                            batch_sizes=[1], min_seconds=0.01)
+    lr = report["models"]["lr"]
+    assert lr["cold_start"]["artifact"] == "model_pipeline_lr.pkl" and lr["cold_start"]["sklearn_imported"]
+    compact = lr["compact"]
+    assert compact["cold_start"]["artifact"] == "model_pipeline_lr.compact"
+    assert not compact["cold_start"]["sklearn_imported"]
+    assert compact["latency"]["n"] == 5 and compact["cold_start"]["peak_rss_mb"] > 0
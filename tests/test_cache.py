@@ -0,0 +1,97 @@
+import os, sys
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+pytest.importorskip("numpy")
+
+from quickfactchecker.cache import (
+    LocalLRUBackend, MinHashIndex, PredictionCache, RedisBackend, normalize_text,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the parts of redis.Redis the backend uses."""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value.encode("utf-8")
+
+    def delete(self, key):
+        self.store.pop(key, None)
+
+
+def test_normalize_text_ignores_cosmetic_differences():
+    variants = [
+        "The Earth is FLAT!!!",
+        "the earth is flat",
+        "RT @flat_earther: The earth is flat https://t.co/abc123",
+        "rt: The   earth, is flat.",
+    ]
+    assert {normalize_text(v) for v in variants} == {"the earth is flat"}
+
+
+def test_lru_eviction_and_ttl():
+    clock = FakeClock()
+    backend = LocalLRUBackend(max_size=2, ttl=10, clock=clock)
+    backend.set("a", 1)
+    backend.set("b", 2)
+    assert backend.get("a") == 1  # "b" is now least recently used
+    backend.set("c", 3)
+    assert backend.get("b") is None
+    assert backend.evictions == 1
+
+    clock.now = 11
+    assert backend.get("a") is None
+    assert backend.expirations == 1
+
+
+def test_cache_is_scoped_by_model_version():
+    cache = PredictionCache(LocalLRUBackend())
+    cache.put("Some claim", "nb@1", {"prediction": 1})
+    assert cache.get("some claim!", "nb@1") == {"prediction": 1}
+    assert cache.get("some claim", "nb@2") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_near_duplicate_hits():
+    cache = PredictionCache(LocalLRUBackend(), near_duplicates=MinHashIndex(threshold=0.7))
+    claim = "the senate passed a new bill to raise the minimum wage for federal workers"
+    cache.put(claim, "v1", {"prediction": 1})
+    reworded = "the senate passed a new bill to raise the minimum wage for all federal workers"
+    assert cache.get(reworded, "v1") == {"prediction": 1}
+    assert cache.get(reworded, "v2") is None
+    assert cache.get("aliens built the pyramids", "v1") is None
+    assert cache.stats()["near_duplicate_hits"] == 1
+
+
+def test_minhash_index_is_bounded():
+    index = MinHashIndex(max_size=2)
+    for i, text in enumerate(["alpha beta gamma", "delta epsilon zeta", "eta theta iota"]):
+        index.add(str(i), text)
+    assert len(index) == 2
+    assert index.query("alpha beta gamma") is None
+    assert index.query("eta theta iota") == "2"
+
+
+def test_shared_backend_round_trip():
+    client = FakeRedis()
+    writer = PredictionCache(RedisBackend(client))
+    reader = PredictionCache(RedisBackend(client))
+    writer.put("Breaking: claim", "lr@1", {"prediction": 0, "probability": 0.75})
+    assert reader.get("breaking claim", "lr@1") == {"prediction": 0, "probability": 0.75}
+    assert all(key.startswith("qfc:pred:") for key in client.store)
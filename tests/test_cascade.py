@@ -0,0 +1,90 @@
+import json
+import os, sys
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+np = pytest.importorskip("numpy")
+
+from quickfactchecker.cascade import (Cascade, CascadeFile, CascadeStage, CascadeUnavailableError, calibrate,
+                                      simulate, write_config)
+from quickfactchecker.registry import ModelUnavailableError
+
+
+class ProbaModel:
+    """Predicts 1 with the probability given per text."""
+    classes_ = np.array([0, 1])
+
+    def __init__(self, p_true):
+        self.p_true = p_true
+        self.calls = []
+
+    def predict_proba(self, texts):
+        self.calls.append(list(texts))
+        p = np.array([self.p_true[t] for t in texts])
+        return np.column_stack([1 - p, p])
+
+
+class MarginModel:
+    """A LinearSVC-like model: decision margins, no probabilities."""
+    classes_ = np.array([0, 1])
+
+    def __init__(self, margins):
+        self.margins = margins
+        self.calls = []
+
+    def decision_function(self, texts):
+        self.calls.append(list(texts))
+        return np.array([self.margins[t] for t in texts])
+
+
+def test_predict_escalates_only_uncertain_texts():
+    cheap = MarginModel({"a": 2.0, "b": -0.1, "c": -3.0})
+    strong = ProbaModel({"b": 0.9})
+    models = {"svm": cheap, "xgb": strong}
+    cascade = Cascade([CascadeStage("svm", 1.0), CascadeStage("xgb")])
+
+    results = cascade.predict(models.__getitem__, ["a", "b", "c"])
+    assert [r["prediction"] for r in results] == [1, 1, 0]
+    assert [r["stage"] for r in results] == ["svm", "xgb", "svm"]
+    assert results[0]["probability"] is None and results[1]["probability"] == pytest.approx(0.9)
+    assert strong.calls == [["b"]]
+
+
+def test_calibrate_keeps_confident_predictions_at_target_accuracy():
+    y = np.array([1, 0, 1, 0, 1, 0])
+    outputs = {
+        # right when confident, wrong on the two least confident texts
+        "svm": {"labels": np.array([1, 0, 1, 0, 0, 1]), "confidence": np.array([3, 2.5, 2, 1.5, 0.2, 0.1]),
+                "ms_per_sample": 0.1},
+        "xgb": {"labels": y.copy(), "confidence": np.ones(6), "ms_per_sample": 1.0},
+    }
+    cascade, report = calibrate(["svm", "xgb"], outputs, y)
+    assert [s.threshold for s in cascade.stages] == [1.5, None]
+    assert report["cascade"]["accuracy"] == 1.0
+    assert report["cascade"]["decided_by"] == {"svm": pytest.approx(4 / 6), "xgb": pytest.approx(2 / 6)}
+    assert report["cascade"]["ms_per_sample"] == pytest.approx(0.1 + 2 / 6)
+    assert report["single_models"]["svm"]["accuracy"] == pytest.approx(4 / 6)
+
+    # a stage that never reaches the target is dropped
+    outputs["svm"]["labels"] = 1 - y
+    cascade, report = calibrate(["svm", "xgb"], outputs, y)
+    assert cascade.models == ["xgb"] and report["dropped_stages"] == ["svm"]
+    assert simulate(cascade.stages, outputs, y)["accuracy"] == 1.0
+
+
+def test_cascade_file_reloads_on_change(tmp_path):
+    path = str(tmp_path / "cascade.json")
+    cascade_file = CascadeFile(path, check_interval=0)
+    with pytest.raises(CascadeUnavailableError):
+        cascade_file.get()
+    assert issubclass(CascadeUnavailableError, ModelUnavailableError)
+
+    write_config(Cascade([CascadeStage("svm", 0.5), CascadeStage("xgb")]), path, validation={"rows": 3})
+    assert cascade_file.get().models == ["svm", "xgb"]
+    with open(path) as f:
+        assert json.load(f)["validation"] == {"rows": 3}
+
+    write_config(Cascade([CascadeStage("nb", 0.9), CascadeStage("lr", 0.8), CascadeStage("xgb")]), path)
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+    assert [s.threshold for s in cascade_file.get().stages] == [0.9, 0.8, None]
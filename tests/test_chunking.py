@@ -0,0 +1,79 @@
+import io
+import os, sys
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from quickfactchecker.chunking import (Chunk, VerdictAggregator, iter_batches, iter_text, nonblank_text,
+                                      split_sentences)
+
+ARTICLE = (
+    "The U.S. Senate passed the budget on Tuesday. Mr. Smith called it \"a disaster!\" "
+    "Critics disagree, e.g. the governor said it was fair.\n\n"
+    "Breaking: unemployment fell to 4.2 percent in March? Officials say yes."
+)
+
+
+def test_splits_sentences_with_offsets():
+    chunks = list(split_sentences(ARTICLE))
+    assert [c.text for c in chunks] == [
+        "The U.S. Senate passed the budget on Tuesday.",
+        "Mr. Smith called it \"a disaster!\"",
+        "Critics disagree, e.g. the governor said it was fair.",
+        "Breaking: unemployment fell to 4.2 percent in March?",
+        "Officials say yes.",
+    ]
+    assert [c.index for c in chunks] == list(range(5))
+    assert all(ARTICLE[c.start:c.end] == c.text for c in chunks)
+
+
+def test_pieces_split_like_the_whole_text():
+    for size in (1, 7, 64):
+        pieces = (ARTICLE[i:i + size] for i in range(0, len(ARTICLE), size))
+        assert list(split_sentences(pieces)) == list(split_sentences(ARTICLE))
+
+
+def test_short_fragments_join_the_next_sentence():
+    assert [c.text for c in split_sentences("Yes. The senate passed the budget today.")] == [
+        "Yes. The senate passed the budget today."]
+
+
+def test_long_sentences_are_cut_at_spaces():
+    chunks = list(split_sentences("word " * 100, max_chars=50))
+    assert all(len(c.text) <= 50 for c in chunks)
+    assert " ".join(c.text for c in chunks) == ("word " * 100).strip()
+    assert list(split_sentences("x" * 120, max_chars=50))[-1] == Chunk(2, 100, 120, "x" * 20)
+
+
+def test_iter_text_decodes_characters_split_across_blocks():
+    text = "Café “quotes” — done."
+    assert "".join(iter_text(io.BytesIO(text.encode()), block_size=3)) == text
+
+
+def test_nonblank_text_keeps_offsets():
+    assert nonblank_text(["  ", "\n\t", ""]) is None
+    assert nonblank_text([]) is None
+    pieces = ["  \n", "\t ", "  The senate passed the budget.", " Taxes rose."]
+    text = "".join(pieces)
+    chunks = list(split_sentences(nonblank_text(pieces, block_size=2), min_chars=1))
+    assert [c.text for c in chunks] == ["The senate passed the budget.", "Taxes rose."]
+    assert all(text[c.start:c.end] == c.text for c in chunks)
+
+
+def test_batches_grow_from_first_size():
+    assert [len(b) for b in iter_batches(range(20), 8, first_size=2)] == [2, 4, 8, 6]
+    assert [len(b) for b in iter_batches(range(5), 2)] == [2, 2, 1]
+    with pytest.raises(ValueError):
+        next(iter_batches([1], 0))
+
+
+def test_verdict_weights_chunks_by_length_and_probability():
+    aggregator = VerdictAggregator()
+    aggregator.add(Chunk(0, 0, 10, "a" * 10), {"prediction": 0, "probability": 0.9})
+    aggregator.add(Chunk(1, 11, 41, "b" * 30), {"prediction": 1, "probability": 0.6})
+    aggregator.add(Chunk(2, 42, 52, "c" * 10), {"prediction": 1, "probability": None})
+    verdict = aggregator.verdict()
+    assert verdict["prediction"] == 1 and verdict["chunks"] == 3 and verdict["characters"] == 50
+    assert verdict["share"] == pytest.approx(28 / 37)
+    assert [(l["prediction"], l["chunks"]) for l in verdict["labels"]] == [(1, 2), (0, 1)]
+    assert VerdictAggregator().verdict()["prediction"] is None
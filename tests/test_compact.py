@@ -0,0 +1,131 @@
+import os, sys
+import subprocess
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sklearn")
+
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.pipeline import Pipeline
+from sklearn.svm import LinearSVC
+
+from quickfactchecker.compact import compare_predictions, compact_path, export_pipeline, load_compact
+from quickfactchecker.inference import predict_with_confidence, score_texts
+from quickfactchecker.registry import ModelRegistry, compact_artifacts, publish_artifact
+
+TEXTS = [
+    "the senate passed the budget bill on tuesday",
+    "aliens built the pyramids says a viral post",
+    "unemployment fell to its lowest rate in decades",
+    "vaccines cause autism claims a fake study",
+    "the governor signed the education budget",
+    "a miracle cure for cancer is hidden by doctors",
+    "taxes rose by two percent for the middle class",
+    "the moon landing was staged in a studio",
+    "Café owners say the naïve résumé rules hurt jobs",
+]
+BINARY = [1, 0, 1, 0, 1, 0, 1, 0, 1]
+MULTI = ["true", "false", "half-true", "false", "true", "pants-fire", "half-true", "pants-fire", "true"]
+QUERIES = TEXTS + ["budget cure for the moon", "CAFE cafe café résumé", "", "zzz unknown words", "a"]
+
+PIPELINES = {
+    "nb-counts": lambda: Pipeline([("cv", CountVectorizer()), ("clf", MultinomialNB())]),
+    "nb-bigrams": lambda: Pipeline([("tfidf", TfidfVectorizer(ngram_range=(1, 2))), ("clf", MultinomialNB())]),
+    "lr": lambda: Pipeline([("tfidf", TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True)),
+                            ("clf", LogisticRegression(max_iter=1000))]),
+    "lr-accents": lambda: Pipeline([("tfidf", TfidfVectorizer(strip_accents="unicode", stop_words="english")),
+                                    ("clf", LogisticRegression(max_iter=1000))]),
+    "svm": lambda: Pipeline([("tfidf", TfidfVectorizer(max_features=30)), ("clf", LinearSVC())]),
+    "svm-transformer": lambda: Pipeline([("cv", CountVectorizer(ngram_range=(2, 3), binary=True)),
+                                         ("tfidf", TfidfTransformer(norm="l1")), ("clf", LinearSVC())]),
+}
+
+
+@pytest.mark.parametrize("labels", [BINARY, MULTI], ids=["binary", "multiclass"])
+@pytest.mark.parametrize("kind", sorted(PIPELINES))
+def test_compact_matches_sklearn(kind, labels, tmp_path):
+    pipeline = PIPELINES[kind]().fit(TEXTS, labels)
+    summary = export_pipeline(pipeline, str(tmp_path / "model.compact"))
+    model = load_compact(str(tmp_path / "model.compact"))
+
+    assert summary["kept_features"] == summary["n_features"] == model.n_features
+    assert list(model.predict(QUERIES)) == list(pipeline.predict(QUERIES))
+    if hasattr(pipeline, "predict_proba"):
+        np.testing.assert_allclose(model.predict_proba(QUERIES), pipeline.predict_proba(QUERIES), atol=1e-6)
+    else:
+        assert not hasattr(model, "predict_proba")
+        np.testing.assert_allclose(model.decision_function(QUERIES), pipeline.decision_function(QUERIES), atol=1e-5)
+    assert compare_predictions(pipeline, model, QUERIES)["label_agreement"] == 1.0
+
+
+def test_multiclass_liblinear_is_exported_one_vs_rest(tmp_path):
+    pipeline = Pipeline([("tfidf", TfidfVectorizer()), ("clf", LogisticRegression(solver="liblinear"))])
+    try:
+        pipeline.fit(TEXTS, MULTI)
+        expected = pipeline.predict_proba(QUERIES)
+    except ValueError:
+        # sklearn >= 1.8 refuses multiclass liblinear; emulate a model pickled by an older release
+        pipeline.set_params(clf__solver="lbfgs").fit(TEXTS, MULTI)
+        pipeline[-1].solver, pipeline[-1].multi_class = "liblinear", "deprecated"
+        p = 1 / (1 + np.exp(-pipeline.decision_function(QUERIES)))
+        expected = p / p.sum(axis=1, keepdims=True)
+    export_pipeline(pipeline, str(tmp_path / "model.compact"))
+    model = load_compact(str(tmp_path / "model.compact"))
+    assert model.output == "ovr"
+    np.testing.assert_allclose(model.predict_proba(QUERIES), expected, atol=1e-6)
+
+
+def test_compact_model_works_with_scoring_helpers(tmp_path):
+    for name in ("lr", "svm"):
+        pipeline = PIPELINES[name]().fit(TEXTS, BINARY)
+        export_pipeline(pipeline, str(tmp_path / f"{name}.compact"))
+        model = load_compact(str(tmp_path / f"{name}.compact"), mmap_mode=None)
+
+        results, expected = score_texts(model, QUERIES), score_texts(pipeline, QUERIES)
+        assert [r["prediction"] for r in results] == [r["prediction"] for r in expected]
+        assert [r["probability"] for r in results] == pytest.approx([r["probability"] for r in expected])
+
+        labels, proba, confidence = predict_with_confidence(model, QUERIES)
+        expected = predict_with_confidence(pipeline, QUERIES)
+        assert list(labels) == list(expected[0]) and (proba is None) == (expected[1] is None)
+        np.testing.assert_allclose(confidence, expected[2], atol=1e-5)
+
+
+def test_prune_drops_small_weights(tmp_path):
+    pipeline = PIPELINES["lr"]().fit(TEXTS, BINARY)
+    summary = export_pipeline(pipeline, str(tmp_path / "pruned.compact"), prune=0.5)
+    assert 0 < summary["kept_features"] < summary["n_features"]
+    assert load_compact(str(tmp_path / "pruned.compact")).n_features == summary["kept_features"]
+
+
+def test_unsupported_pipelines_are_rejected(tmp_path):
+    forest = Pipeline([("tfidf", TfidfVectorizer()), ("clf", RandomForestClassifier(n_estimators=2))])
+    chars = Pipeline([("tfidf", TfidfVectorizer(analyzer="char")), ("clf", MultinomialNB())])
+    for pipeline in (forest, chars):
+        with pytest.raises(ValueError):
+            export_pipeline(pipeline.fit(TEXTS, BINARY), str(tmp_path / "x.compact"))
+    assert not os.path.exists(tmp_path / "x.compact")
+
+
+def test_registry_serves_compact_export_without_sklearn(tmp_path):
+    pipeline = PIPELINES["nb-bigrams"]().fit(TEXTS, BINARY)
+    pickle_path = str(tmp_path / "model_pipeline.pkl")
+    publish_artifact(pipeline, pickle_path)
+    export_pipeline(pipeline, compact_path(pickle_path))
+
+    artifacts = compact_artifacts(str(tmp_path))
+    assert artifacts["nb"] == "model_pipeline.compact" and artifacts["lr"] == "model_pipeline_lr.pkl"
+    loaded = ModelRegistry(str(tmp_path), artifacts=artifacts).get("nb")
+    assert list(loaded.model.predict(QUERIES)) == list(pipeline.predict(QUERIES))
+
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    code = ("import sys; from quickfactchecker.registry import ModelRegistry, compact_artifacts; "
+            f"d = {str(tmp_path)!r}; m = ModelRegistry(d, artifacts=compact_artifacts(d)).get('nb').model; "
+            "m.predict_proba(['budget bill']); print('sklearn' in sys.modules)")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=root, check=True)
+    assert out.stdout.strip() == "False"
@@ -0,0 +1,126 @@
+import os, sys
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+np = pytest.importorskip("numpy")
+
+from quickfactchecker import datasets
+from quickfactchecker.datasets import (LIAR_COLUMNS, LIAR_READ_CSV_OPTIONS, cached_file_sha256, iter_liar_rows,
+                                      load_fake_true, load_liar, load_table)
+from quickfactchecker.preprocessing import preprocess
+
+LIAR_ROWS = [
+    ["1.json", "true", 'Says "the senate" passed the budget bill.', "budget,taxes", "jane-doe", "Senator",
+     "Ohio", "democrat", "1", "0", "2", "3", "0", "a speech"],
+    ["2.json", "pants-fire", "Aliens built the pyramids last year!", "history", "john-roe", "",
+     "", "republican", "", "", "", "", "", ""],
+    ["3.json", "false"],  # malformed: skipped
+    ["4.json", "false", "Taxes rose by 200 percent.", "taxes", "jane-doe", "Senator",
+     "Ohio", "democrat", "1", "1", "2", "3", "0", "a tweet"],
+]
+
+
+@pytest.fixture
+def liar_tsv(tmp_path):
+    path = tmp_path / "train.tsv"
+    path.write_text("".join("\t".join(row) + "\n" for row in LIAR_ROWS), encoding="utf-8")
+    return str(path)
+
+
+def test_load_liar_types_and_cleans_columns(liar_tsv, tmp_path):
+    data = load_liar(liar_tsv, cache_dir=str(tmp_path / "cache"))
+    assert len(data) == 3 and data.meta["skipped_rows"] == 1
+    assert data.columns[:len(LIAR_COLUMNS)] == LIAR_COLUMNS
+    assert data.column("id") == ["1.json", "2.json", "4.json"]
+    assert data.column("statement")[0] == 'Says "the senate" passed the budget bill.'
+    assert data.column("clean_text") == [preprocess(row[2]) for row in LIAR_ROWS if len(row) == 14]
+    assert list(data.column("label")) == ["true", "pants-fire", "false"]
+    assert list(data.column("state")) == ["Ohio", None, "Ohio"]
+    assert list(data.column("split")) == ["train"] * 3
+    assert data.codes("speaker").dtype == np.int8
+    counts = data.column("half_true_counts")
+    assert counts.dtype == np.float32 and counts[0] == 2 and np.isnan(counts[1])
+
+
+def test_cache_is_reused_until_the_source_changes(liar_tsv, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    first = load_liar(liar_tsv, cache_dir=cache_dir)
+
+    def fail(paths):
+        raise AssertionError("rebuilt an unchanged source")
+    monkeypatch.setattr(datasets, "_build_liar", fail)
+    assert load_liar(liar_tsv, cache_dir=cache_dir).path == first.path
+
+    monkeypatch.undo()
+    with open(liar_tsv, "a", encoding="utf-8") as f:
+        f.write("\t".join(["5.json", "true", "New claim."] + [""] * 11) + "\n")
+    second = load_liar(liar_tsv, cache_dir=cache_dir)
+    assert second.path != first.path and len(second) == 4
+    assert cached_file_sha256(liar_tsv, cache_dir) == datasets.file_sha256(liar_tsv)
+
+
+def test_projection_batches_and_pandas(liar_tsv, tmp_path):
+    pd = pytest.importorskip("pandas")
+    data = load_liar(liar_tsv, cache_dir=str(tmp_path / "cache"), columns=["label", "clean_text"])
+    with pytest.raises(KeyError):
+        data.column("statement")
+    with pytest.raises(KeyError):
+        data.select(["no_such_column"])
+
+    batches = list(data.iter_batches(batch_size=2))
+    assert [len(b["clean_text"]) for b in batches] == [2, 1]
+    assert list(batches[1]["label"]) == ["false"]
+
+    frame = data.to_pandas()
+    assert list(frame.columns) == ["label", "clean_text"] and len(frame) == 3
+    assert isinstance(frame["label"].dtype, pd.CategoricalDtype)
+    assert frame["label"].tolist() == ["true", "pants-fire", "false"]
+    assert data.select(["speaker"]).to_pandas(start=1)["speaker"].tolist() == ["john-roe", "jane-doe"]
+
+
+def test_pandas_options_parse_stray_quotes_like_the_loader(tmp_path):
+    pd = pytest.importorskip("pandas")
+    rows = [row for row in LIAR_ROWS if len(row) == len(LIAR_COLUMNS)]
+    rows.insert(1, ["5.json", "false", '"Unbalanced quote in a statement.', "taxes", "x", "", "", "", "0", "0", "0",
+                    "0", "0", 'a "tweet'])
+    path = tmp_path / "train.tsv"
+    path.write_text("".join("\t".join(row) + "\n" for row in rows), encoding="utf-8")
+
+    frame = pd.read_csv(path, dtype=str, keep_default_na=False, **LIAR_READ_CSV_OPTIONS)
+    assert frame.values.tolist() == list(iter_liar_rows(str(path))) == rows
+    # with pandas' default quoting the stray quote swallows the fields that follow it
+    quoted = pd.read_csv(path, sep="\t", header=None, dtype=str, keep_default_na=False)
+    assert quoted.values.tolist() != rows
+
+
+def test_load_fake_true_concatenates_like_the_notebook(tmp_path):
+    pytest.importorskip("pandas")
+    (tmp_path / "True.csv").write_text(
+        'title,text,subject,date\n"Budget passes","WASHINGTON (Reuters) - The budget, finally, passed.",politicsNews,"May 1, 2017"\n',
+        encoding="utf-8")
+    (tmp_path / "Fake.csv").write_text(
+        'title,text,subject,date\n"Shock","You won\'t believe\nthis https://t.co/x",News,"May 2, 2017"\n'
+        '"Empty",,News,"May 3, 2017"\n',
+        encoding="utf-8")
+    news = load_fake_true(str(tmp_path / "True.csv"), str(tmp_path / "Fake.csv"), cache_dir=str(tmp_path / "cache"))
+    assert len(news) == 3
+    assert list(news.column("source")) == ["fake", "fake", "true"]
+    assert list(news.column("label")) == [0, 0, 1]
+    assert news.column("text")[0] == "You won't believe\nthis https://t.co/x"
+    assert news.column("text")[1] == ""
+    assert news.column("clean_text")[2] == preprocess("WASHINGTON (Reuters) - The budget, finally, passed.")
+
+
+def test_load_table_infers_column_kinds(tmp_path):
+    pytest.importorskip("pandas")
+    path = tmp_path / "news.csv"
+    bodies = ["First story", "Second story", "Third one", "Fourth", "Fifth"]
+    path.write_text("body,label,score,topic\n" + "".join(f"{b},{i % 2},{i / 4},{'ab'[i > 3]}\n"
+                                                         for i, b in enumerate(bodies)), encoding="utf-8")
+    table = load_table(str(path), "body", cache_dir=str(tmp_path / "cache"))
+    assert table.schema == {"body": "text", "label": "int64", "score": "float64", "topic": "category",
+                            "clean_text": "text"}
+    assert list(table.column("label")) == [0, 1, 0, 1, 0]
+    assert list(table.column("topic")) == ["a", "a", "a", "a", "b"]
+    assert table.column("clean_text") == [preprocess(b) for b in bodies]
@@ -0,0 +1,70 @@
+import os, sys
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+np = pytest.importorskip("numpy")
+
+from quickfactchecker.evidence import (EvidenceIndex, EvidenceUnavailableError, LazyEvidenceIndex,
+                                       build_index, read_liar)
+
+DOCS = [
+    {"id": "1.json", "label": "true", "statement": "Building a wall on the Mexico border will take years.",
+     "speaker": "rick-perry", "context": "Radio interview"},
+    {"id": "2.json", "label": "false", "statement": "Wisconsin is on pace to double the number of layoffs this year."},
+    {"id": "3.json", "label": "half-true", "statement": "The border patrol doubled in size over a decade."},
+    {"id": "1.json", "label": "false", "statement": "A duplicate id is ignored."},
+]
+
+
+@pytest.fixture
+def index_dir(tmp_path):
+    return build_index(DOCS, str(tmp_path / "evidence"))
+
+
+def test_search_ranks_by_bm25(index_dir):
+    index = EvidenceIndex(index_dir)
+    assert len(index) == 3
+    assert isinstance(index.postings_doc, np.memmap)
+
+    results = index.search("How long will the Mexico border wall take?", k=2)
+    assert [r["id"] for r in results] == ["1.json", "3.json"]
+    assert results[0]["speaker"] == "rick-perry" and results[0]["score"] > results[1]["score"] > 0
+    assert index.search("the of and") == []
+    assert index.search("quantum chromodynamics") == []
+
+
+def test_incremental_add_is_persisted_and_shared(index_dir):
+    index = EvidenceIndex(index_dir)
+    other = EvidenceIndex(index_dir)
+    new = {"id": "4.json", "label": "false", "statement": "Layoffs in Wisconsin tripled this year."}
+    assert index.add([new, DOCS[0]]) == 1
+    assert index.add([new]) == 0
+    assert index.search("Wisconsin layoffs tripled", k=1)[0]["id"] == "4.json"
+
+    assert other.refresh() == 1
+    assert other.search("Wisconsin layoffs tripled", k=1)[0]["id"] == "4.json"
+    assert len(EvidenceIndex(index_dir)) == 4
+
+    compacted = index.compact()
+    assert compacted.n_main == 4 and other.is_stale()
+    assert compacted.search("Wisconsin layoffs tripled", k=1)[0]["label"] == "false"
+
+
+def test_read_liar_skips_malformed_rows(tmp_path):
+    path = tmp_path / "test.tsv"
+    row = ["5.json", "true", "Taxes rose.", "taxes", "a", "b", "c", "d", "0", "0", "0", "0", "0", "a debate"]
+    path.write_text("\t".join(row) + "\nshort\trow\n", encoding="utf-8")
+    docs = list(read_liar(str(path)))
+    assert docs == [{"id": "5.json", "label": "true", "statement": "Taxes rose.", "subject": "taxes",
+                     "speaker": "a", "job": "b", "state": "c", "party": "d", "context": "a debate",
+                     "split": "test"}]
+
+
+def test_lazy_index_waits_for_a_build(tmp_path):
+    lazy = LazyEvidenceIndex(str(tmp_path / "evidence"), check_interval=0)
+    assert not lazy.is_available()
+    with pytest.raises(EvidenceUnavailableError):
+        lazy.get()
+    build_index(DOCS, lazy.path)
+    assert len(lazy.get()) == 3
@@ -0,0 +1,70 @@
+import os, sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from quickfactchecker.metrics import MetricsRegistry, SamplingProfiler, write_profile
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    hist = registry.histogram("latency_seconds", "Latency.", ["stage"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        hist.observe(value, "classify")
+    assert hist.count("classify") == 4 and hist.count("parse") == 0
+
+    lines = registry.render().splitlines()
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{stage="classify",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{stage="classify",le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{stage="classify",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{stage="classify"} 3.65' in lines
+    assert 'latency_seconds_count{stage="classify"} 4' in lines
+
+
+def test_counter_and_label_escaping():
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests.", ["endpoint"])
+    counter.inc('/a"b')
+    counter.inc('/a"b', amount=2)
+    assert counter.value('/a"b') == 3
+    assert 'requests_total{endpoint="/a\\"b"} 3.0' in registry.render()
+
+
+def test_histogram_time_records_duration():
+    hist = MetricsRegistry().histogram("t", "T.", ["stage"])
+    with hist.time("sleep"):
+        time.sleep(0.01)
+    assert hist.count("sleep") == 1
+
+
+def busy_wait(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_profiler_collects_collapsed_stacks(tmp_path):
+    profiler = SamplingProfiler(interval=0.001).start()
+    busy_wait(0.1)
+    collapsed = profiler.stop()
+    assert "busy_wait (test_metrics.py)" in collapsed
+    stack, count = collapsed.splitlines()[0].rsplit(" ", 1)
+    assert int(count) > 0 and ";" in stack
+
+    path = write_profile(collapsed, str(tmp_path / "profiles"), "/predict")
+    assert path.endswith(".folded") and "predict" in os.path.basename(path)
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == collapsed
+
+
+def test_profiler_samples_other_threads():
+    done = threading.Event()
+    worker = threading.Thread(target=lambda: (busy_wait(0.1), done.set()))
+    worker.start()
+    profiler = SamplingProfiler(thread_id=worker.ident, interval=0.001).start()
+    done.wait()
+    collapsed = profiler.stop()
+    worker.join()
+    assert "busy_wait" in collapsed and "test_profiler_samples_other_threads" not in collapsed
@@ -0,0 +1,54 @@
+import os, sys
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+
+from sklearn.metrics import accuracy_score, f1_score, precision_score
+
+from quickfactchecker.online_training import is_held_out, scores_from_confusion, train_streaming
+
+
+def write_corpus(path, rows=400):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("text,label\n")
+        for i in range(rows):
+            if i % 2:
+                f.write(f"senate committee approves budget plan number {i},real\n")
+            else:
+                f.write(f"shocking miracle cure doctors hate secret {i},fake\n")
+
+
+def test_train_streaming_learns_and_evaluates_held_out_rows(tmp_path):
+    path = tmp_path / "corpus.csv"
+    write_corpus(path)
+    results, models = train_streaming(path, "text", "label", chunksize=37, test_percent=25)
+
+    assert set(results) == {"Naive Bayes", "Logistic Regression (SGD)"}
+    for scores in results.values():
+        assert scores["train_rows"] + scores["test_rows"] == 400
+        assert scores["confusion"].sum() == scores["test_rows"]
+        assert list(scores["classes"]) == ["fake", "real"]
+        assert scores["accuracy"] > 0.95
+
+
+def test_held_out_split_is_stable():
+    texts = np.array([f"claim {i}" for i in range(1000)])
+    mask = is_held_out(texts, 20)
+    assert 120 < mask.sum() < 280
+    assert (mask == is_held_out(texts, 20)).all()
+
+
+def test_scores_from_confusion_match_sklearn():
+    rng = np.random.RandomState(0)
+    y_true = rng.randint(0, 4, size=300)
+    y_pred = np.where(rng.rand(300) < 0.6, y_true, rng.randint(0, 3, size=300))
+    cm = np.zeros((4, 4), dtype=int)
+    np.add.at(cm, (y_true, y_pred), 1)
+    scores = scores_from_confusion(cm)
+    assert scores["accuracy"] == pytest.approx(accuracy_score(y_true, y_pred))
+    assert scores["precision"] == pytest.approx(precision_score(y_true, y_pred, average="macro", zero_division=0))
+    assert scores["f1"] == pytest.approx(f1_score(y_true, y_pred, average="macro", zero_division=0))
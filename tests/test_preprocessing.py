@@ -0,0 +1,84 @@
+import os, sys
+import random
+import re
+import string
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from quickfactchecker.preprocessing import (
+    ENGLISH_STOPWORDS, clean_text, preprocess, preprocess_batch, remove_stopwords_from_sentence, tokenize,
+)
+
+
+def reference_clean_text(text):
+    # verbatim copy of the function the notebooks used to train the models
+    text = str(text).lower()
+    text = re.sub(r'\[.*?\]', '', text)
+    text = re.sub(r'https?://\S+|www\.\S+', '', text)
+    text = re.sub(r"[^a-zA-Z?.!,¿]+", " ", text)
+    text = re.sub(r'<.*?>+', '', text)
+    text = re.sub('[%s]' % re.escape(string.punctuation), '', text)
+    text = re.sub('\n', '', text)
+    text = re.sub(r'\w*\d\w*', '', text)
+    punctuations = '@#!?+&*[]-%.:/();$=><|{}^' + "'`" + '_'
+    for p in punctuations:
+        text = text.replace(p, '')
+    return text
+
+
+WORDS = ["cannot", "Gimme", "gonna", "gotta", "lemme", "wanna", "http://t.co/a1", "www.site.org/x",
+         "[citation]", "RT", "The", "not", "¿qué", "covid19", "<b>", "it's"]
+ALPHABET = list(string.printable) + ["¿", "é", "İ", "K", "ß", "’", "“"]
+
+
+def random_texts(n, seed=0):
+    rng = random.Random(seed)
+    for _ in range(n):
+        parts = [rng.choice(WORDS) if rng.random() < 0.4
+                 else "".join(rng.choice(ALPHABET) for _ in range(rng.randint(1, 6)))
+                 for _ in range(rng.randint(0, 12))]
+        yield rng.choice([" ", "", ",", ".", "\n"]).join(parts)
+
+
+def test_clean_text_matches_notebook_version():
+    for text in random_texts(5000):
+        assert clean_text(text) == reference_clean_text(text)
+    assert clean_text(None) == reference_clean_text(None)
+    assert clean_text(3.5) == reference_clean_text(3.5)
+
+
+def test_tokenize_matches_nltk_on_cleaned_text():
+    nltk_tokenize = pytest.importorskip("nltk.tokenize")
+    for text in random_texts(5000, seed=1):
+        cleaned = clean_text(text)
+        # cleaned text has no sentence-final punctuation, so punkt yields one sentence
+        assert tokenize(cleaned) == nltk_tokenize.word_tokenize(cleaned, preserve_line=True)
+
+
+def test_stopwords_match_nltk_corpus():
+    corpus = pytest.importorskip("nltk.corpus")
+    try:
+        words = set(corpus.stopwords.words("english"))
+    except LookupError:
+        pytest.skip("NLTK stopwords corpus not downloaded")
+    # releases differ only in contracted forms, which never survive clean_text
+    assert {w for w in words ^ ENGLISH_STOPWORDS if "'" not in w} == set()
+
+
+def test_contractions_are_split_like_word_tokenize():
+    assert tokenize("i cannot go gonna wanna") == ["i", "can", "not", "go", "gon", "na", "wan", "na"]
+    assert tokenize("gotta¿") == ["got", "ta", "¿"]
+    assert remove_stopwords_from_sentence("we cannot stop") == "stop"
+
+
+def test_preprocess_pipeline():
+    assert preprocess("BREAKING: The [satire] senate passed 2 bills! https://t.co/x") == "breaking senate passed bills"
+
+
+def test_preprocess_batch_parallel_matches_serial():
+    texts = list(random_texts(300, seed=2))
+    expected = [preprocess(t) for t in texts]
+    assert preprocess_batch(texts, workers=1) == expected
+    assert preprocess_batch(texts, workers=2, chunksize=50) == expected
+    assert preprocess_batch(texts, workers=1, remove_stopwords=False) == [clean_text(t) for t in texts]
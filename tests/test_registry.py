@@ -0,0 +1,86 @@
+import os, sys
+import threading
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sklearn")
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+from quickfactchecker.registry import (
+    ModelNotFoundError, ModelRegistry, ModelUnavailableError, publish_artifact,
+)
+
+TEXTS = ["the senate passed the bill", "aliens built the pyramids",
+         "taxes rose last year", "vaccines contain microchips"]
+LABELS = [1, 0, 1, 0]
+
+
+def make_pipeline(C=1.0):
+    return Pipeline([
+        ("tfidf", TfidfVectorizer()),
+        ("clf", LogisticRegression(C=C)),
+    ]).fit(TEXTS, LABELS)
+
+
+def test_lazy_load_is_memory_mapped(tmp_path):
+    publish_artifact(make_pipeline(), str(tmp_path / "model_pipeline_lr.pkl"))
+    registry = ModelRegistry(str(tmp_path))
+
+    assert registry.loaded() == {}
+    loaded = registry.get("lr")
+    assert isinstance(loaded.model.named_steps["clf"].coef_, np.memmap)
+    assert registry.get("lr") is loaded
+    assert list(registry.loaded()) == ["lr"]
+
+
+def test_missing_and_unknown_models(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    assert not registry.is_available("svm")
+    with pytest.raises(ModelUnavailableError):
+        registry.get("svm")
+    with pytest.raises(ModelNotFoundError):
+        registry.get("bert")
+    assert registry.preload() == {}
+
+
+def test_hot_swap_on_new_artifact(tmp_path):
+    path = str(tmp_path / "model_pipeline.pkl")
+    publish_artifact(make_pipeline(C=1.0), path)
+    registry = ModelRegistry(str(tmp_path), check_interval=0)
+    old = registry.get("nb")
+
+    publish_artifact(make_pipeline(C=100.0), path)
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+    new = registry.get("nb")
+    assert new is not old
+    assert new.version != old.version
+    assert new.model.named_steps["clf"].C == 100.0
+    # a request still holding the old model can finish with it
+    assert old.model.predict(["taxes rose"]).shape == (1,)
+
+
+def test_swap_is_atomic_under_concurrent_reads(tmp_path):
+    registry = ModelRegistry(str(tmp_path), artifacts={})
+    registry.swap("nb", model="v1", version="1")
+    seen = set()
+    stop = threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            loaded = registry.get("nb")
+            seen.add((loaded.model, loaded.version))
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for i in range(2, 50):
+        registry.swap("nb", model=f"v{i}", version=str(i))
+    stop.set()
+    for t in threads:
+        t.join()
+    assert all(model == f"v{version}" for model, version in seen)
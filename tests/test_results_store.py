@@ -0,0 +1,91 @@
+import json
+import os, sys
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from quickfactchecker.results_store import ResultsStore, benchmark_rows, parse_markdown_table, update_experiment
+
+ML_COMPARISON = """# Model Comparison Results
+
+| Model | Accuracy | Precision | Recall | F1 | Predict Time (s) | ms/sample |
+|-------|----------|-----------|--------|----|------------------|-----------|
+| SVM | 0.9933 | 0.9934 | 0.9932 | 0.9933 | 1.5985 | 0.1780 |
+| Naive Bayes | 0.9514 | 0.9512 | 0.9515 | 0.9514 | 3.6777 | 0.4095 |
+"""
+
+
+def test_parse_markdown_table_follows_header():
+    rows = parse_markdown_table(ML_COMPARISON)
+    assert rows[0] == {"model": "SVM", "accuracy": 0.9933, "precision": 0.9934, "recall": 0.9932,
+                       "f1": 0.9933, "predict_time_s": 1.5985, "ms_per_sample": 0.178}
+    assert [r["model"] for r in rows] == ["SVM", "Naive Bayes"]
+    assert parse_markdown_table("Logistic Regression | 0.92 | 0.91 | 0.90 | 0.90\n") == []
+
+
+def test_update_experiment_merges_benchmark_columns(tmp_path):
+    path = str(tmp_path / "results.json")
+    update_experiment("exp", [{"Model": "SVM", "Accuracy": "0.99", "F1-Score": 0.98}], path=path, dataset="d")
+    report = {"models": {"svm": {"latency": {"p50_ms": 1.0, "p95_ms": 2.0, "p99_ms": 3.0},
+                                 "throughput": {"1": {"items_per_s": 10.0}, "32": {"items_per_s": 900.0}}},
+                         "xgb": {"error": "ModelUnavailableError: xgb"}}}
+    update_experiment("exp", benchmark_rows(report), path=path)
+
+    with open(path) as f:
+        entry = json.load(f)["experiments"]["exp"]
+    assert entry["dataset"] == "d"
+    assert entry["models"] == {"SVM": {"accuracy": 0.99, "f1": 0.98, "p50_ms": 1.0, "p95_ms": 2.0, "p99_ms": 3.0,
+                                       "throughput_per_s": 900.0, "throughput_batch_size": 32}}
+
+
+def test_failed_write_keeps_the_file_and_leaves_no_temp_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "results.json")
+    update_experiment("exp", [{"model": "SVM", "accuracy": 0.9}], path=path)
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(json, "dump", fail)
+    with pytest.raises(OSError):
+        update_experiment("exp", [{"model": "SVM", "accuracy": 0.1}], path=path)
+    monkeypatch.undo()
+    assert os.listdir(tmp_path) == ["results.json"]
+    with open(path) as f:
+        assert json.load(f)["experiments"]["exp"]["models"]["SVM"]["accuracy"] == 0.9
+
+
+def test_snapshot_is_memoized_until_the_file_changes(tmp_path):
+    path = str(tmp_path / "results.json")
+    update_experiment("exp", [{"model": "SVM", "accuracy": 0.9}], path=path)
+    store = ResultsStore(path)
+
+    first = store.snapshot("exp")
+    assert first.rows == [{"model": "SVM", "accuracy": 0.9}]
+    assert store.snapshot("exp") is first
+    assert store.snapshot("missing") is None
+
+    update_experiment("exp", [{"model": "SVM", "accuracy": 0.95}], path=path)
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+    second = store.snapshot("exp")
+    assert second.rows == [{"model": "SVM", "accuracy": 0.95}]
+    assert second.etag != first.etag
+
+
+def test_snapshot_merges_benchmark_columns(tmp_path):
+    path = str(tmp_path / "results.json")
+    update_experiment("quality", [{"model": "SVM", "accuracy": 0.9}, {"model": "LSTM", "accuracy": 0.8}], path=path)
+    update_experiment("bench", [{"model": "SVM", "p50_ms": 0.4, "accuracy": 0.1}, {"model": "XGBoost", "p50_ms": 2}],
+                      path=path)
+    store = ResultsStore(path)
+    assert store.snapshot("quality", merge=("bench",)).rows == [
+        {"model": "SVM", "accuracy": 0.9, "p50_ms": 0.4}, {"model": "LSTM", "accuracy": 0.8}]
+    assert store.snapshot("quality").rows == [{"model": "SVM", "accuracy": 0.9}, {"model": "LSTM", "accuracy": 0.8}]
+    assert store.snapshot("quality", merge=("missing",)).rows == store.snapshot("quality").rows
+
+
+def test_markdown_fallback(tmp_path):
+    md = tmp_path / "ml_comparison_results.md"
+    md.write_text(ML_COMPARISON, encoding="utf-8")
+    store = ResultsStore(str(tmp_path / "missing.json"), fallback_paths=[str(md)])
+    assert [r["model"] for r in store.snapshot().rows] == ["SVM", "Naive Bayes"]
+    assert ResultsStore(str(tmp_path / "missing.json")).snapshot() is None
@@ -0,0 +1,68 @@
+import os, sys
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+pytest.importorskip("sklearn")
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+from sklearn.naive_bayes import MultinomialNB
+
+from quickfactchecker.datasets import file_sha256
+from quickfactchecker.training import FeatureCache, feature_key, featurize, train_models
+
+TEXTS = [f"senate budget vote {i}" if i % 2 else f"miracle cure secret {i}" for i in range(60)]
+LABELS = ["real" if i % 2 else "fake" for i in range(60)]
+SPLIT = {"test_size": 0.25, "random_state": 0}
+
+
+def build(cache, key, calls):
+    def load_data():
+        calls.append(1)
+        return TEXTS, LABELS
+    return featurize(cache, key, load_data, TfidfVectorizer(),
+                     lambda X, y: train_test_split(X, y, **SPLIT))
+
+
+def test_feature_key_depends_on_data_and_parameters(tmp_path):
+    data = tmp_path / "data.tsv"
+    data.write_text("a\tb\n")
+    digest = file_sha256(data)
+    key = feature_key(digest, TfidfVectorizer(), SPLIT)
+    assert key == feature_key(digest, TfidfVectorizer(), SPLIT)
+    assert key != feature_key(digest, TfidfVectorizer(max_features=10), SPLIT)
+    assert key != feature_key(digest, TfidfVectorizer(), dict(SPLIT, random_state=1))
+    data.write_text("a\tc\n")
+    assert key != feature_key(file_sha256(data), TfidfVectorizer(), SPLIT)
+
+
+def test_featurize_reuses_cached_split(tmp_path):
+    cache = FeatureCache(str(tmp_path / "cache"))
+    calls = []
+    entry, hit = build(cache, "k1", calls)
+    assert not hit and calls == [1]
+    entry_again, hit = build(cache, "k1", calls)
+    assert hit and entry_again == entry and calls == [1]
+    assert sorted(os.listdir(entry)) == sorted(FeatureCache.FILES)
+
+
+def test_train_models_in_parallel_reports_each_result(tmp_path):
+    cache = FeatureCache(str(tmp_path / "cache"))
+    entry, _ = build(cache, "k2", [])
+    finished = []
+    models = {
+        "Naive Bayes": MultinomialNB(),
+        "Logistic Regression": LogisticRegression(),
+        "Broken": LogisticRegression(C=-1.0),
+    }
+    results = train_models(models, entry, max_workers=2, on_result=lambda r: finished.append(r["name"]))
+
+    assert sorted(finished) == sorted(models)
+    by_name = {r["name"]: r for r in results}
+    assert "error" in by_name["Broken"]
+    assert by_name["Naive Bayes"]["accuracy"] == 1.0
+    assert by_name["Logistic Regression"]["confusion"].sum() == 15